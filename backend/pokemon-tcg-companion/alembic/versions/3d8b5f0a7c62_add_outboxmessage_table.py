@@ -0,0 +1,35 @@
+"""add outboxmessage table
+
+Revision ID: 3d8b5f0a7c62
+Revises: 9a4f1c6e2b83
+Create Date: 2026-10-18 16:21:07.514930
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "3d8b5f0a7c62"
+down_revision = "9a4f1c6e2b83"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outboxmessage",
+        sa.Column("topic", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("outboxmessage")
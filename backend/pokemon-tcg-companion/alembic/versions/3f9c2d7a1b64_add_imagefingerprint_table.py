@@ -0,0 +1,39 @@
+"""add imagefingerprint table
+
+Revision ID: 3f9c2d7a1b64
+Revises: e6ef42a47d89
+Create Date: 2026-10-18 09:12:40.512317
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "3f9c2d7a1b64"
+down_revision = "e6ef42a47d89"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "imagefingerprint",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("hash", sa.BigInteger(), nullable=False),
+        sa.Column("chunk_0", sa.Integer(), nullable=False),
+        sa.Column("chunk_1", sa.Integer(), nullable=False),
+        sa.Column("chunk_2", sa.Integer(), nullable=False),
+        sa.Column("chunk_3", sa.Integer(), nullable=False),
+        sa.Column("ref_card_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["ref_card_id"], ["refcard.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("hash"),
+    )
+    for column in ("chunk_0", "chunk_1", "chunk_2", "chunk_3", "ref_card_id"):
+        op.create_index(f"ix_imagefingerprint_{column}", "imagefingerprint", [column])
+
+
+def downgrade():
+    for column in ("chunk_0", "chunk_1", "chunk_2", "chunk_3", "ref_card_id"):
+        op.drop_index(f"ix_imagefingerprint_{column}", table_name="imagefingerprint")
+    op.drop_table("imagefingerprint")
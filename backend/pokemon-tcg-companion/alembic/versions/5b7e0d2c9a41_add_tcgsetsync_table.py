@@ -0,0 +1,29 @@
+"""add tcgsetsync table
+
+Revision ID: 5b7e0d2c9a41
+Revises: c47a9e2f6d18
+Create Date: 2026-10-18 14:21:37.604218
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "5b7e0d2c9a41"
+down_revision = "c47a9e2f6d18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tcgsetsync",
+        sa.Column("tcg_id", sa.String(), nullable=False),
+        sa.Column("card_count", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("tcg_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("tcgsetsync")
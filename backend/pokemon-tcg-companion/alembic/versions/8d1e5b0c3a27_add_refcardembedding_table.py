@@ -0,0 +1,30 @@
+"""add refcardembedding table
+
+Revision ID: 8d1e5b0c3a27
+Revises: 3f9c2d7a1b64
+Create Date: 2026-10-18 11:47:05.228941
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "8d1e5b0c3a27"
+down_revision = "3f9c2d7a1b64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "refcardembedding",
+        sa.Column("ref_card_id", sa.Uuid(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["ref_card_id"], ["refcard.id"]),
+        sa.PrimaryKeyConstraint("ref_card_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("refcardembedding")
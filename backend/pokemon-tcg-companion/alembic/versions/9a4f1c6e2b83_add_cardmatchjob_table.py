@@ -0,0 +1,43 @@
+"""add cardmatchjob table
+
+Revision ID: 9a4f1c6e2b83
+Revises: 5b7e0d2c9a41
+Create Date: 2026-10-18 15:02:48.319562
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "9a4f1c6e2b83"
+down_revision = "5b7e0d2c9a41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "cardmatchjob",
+        sa.Column("image_path", sa.String(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("card_id", sa.Uuid(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["card_id"], ["card.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_cardmatchjob_card_id", "cardmatchjob", ["card_id"], unique=True)
+    op.create_index(
+        "ix_cardmatchjob_available_at_id", "cardmatchjob", ["available_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_cardmatchjob_available_at_id", table_name="cardmatchjob")
+    op.drop_index("ix_cardmatchjob_card_id", table_name="cardmatchjob")
+    op.drop_table("cardmatchjob")
@@ -0,0 +1,28 @@
+"""add card (user_id, matching_status, id) index
+
+Revision ID: c47a9e2f6d18
+Revises: 8d1e5b0c3a27
+Create Date: 2026-10-18 14:03:22.671045
+"""
+
+from alembic import op
+
+revision = "c47a9e2f6d18"
+down_revision = "8d1e5b0c3a27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_card_user_id_matching_status_id",
+        "card",
+        ["user_id", "matching_status", "id"],
+    )
+    # Redundant with the composite index's leading column
+    op.drop_index("ix_card_user_id", table_name="card")
+
+
+def downgrade():
+    op.create_index("ix_card_user_id", "card", ["user_id"])
+    op.drop_index("ix_card_user_id_matching_status_id", table_name="card")
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
-from pydantic_ai import Agent, ModelRetry, RunContext
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic_ai import Agent, ModelRetry, RunContext, ToolOutput
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from cards.application.services import RefCardService
-from cards.infrastructure.repositories import RefCardRepository
+from cards.application.services import RefCardService, TcgSetService
+from cards.domain.models import RefCard
+from cards.infrastructure.repositories import (
+    IndexedRefCardRepository,
+    RefCardIndex,
+    RefCardRepository,
+    TcgSetRepository,
+)
 from core.settings.agents import settings
 
 
@@ -19,22 +26,55 @@ class MatchResult(BaseModel):
 @dataclass
 class CardMatcherAgentDeps:
     session: AsyncSession
+    session_maker: Optional[async_sessionmaker] = None
+    # Answers candidate searches in memory instead of querying Postgres
+    ref_card_index: Optional[RefCardIndex] = None
+    # Reference cards whose images look most like the upload; offered to the
+    # model alongside the metadata search results rather than trusted as is
+    visual_candidates: list[RefCard] = field(default_factory=list)
+    # The model refers to candidates by short handles instead of UUIDs; these
+    # map them back. Handles stay stable across tool retries within a run.
+    candidates: dict[str, UUID] = field(default_factory=dict)
+    handles: dict[UUID, str] = field(default_factory=dict)
+
+    def handle_for(self, id: UUID) -> str:
+        if id not in self.handles:
+            handle = f"c{len(self.handles) + 1}"
+            self.handles[id] = handle
+            self.candidates[handle] = id
+        return self.handles[id]
+
+
+async def select_candidate(
+    ctx: RunContext[CardMatcherAgentDeps], handle: str
+) -> MatchResult:
+    """Select the best matching candidate by its handle (e.g. "c1")."""
+    id = ctx.deps.candidates.get(handle.strip())
+    if id is None:
+        raise ModelRetry(
+            f"Unknown candidate handle {handle!r}. "
+            "Use the handle of one of the candidates returned by find_match_candidates."
+        )
+    return MatchResult(id=id)
 
 
+# The system prompt and tool definitions are static, so every request starts
+# with the same prefix and is eligible for Gemini's implicit context caching.
+# Keep per-run data out of them.
 card_matcher_agent = Agent(
     settings.default_agent_model,
     deps_type=CardMatcherAgentDeps,
-    output_type=MatchResult,
+    output_type=ToolOutput(select_candidate, name="select_candidate"),
     system_prompt=(
         "You are a Pokemon TCG card matching assistant. Given a card image:\n"
         "1. Extract the card's name, year, and tcg_local_id\n"
         "- tcg_local_id: The unique sequential number for the card within its set. It is always on the bottom of the card, more to one of the corners. It will always be in the format tcg_local_id/number_of_cards_in_set (i.e. 4/102, with 4 being the local id and 102 being the total number of cards in the set).\n"
         "- name: The name of the card. The name of the card will usually be the name of the Pokémon shown in the card, but it can also be an Item, Energy, Trainer or other more rare kinds. This is always on the top of the card along with other information that we don't want to extract like HP, type and optionally stage.\n"
         "- year: The copyright year printed at the bottom of the card (e.g. from '©2023 Pokémon' extract 2023, from '©1995-2023 Pokémon' extract 2023). If a range of years is shown, use the most recent one.\n"
-        "If any of this information cannot be determined from the image, return an empty string for string fields or 0 for the year field."
+        "If any of this information cannot be determined from the image, return an empty string for string fields or 0 for the year field.\n"
         "2. Call find_match_candidates with the extracted metadata\n"
-        "3. Return the id of the best matching candidate\n"
-        "You MUST return the id of one of the provided candidates — do not fabricate an id."
+        "3. Call select_candidate with the handle of the best matching candidate\n"
+        "You MUST select one of the provided candidates — do not fabricate a handle."
     ),
 )
 
@@ -46,14 +86,51 @@ async def find_match_candidates(
     year: int,
     local_id: str,
 ) -> list[dict]:
-    """Find candidate reference cards matching metadata extracted from the card image."""
-    service = RefCardService(RefCardRepository(ctx.deps.session))
-    candidates = await service.find_match_candidates(
-        name=name, year=year, local_id=local_id
+    """Find candidate reference cards matching metadata extracted from the card image.
+
+    Each candidate has a handle to pass to select_candidate, plus its name,
+    set, year and local id. Cards whose artwork looks like the image are
+    included as well and marked visually_similar; they are hints only, so
+    check their name and local id against the image.
+    """
+    if ctx.deps.ref_card_index is not None:
+        service = RefCardService(
+            IndexedRefCardRepository(ctx.deps.session, ctx.deps.ref_card_index)
+        )
+    else:
+        repo_factory = (
+            RefCardRepository.factory(ctx.deps.session_maker)
+            if settings.concurrent_candidate_search and ctx.deps.session_maker
+            else None
+        )
+        service = RefCardService(
+            RefCardRepository(ctx.deps.session), repo_factory=repo_factory
+        )
+    candidates = list(
+        await service.find_match_candidates(name=name, year=year, local_id=local_id)
     )
+    visual_ids = {c.id for c in ctx.deps.visual_candidates}
+    found_ids = {c.id for c in candidates}
+    candidates += [c for c in ctx.deps.visual_candidates if c.id not in found_ids]
     if not candidates:
         raise ModelRetry(
             f"No candidates found for name={name!r}, year={year!r}, local_id={local_id!r}. "
             "Double-check your extracted metadata and try again with corrected values."
         )
-    return [c.model_dump(mode="json") for c in candidates]
+
+    set_service = TcgSetService(TcgSetRepository(ctx.deps.session))
+    sets = {
+        tcg_set.id: tcg_set
+        for tcg_set in await set_service.get_sets({c.set_id for c in candidates})
+    }
+    return [
+        {
+            "handle": ctx.deps.handle_for(c.id),
+            "name": c.name,
+            "set": tcg_set.name if (tcg_set := sets.get(c.set_id)) else None,
+            "year": tcg_set.year if tcg_set else None,
+            "local_id": c.tcg_local_id,
+            **({"visually_similar": True} if c.id in visual_ids else {}),
+        }
+        for c in candidates
+    ]
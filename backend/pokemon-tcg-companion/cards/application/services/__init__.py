@@ -1,5 +1,17 @@
 from .card import CardService
+from .card_match_queue import CardMatchQueueService
+from .image_fingerprint import ImageFingerprintService
+from .outbox import OutboxService
 from .ref_card import RefCardService
+from .ref_card_embedding import RefCardEmbeddingService
 from .tcg_set import TcgSetService
 
-__all__ = ["CardService", "RefCardService", "TcgSetService"]
+__all__ = [
+    "CardMatchQueueService",
+    "CardService",
+    "ImageFingerprintService",
+    "OutboxService",
+    "RefCardEmbeddingService",
+    "RefCardService",
+    "TcgSetService",
+]
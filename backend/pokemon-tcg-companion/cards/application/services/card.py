@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 from typing import Optional
 from uuid import UUID
 
-from cards.domain.models import CardAdd, CardRead, CardUpdate
+from cards.domain.models import (
+    CardAdd,
+    CardCursor,
+    CardRead,
+    CardUpdate,
+    MatchingStatus,
+)
 from cards.domain.repositories import AbstractCardRepository
 
 
@@ -15,14 +21,41 @@ class CardService:
     async def add_card(self, card: CardAdd) -> CardRead:
         return await self.repo.add(card)
 
+    async def add_card_with_event(self, card: CardAdd, topic: str) -> CardRead:
+        return await self.repo.add_with_event(card, topic)
+
+    async def add_cards(self, cards: Sequence[CardAdd]) -> Sequence[CardRead]:
+        return await self.repo.add_many(cards)
+
+    async def add_cards_with_events(
+        self, cards: Sequence[CardAdd], topic: str
+    ) -> Sequence[CardRead]:
+        return await self.repo.add_many_with_events(cards, topic)
+
     async def get_card(self, id: UUID) -> Optional[CardRead]:
         return await self.repo.get(id)
 
     async def update_card(self, id: UUID, card: CardUpdate) -> CardRead:
         return await self.repo.update(id, card)
 
+    async def update_cards(self, updates: Sequence[tuple[UUID, CardUpdate]]) -> int:
+        return await self.repo.update_many(updates)
+
     async def list_cards(self) -> Sequence[CardRead]:
         return await self.repo.list()
 
+    async def list_user_cards(
+        self, user_id: str, limit: int, after: Optional[CardCursor] = None
+    ) -> Sequence[CardRead]:
+        return await self.repo.list_for_user(user_id, limit, after)
+
+    async def list_cards_by_status(
+        self,
+        statuses: Collection[MatchingStatus],
+        limit: int,
+        after: Optional[UUID] = None,
+    ) -> Sequence[CardRead]:
+        return await self.repo.list_by_status(statuses, limit, after)
+
     async def delete_card(self, id: UUID) -> None:
         return await self.repo.delete(id)
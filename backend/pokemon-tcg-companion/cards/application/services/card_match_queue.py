@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from cards.domain.models import CardMatchJob, CardMatchJobAdd, CardRead, CardUpdate
+from cards.domain.repositories import AbstractCardMatchJobRepository
+
+
+class CardMatchQueueService:
+    def __init__(self, repo: AbstractCardMatchJobRepository) -> None:
+        self.repo = repo
+
+    async def enqueue_cards(self, cards: Sequence[CardRead]) -> None:
+        await self.repo.add_many(
+            [
+                CardMatchJobAdd(card_id=card.id, image_path=card.image_path)
+                for card in cards
+            ]
+        )
+
+    async def claim_jobs(
+        self, limit: int, lease_seconds: float
+    ) -> Sequence[CardMatchJob]:
+        return await self.repo.claim(limit, lease_seconds)
+
+    async def renew_lease(self, job: CardMatchJob, lease_seconds: float) -> bool:
+        return await self.repo.renew(job, lease_seconds)
+
+    async def complete_job(self, job: CardMatchJob, card: CardUpdate) -> bool:
+        return await self.repo.complete(job, card)
+
+    async def retry_job(self, job: CardMatchJob, delay_seconds: float) -> bool:
+        return await self.repo.postpone(job, delay_seconds)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import UUID
+
+from cards.domain.models import ImageFingerprintAdd, RefCard
+from cards.domain.repositories import AbstractImageFingerprintRepository
+
+
+class ImageFingerprintService:
+    def __init__(self, repo: AbstractImageFingerprintRepository) -> None:
+        self.repo = repo
+
+    async def find_match(self, hash: int, max_distance: int) -> Optional[RefCard]:
+        """Return the reference card of the closest previously matched image
+        within ``max_distance`` bits of ``hash``, if any."""
+        return await self.repo.find_nearest(hash, max_distance)
+
+    async def remember_match(self, hash: int, ref_card_id: UUID) -> None:
+        await self.repo.add(ImageFingerprintAdd(hash=hash, ref_card_id=ref_card_id))
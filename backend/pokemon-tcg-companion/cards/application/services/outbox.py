@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Sequence
+
+from cards.domain.models import OutboxMessage
+from cards.domain.repositories import AbstractOutboxMessageRepository
+
+
+class OutboxService:
+    def __init__(self, repo: AbstractOutboxMessageRepository) -> None:
+        self.repo = repo
+
+    async def lock_pending(self, limit: int) -> Sequence[OutboxMessage]:
+        return await self.repo.lock_pending(limit)
+
+    async def mark_published(self, ids: Collection[int]) -> None:
+        await self.repo.delete_many(ids)
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Optional
 from uuid import UUID
 
 from cards.domain.models import RefCard, RefCardAdd, RefCardUpdate
-from cards.domain.repositories import AbstractRefCardRepository
-from core.rrf import reciprocal_rank_fusion
+from cards.domain.repositories import (
+    AbstractRefCardRepository,
+    RefCardRepositoryFactory,
+    fuse_candidate_searches,
+)
+
+CandidateSearch = Callable[[AbstractRefCardRepository], Awaitable[Sequence[RefCard]]]
+
+# RRF weights for the year+local_id, year+name and local_id+name searches.
+_CANDIDATE_WEIGHTS = [2.0, 1.0, 1.0]
 
 
 class RefCardService:
-    def __init__(self, repo: AbstractRefCardRepository) -> None:
+    def __init__(
+        self,
+        repo: AbstractRefCardRepository,
+        repo_factory: Optional[RefCardRepositoryFactory] = None,
+    ) -> None:
         self.repo = repo
+        self.repo_factory = repo_factory
 
     async def add_card(self, card: RefCardAdd) -> RefCard:
         return await self.repo.add(card)
@@ -25,22 +39,45 @@ class RefCardService:
     async def list_cards(self) -> Sequence[RefCard]:
         return await self.repo.list()
 
-    async def upsert_many_cards(self, cards: Sequence[RefCardAdd]) -> None:
+    async def upsert_many_cards(self, cards: Sequence[RefCardAdd]) -> Sequence[UUID]:
         return await self.repo.upsert_many(cards)
 
+    async def bulk_upsert_cards(self, cards: Sequence[RefCardAdd]) -> int:
+        return await self.repo.bulk_upsert(cards)
+
     async def find_match_candidates(
         self, name: str, year: int, local_id: str, limit: int = 10
     ) -> list[RefCard]:
-        # TODO: this can be optimized by doing the three searches in parallel,
-        # but its tricky since we cant reuse the same session across threads
-        year_local = (
-            await self.repo.search_by_year_and_local_id(year, local_id) if year else []
+        if self.repo_factory is None:
+            candidates = await self.repo.fused_candidates(
+                name=name,
+                year=year,
+                local_id=local_id,
+                limit=limit,
+                weights=_CANDIDATE_WEIGHTS,
+            )
+            return list(candidates)
+
+        searches: list[Optional[CandidateSearch]] = [
+            (lambda r: r.search_by_year_and_local_id(year, local_id)) if year else None,
+            (lambda r: r.search_by_year_and_name(year, name)) if year else None,
+            lambda r: r.search_by_local_id_and_name(local_id, name),
+        ]
+        # A session can't run queries concurrently, so each search gets its
+        # own repository (and pooled connection) from the factory.
+        year_local, year_name, local_name = await asyncio.gather(
+            *(self._run_isolated(s) for s in searches)
         )
-        year_name = await self.repo.search_by_year_and_name(year, name) if year else []
-        local_name = await self.repo.search_by_local_id_and_name(local_id, name)
 
-        return reciprocal_rank_fusion(
-            [year_local, year_name, local_name],
-            limit=limit,
-            weights=[2.0, 1.0, 1.0],
+        return fuse_candidate_searches(
+            name, year_local, year_name, local_name, limit, _CANDIDATE_WEIGHTS
         )
+
+    async def _run_isolated(
+        self, search: Optional[CandidateSearch]
+    ) -> Sequence[RefCard]:
+        if search is None or self.repo_factory is None:
+            return []
+
+        async with self.repo_factory() as repo:
+            return await search(repo)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from cards.domain.models import RefCard, RefCardEmbedding, RefCardEmbeddingAdd
+from cards.domain.repositories import AbstractRefCardEmbeddingRepository
+
+
+class RefCardEmbeddingService:
+    def __init__(self, repo: AbstractRefCardEmbeddingRepository) -> None:
+        self.repo = repo
+
+    async def upsert_embeddings(
+        self, embeddings: Sequence[RefCardEmbeddingAdd]
+    ) -> None:
+        return await self.repo.upsert_many(embeddings)
+
+    async def list_embeddings(self, model: str) -> Sequence[RefCardEmbedding]:
+        return await self.repo.list_by_model(model)
+
+    async def list_unembedded_cards(self, model: str) -> Sequence[RefCard]:
+        return await self.repo.list_unembedded_cards(model)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from cards.domain.models import TcgSet, TcgSetAdd
+from collections.abc import Collection, Sequence
+from uuid import UUID
+
+from cards.domain.models import TcgSet, TcgSetAdd, TcgSetSync, TcgSetSyncAdd
 from cards.domain.repositories import AbstractTcgSetRepository
 
 
@@ -10,3 +13,13 @@ class TcgSetService:
 
     async def upsert_set(self, set_data: TcgSetAdd) -> TcgSet:
         return await self.repo.upsert(set_data)
+
+    async def get_sets(self, ids: Collection[UUID]) -> Sequence[TcgSet]:
+        return await self.repo.list_by_ids(ids)
+
+    async def get_sync_states(self) -> dict[str, TcgSetSync]:
+        """Last synced state of each set, keyed by TCGdex set id."""
+        return {state.tcg_id: state for state in await self.repo.list_sync_states()}
+
+    async def record_syncs(self, states: Sequence[TcgSetSyncAdd]) -> None:
+        return await self.repo.record_syncs(states)
@@ -1,18 +1,33 @@
-from .card import Card, CardAdd, CardRead, CardUpdate, MatchingStatus
+from .card import Card, CardAdd, CardCursor, CardRead, CardUpdate, MatchingStatus
+from .card_match_job import CardMatchJob, CardMatchJobAdd
+from .image_fingerprint import ImageFingerprint, ImageFingerprintAdd
+from .outbox_message import OutboxMessage, OutboxMessageAdd
 from .ref_card import RefCard, RefCardAdd, RefCardRead, RefCardUpdate
-from .tcg_set import TcgSet, TcgSetAdd, TcgSetRead
+from .ref_card_embedding import RefCardEmbedding, RefCardEmbeddingAdd
+from .tcg_set import TcgSet, TcgSetAdd, TcgSetRead, TcgSetSync, TcgSetSyncAdd
 
 __all__ = [
     "RefCard",
     "RefCardAdd",
     "RefCardRead",
     "RefCardUpdate",
+    "RefCardEmbedding",
+    "RefCardEmbeddingAdd",
     "TcgSet",
     "TcgSetAdd",
     "TcgSetRead",
+    "TcgSetSync",
+    "TcgSetSyncAdd",
     "Card",
     "CardAdd",
+    "CardCursor",
+    "CardMatchJob",
+    "CardMatchJobAdd",
     "CardRead",
     "CardUpdate",
     "MatchingStatus",
+    "ImageFingerprint",
+    "ImageFingerprintAdd",
+    "OutboxMessage",
+    "OutboxMessageAdd",
 ]
@@ -2,6 +2,7 @@ import enum
 from typing import Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index
 from sqlmodel import AutoString, Field, Relationship, SQLModel
 
 from cards.domain.models.ref_card import RefCard
@@ -20,11 +21,15 @@ class CardBase(SQLModel):
 
 
 class Card(CardBase, table=True):
+    # Serves keyset pagination of a user's cards; also covers user_id lookups
+    __table_args__ = (
+        Index("ix_card_user_id_matching_status_id", "user_id", "matching_status", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     ref_card_id: Optional[UUID] = Field(
         foreign_key="refcard.id", default=None, nullable=True, index=True
     )
-    user_id: str = Field(index=True)
     matching_status: MatchingStatus = Field(
         default=MatchingStatus.pending, sa_type=AutoString
     )
@@ -45,6 +50,13 @@ class CardAdd(CardBase):
     pass
 
 
+class CardCursor(SQLModel):
+    """Position of the last card on a page, in list_for_user order."""
+
+    matching_status: MatchingStatus
+    id: UUID
+
+
 class CardUpdate(SQLModel):
     ref_card_id: Optional[UUID] = None
     user_id: Optional[str] = None
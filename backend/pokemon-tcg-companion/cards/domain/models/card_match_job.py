@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, Index, func
+from sqlmodel import Field, SQLModel
+
+
+class CardMatchJobBase(SQLModel):
+    card_id: UUID
+    image_path: str
+
+
+class CardMatchJob(CardMatchJobBase, table=True):
+    """A card waiting for the in-process match workers.
+
+    Workers claim a job by pushing ``available_at`` forward by a lease, which
+    they renew while the job runs, so the job of a worker that died becomes
+    claimable again once its lease runs out. Each claim increments
+    ``attempts``, which identifies the claim: a worker whose job was claimed
+    again can no longer change it. The job is deleted in the transaction that
+    records the card's match or final failure, and a card has at most one
+    job, so redelivered uploads are not matched twice.
+    """
+
+    __table_args__ = (Index("ix_cardmatchjob_available_at_id", "available_at", "id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    card_id: UUID = Field(
+        foreign_key="card.id", ondelete="CASCADE", unique=True, index=True
+    )
+    attempts: int = 0
+    available_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
+    )
+
+
+class CardMatchJobAdd(CardMatchJobBase):
+    pass
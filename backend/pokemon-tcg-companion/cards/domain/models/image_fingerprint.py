@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+from sqlalchemy import BigInteger
+from sqlmodel import Field, SQLModel
+
+FINGERPRINT_BITS = 64
+FINGERPRINT_CHUNKS = 4
+
+
+class ImageFingerprintBase(SQLModel):
+    ref_card_id: UUID
+
+
+class ImageFingerprint(ImageFingerprintBase, table=True):
+    """Perceptual hash of an uploaded image and the reference card it matched.
+
+    The 64-bit hash is stored as a signed BIGINT and additionally split into
+    four 16-bit chunks, each indexed, so near-duplicate lookups can use
+    multi-index hashing instead of scanning every fingerprint.
+    """
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    hash: int = Field(sa_type=BigInteger, unique=True)
+    chunk_0: int = Field(index=True)
+    chunk_1: int = Field(index=True)
+    chunk_2: int = Field(index=True)
+    chunk_3: int = Field(index=True)
+    ref_card_id: UUID = Field(foreign_key="refcard.id", index=True)
+
+
+class ImageFingerprintAdd(ImageFingerprintBase):
+    hash: int
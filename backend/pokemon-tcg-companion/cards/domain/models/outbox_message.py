@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, func
+from sqlmodel import Field, SQLModel
+
+
+class OutboxMessageBase(SQLModel):
+    topic: str
+    data: bytes
+
+
+class OutboxMessage(OutboxMessageBase, table=True):
+    """A Pub/Sub message written in the same transaction as the change it
+    announces, and deleted by the outbox relay once it has been published."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=func.now()
+        ),
+    )
+
+
+class OutboxMessageAdd(OutboxMessageBase):
+    pass
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import LargeBinary
+from sqlmodel import Field, SQLModel
+
+
+class RefCardEmbeddingBase(SQLModel):
+    ref_card_id: UUID
+    model: str
+    vector: bytes
+
+
+class RefCardEmbedding(RefCardEmbeddingBase, table=True):
+    """Image embedding of a reference card, as raw float32 bytes.
+
+    ``model`` names the descriptor that produced ``vector``, so embeddings
+    from an older descriptor are never compared against new ones.
+    """
+
+    ref_card_id: UUID = Field(foreign_key="refcard.id", primary_key=True)
+    vector: bytes = Field(sa_type=LargeBinary)
+
+
+class RefCardEmbeddingAdd(RefCardEmbeddingBase):
+    pass
@@ -24,3 +24,22 @@ class TcgSetRead(TcgSetBase):
 
 class TcgSetAdd(TcgSetBase):
     pass
+
+
+class TcgSetSyncBase(SQLModel):
+    tcg_id: str
+    card_count: int
+    content_hash: str
+
+
+class TcgSetSync(TcgSetSyncBase, table=True):
+    """Content fingerprint of a set as of its last catalog sync.
+
+    Lets the sync skip sets whose TCGdex contents have not changed.
+    """
+
+    tcg_id: str = Field(primary_key=True)
+
+
+class TcgSetSyncAdd(TcgSetSyncBase):
+    pass
@@ -1,9 +1,23 @@
 from .card import AbstractCardRepository
-from .ref_card import AbstractRefCardRepository
+from .card_match_job import AbstractCardMatchJobRepository
+from .image_fingerprint import AbstractImageFingerprintRepository
+from .outbox_message import AbstractOutboxMessageRepository
+from .ref_card import (
+    AbstractRefCardRepository,
+    RefCardRepositoryFactory,
+    fuse_candidate_searches,
+)
+from .ref_card_embedding import AbstractRefCardEmbeddingRepository
 from .tcg_set import AbstractTcgSetRepository
 
 __all__ = [
     "AbstractRefCardRepository",
+    "AbstractRefCardEmbeddingRepository",
     "AbstractCardRepository",
+    "AbstractCardMatchJobRepository",
+    "AbstractImageFingerprintRepository",
+    "AbstractOutboxMessageRepository",
     "AbstractTcgSetRepository",
+    "RefCardRepositoryFactory",
+    "fuse_candidate_searches",
 ]
@@ -1,23 +1,56 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 from typing import Optional
 from uuid import UUID
 
-from cards.domain.models import CardAdd, CardRead, CardUpdate
+from cards.domain.models import (
+    CardAdd,
+    CardCursor,
+    CardRead,
+    CardUpdate,
+    MatchingStatus,
+)
 
 
 class AbstractCardRepository(ABC):
     @abstractmethod
     async def add(self, card: CardAdd) -> CardRead: ...
 
+    @abstractmethod
+    async def add_with_event(self, card: CardAdd, topic: str) -> CardRead: ...
+
+    @abstractmethod
+    async def add_many(self, cards: Sequence[CardAdd]) -> Sequence[CardRead]: ...
+
+    @abstractmethod
+    async def add_many_with_events(
+        self, cards: Sequence[CardAdd], topic: str
+    ) -> Sequence[CardRead]: ...
+
     @abstractmethod
     async def get(self, id: UUID) -> Optional[CardRead]: ...
 
     @abstractmethod
     async def list(self) -> Sequence[CardRead]: ...
 
+    @abstractmethod
+    async def list_for_user(
+        self, user_id: str, limit: int, after: Optional[CardCursor] = None
+    ) -> Sequence[CardRead]: ...
+
+    @abstractmethod
+    async def list_by_status(
+        self,
+        statuses: Collection[MatchingStatus],
+        limit: int,
+        after: Optional[UUID] = None,
+    ) -> Sequence[CardRead]: ...
+
     @abstractmethod
     async def update(self, id: UUID, card: CardUpdate) -> CardRead: ...
 
+    @abstractmethod
+    async def update_many(self, updates: Sequence[tuple[UUID, CardUpdate]]) -> int: ...
+
     @abstractmethod
     async def delete(self, id: UUID) -> None: ...
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from cards.domain.models import CardMatchJob, CardMatchJobAdd, CardUpdate
+
+
+class AbstractCardMatchJobRepository(ABC):
+    @abstractmethod
+    async def add_many(self, jobs: Sequence[CardMatchJobAdd]) -> None: ...
+
+    @abstractmethod
+    async def claim(
+        self, limit: int, lease_seconds: float
+    ) -> Sequence[CardMatchJob]: ...
+
+    @abstractmethod
+    async def renew(self, job: CardMatchJob, lease_seconds: float) -> bool: ...
+
+    @abstractmethod
+    async def complete(self, job: CardMatchJob, card: CardUpdate) -> bool: ...
+
+    @abstractmethod
+    async def postpone(self, job: CardMatchJob, delay_seconds: float) -> bool: ...
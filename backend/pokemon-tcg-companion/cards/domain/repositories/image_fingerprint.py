@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from cards.domain.models import ImageFingerprintAdd, RefCard
+
+
+class AbstractImageFingerprintRepository(ABC):
+    @abstractmethod
+    async def add(self, fingerprint: ImageFingerprintAdd) -> None: ...
+
+    @abstractmethod
+    async def find_nearest(self, hash: int, max_distance: int) -> Optional[RefCard]: ...
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from collections.abc import Collection, Sequence
+
+from cards.domain.models import OutboxMessage
+
+
+class AbstractOutboxMessageRepository(ABC):
+    @abstractmethod
+    async def lock_pending(self, limit: int) -> Sequence[OutboxMessage]: ...
+
+    @abstractmethod
+    async def delete_many(self, ids: Collection[int]) -> None: ...
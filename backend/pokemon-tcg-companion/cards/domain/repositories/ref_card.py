@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from contextlib import AbstractAsyncContextManager
 from typing import Optional
 from uuid import UUID
 
 from cards.domain.models import RefCard, RefCardAdd, RefCardUpdate
+from core.rrf import reciprocal_rank_fusion
+from core.trgm import similarity
 
 
 class AbstractRefCardRepository(ABC):
@@ -20,7 +23,15 @@ class AbstractRefCardRepository(ABC):
     async def update(self, id: UUID, card: RefCardUpdate) -> RefCard: ...
 
     @abstractmethod
-    async def upsert_many(self, cards: Sequence[RefCardAdd]) -> None: ...
+    async def upsert_many(self, cards: Sequence[RefCardAdd]) -> Sequence[UUID]: ...
+
+    async def bulk_upsert(self, cards: Sequence[RefCardAdd]) -> int:
+        """Upsert a large batch of cards, e.g. a full catalog refresh.
+        Returns the number of cards written, which may exclude unchanged ones.
+
+        Implementations may override this with a faster bulk-load path.
+        """
+        return len(await self.upsert_many(cards))
 
     @abstractmethod
     async def search_by_year_and_local_id(
@@ -36,3 +47,55 @@ class AbstractRefCardRepository(ABC):
     async def search_by_local_id_and_name(
         self, local_id: str, name: str, limit: int = 20
     ) -> Sequence[RefCard]: ...
+
+    async def fused_candidates(
+        self,
+        name: str,
+        year: int,
+        local_id: str,
+        limit: int,
+        weights: Sequence[float],
+    ) -> Sequence[RefCard]:
+        """Fuse the year+local_id, year+name and local_id+name searches with
+        weighted reciprocal rank fusion. Year searches are skipped when year is 0.
+
+        Implementations may override this to fuse the rankings server-side.
+        """
+        year_local = (
+            await self.search_by_year_and_local_id(year, local_id) if year else []
+        )
+        year_name = await self.search_by_year_and_name(year, name) if year else []
+        local_name = await self.search_by_local_id_and_name(local_id, name)
+
+        return fuse_candidate_searches(
+            name, year_local, year_name, local_name, limit, weights
+        )
+
+
+def fuse_candidate_searches(
+    name: str,
+    year_local: Sequence[RefCard],
+    year_name: Sequence[RefCard],
+    local_name: Sequence[RefCard],
+    limit: int,
+    weights: Sequence[float],
+) -> list[RefCard]:
+    """Fuse the results of the three candidate searches with weighted RRF.
+
+    The year+local_id matches have no order of their own, so like the name
+    searches they are ranked by name similarity and then ``tcg_id``, as
+    ``RefCardRepository.fused_candidates`` ranks them in SQL.
+    """
+    year_local = sorted(
+        year_local, key=lambda card: (-similarity(card.name, name), card.tcg_id)
+    )
+    return reciprocal_rank_fusion(
+        [year_local, year_name, local_name], limit=limit, weights=list(weights)
+    )
+
+
+# Opens a repository bound to its own session, so independent queries can run
+# concurrently on separate pooled connections.
+RefCardRepositoryFactory = Callable[
+    [], AbstractAsyncContextManager[AbstractRefCardRepository]
+]
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from cards.domain.models import RefCard, RefCardEmbedding, RefCardEmbeddingAdd
+
+
+class AbstractRefCardEmbeddingRepository(ABC):
+    @abstractmethod
+    async def upsert_many(self, embeddings: Sequence[RefCardEmbeddingAdd]) -> None: ...
+
+    @abstractmethod
+    async def list_by_model(self, model: str) -> Sequence[RefCardEmbedding]: ...
+
+    @abstractmethod
+    async def list_unembedded_cards(self, model: str) -> Sequence[RefCard]: ...
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
+from collections.abc import Collection, Sequence
 from typing import Optional
+from uuid import UUID
 
-from cards.domain.models import TcgSet, TcgSetAdd
+from cards.domain.models import TcgSet, TcgSetAdd, TcgSetSync, TcgSetSyncAdd
 
 
 class AbstractTcgSetRepository(ABC):
@@ -10,3 +12,12 @@ class AbstractTcgSetRepository(ABC):
 
     @abstractmethod
     async def get_by_tcg_id(self, tcg_id: str) -> Optional[TcgSet]: ...
+
+    @abstractmethod
+    async def list_by_ids(self, ids: Collection[UUID]) -> Sequence[TcgSet]: ...
+
+    @abstractmethod
+    async def list_sync_states(self) -> Sequence[TcgSetSync]: ...
+
+    @abstractmethod
+    async def record_syncs(self, states: Sequence[TcgSetSyncAdd]) -> None: ...
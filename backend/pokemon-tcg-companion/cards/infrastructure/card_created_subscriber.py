@@ -0,0 +1,97 @@
+"""Streaming-pull consumer for card-created messages.
+
+An alternative to the push webhook: messages are pulled over one long-lived
+gRPC stream instead of arriving as one authenticated HTTP request each, and
+flow control caps how many are held in memory at once, so a slow match
+backend pushes back on Pub/Sub rather than piling up requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import partial
+from typing import Optional
+
+from google.cloud import pubsub_v1
+from google.cloud.pubsub_v1.subscriber.message import Message
+
+from cards.domain.models import CardRead
+from cards.infrastructure.match_dispatch import dispatch_matches
+from core.batching import Coalescer
+from core.pubsub_model import parse_message_data
+
+logger = logging.getLogger(__name__)
+
+
+class CardCreatedSubscriber:
+    """Dispatches card-created messages pulled from ``subscription_path``.
+
+    The client leases at most ``max_messages`` messages (or ``max_bytes`` of
+    them) at a time. Messages received within ``batch_max_wait_seconds`` of
+    each other are handed to the match backend together, up to
+    ``batch_max_size`` at a time, and acknowledged together once dispatched;
+    if dispatch fails they are nacked so Pub/Sub redelivers them.
+    """
+
+    def __init__(
+        self,
+        subscription_path: str,
+        max_messages: int,
+        max_bytes: int,
+        batch_max_size: int,
+        batch_max_wait_seconds: float,
+        subscriber: Optional[pubsub_v1.SubscriberClient] = None,
+    ) -> None:
+        self.subscription_path = subscription_path
+        self.flow_control = pubsub_v1.types.FlowControl(
+            max_messages=max_messages, max_bytes=max_bytes
+        )
+        self._subscriber = subscriber
+        self._batcher = Coalescer(
+            dispatch_matches,
+            max_size=batch_max_size,
+            max_wait_seconds=batch_max_wait_seconds,
+        )
+
+    async def run(self) -> None:
+        """Pull messages until cancelled or the stream fails."""
+        loop = asyncio.get_running_loop()
+        subscriber = self._subscriber or pubsub_v1.SubscriberClient()
+        streaming_pull = subscriber.subscribe(
+            self.subscription_path,
+            callback=partial(self._on_message, loop),
+            flow_control=self.flow_control,
+        )
+        logger.info("Listening for card-created messages on %s", self.subscription_path)
+        try:
+            await asyncio.wrap_future(streaming_pull)
+        finally:
+            streaming_pull.cancel()
+            # Let the client flush the acks it has already batched up
+            await asyncio.to_thread(subscriber.close)
+
+    async def handle(self, message: Message) -> None:
+        """Decode one message, dispatch it with its batch and settle it."""
+        try:
+            payload = parse_message_data(message.data, CardRead)
+        except ValueError:
+            # Redelivering a malformed message cannot make it succeed
+            logger.exception("Dropping malformed message %s", message.message_id)
+            message.ack()
+            return
+
+        try:
+            await self._batcher.submit(payload)
+        except Exception:
+            logger.exception("Failed to dispatch card %s", payload.id)
+            message.nack()
+        else:
+            message.ack()
+
+    def _on_message(self, loop: asyncio.AbstractEventLoop, message: Message) -> None:
+        # Runs on the client's callback thread pool
+        asyncio.run_coroutine_threadsafe(self.handle(message), loop)
+
+
+__all__ = ["CardCreatedSubscriber"]
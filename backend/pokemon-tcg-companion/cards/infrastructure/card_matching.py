@@ -0,0 +1,244 @@
+"""The download → match pipeline for an uploaded card image.
+
+Plain coroutines shared by the Prefect flows, which wrap them in tasks for
+retries and observability, and the queue-fed match workers, which retry
+through the queue and run without the Prefect engine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+import logfire
+from google.cloud import storage
+from pydantic import BaseModel
+from pydantic_ai import BinaryContent
+from pydantic_ai.models.google import GoogleModelSettings
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.application.agents import CardMatcherAgentDeps, card_matcher_agent
+from cards.application.services import ImageFingerprintService, RefCardService
+from cards.domain.models import RefCard
+from cards.infrastructure.repositories import (
+    ImageFingerprintRepository,
+    RefCardEmbeddingIndex,
+    RefCardIndex,
+    RefCardRepository,
+    get_ref_card_embedding_index,
+    get_ref_card_index,
+)
+from core.db import get_session_maker, with_session
+from core.flows import get_logger
+from core.images import dhash, downscale_image, embed_image
+from core.settings.prefect import settings
+
+
+class CardImage(BaseModel):
+    """A downloaded card image, spooled to local disk.
+
+    Tasks pass this reference around instead of the image bytes, which keeps
+    images out of Prefect task results and input hashing.
+    """
+
+    path: str
+    media_type: str
+
+    def read_bytes(self) -> bytes:
+        return Path(self.path).read_bytes()
+
+    def discard(self) -> None:
+        Path(self.path).unlink(missing_ok=True)
+
+
+async def fetch_card_image(storage_client: storage.Client, card_path: str) -> CardImage:
+    """Download the image at ``card_path`` to a temporary file, downscaling
+    it when it is larger than the model needs. The caller discards it."""
+    blob = storage_client.bucket(settings.gcp_bucket).blob(card_path)
+
+    fd, path = tempfile.mkstemp(prefix="card-")
+    os.close(fd)
+    image = CardImage(path=path, media_type="")
+    try:
+        # Streams the object to disk in chunks rather than into memory
+        await asyncio.to_thread(blob.download_to_filename, path)
+
+        image.media_type = blob.content_type
+        if settings.card_image_max_dimension:
+            # Phone photos are far larger than the model needs to read a card
+            image.media_type = (
+                await asyncio.to_thread(
+                    downscale_image,
+                    path,
+                    settings.card_image_max_dimension,
+                    settings.card_image_jpeg_quality,
+                )
+                or image.media_type
+            )
+    except Exception:
+        image.discard()
+        raise
+
+    return image
+
+
+async def _load_ref_card_index(session: AsyncSession) -> RefCardIndex:
+    return await get_ref_card_index(session, settings.ref_card_index_max_age_seconds)
+
+
+async def shared_ref_card_index() -> Optional[RefCardIndex]:
+    """Return the process-wide candidate index, or None if it is disabled.
+
+    Building it reads the whole catalog and takes seconds of CPU, far more
+    than the candidate queries of a single match, so only callers that run
+    many matches in one process should use it.
+    """
+    if not settings.ref_card_index_enabled:
+        return None
+    return await with_session(_load_ref_card_index)
+
+
+async def _load_embedding_index(session: AsyncSession) -> RefCardEmbeddingIndex:
+    return await get_ref_card_embedding_index(
+        session, settings.visual_match_index_max_age_seconds
+    )
+
+
+async def shared_embedding_index() -> Optional[RefCardEmbeddingIndex]:
+    """Return the process-wide embedding index, or None if visual matching is
+    disabled. Like ``shared_ref_card_index`` it loads the whole catalog's
+    embeddings, so it is only for callers that run many matches."""
+    if not settings.visual_match_enabled:
+        return None
+    return await with_session(_load_embedding_index)
+
+
+async def _run_card_matcher_agent(
+    session: AsyncSession,
+    image: CardImage,
+    ref_card_index: Optional[RefCardIndex] = None,
+    visual_candidates: Sequence[RefCard] = (),
+) -> RefCard:
+    result = await card_matcher_agent.run(
+        [
+            "Match the provided Pokémon card image to one of the reference cards:",
+            BinaryContent(data=image.read_bytes(), media_type=image.media_type),
+        ],
+        deps=CardMatcherAgentDeps(
+            session=session,
+            session_maker=get_session_maker(),
+            ref_card_index=ref_card_index,
+            visual_candidates=list(visual_candidates),
+        ),
+        model_settings=GoogleModelSettings(
+            google_thinking_config={"include_thoughts": True}
+        ),
+    )
+
+    usage = result.usage()
+    logfire.info(
+        "Card matcher used {input_tokens} input tokens "
+        "({cache_read_tokens} cached) and {output_tokens} output tokens",
+        input_tokens=usage.input_tokens,
+        cache_read_tokens=usage.cache_read_tokens,
+        output_tokens=usage.output_tokens,
+        requests=usage.requests,
+        tool_calls=usage.tool_calls,
+    )
+
+    service = RefCardService(RefCardRepository(session))
+    matched = await service.get_card(result.output.id)
+    if matched is None:
+        raise ValueError(
+            f"Agent returned id {result.output.id!r} which does not exist in the database"
+        )
+    return matched
+
+
+async def _find_fingerprint_match(
+    session: AsyncSession, fingerprint: int
+) -> Optional[RefCard]:
+    service = ImageFingerprintService(ImageFingerprintRepository(session))
+    return await service.find_match(
+        fingerprint, settings.image_fingerprint_max_distance
+    )
+
+
+async def _remember_fingerprint(
+    session: AsyncSession, fingerprint: int, matched_card: RefCard
+) -> None:
+    service = ImageFingerprintService(ImageFingerprintRepository(session))
+    await service.remember_match(fingerprint, matched_card.id)
+
+
+async def _find_visual_candidates(
+    session: AsyncSession, image: CardImage, index: RefCardEmbeddingIndex
+) -> list[RefCard]:
+    vector = await asyncio.to_thread(embed_image, image.path)
+    if vector is None:
+        return []
+
+    service = RefCardService(RefCardRepository(session))
+    candidates = []
+    for ref_card_id, _ in index.search(vector, settings.visual_match_candidates):
+        if (ref_card := await service.get_card(ref_card_id)) is not None:
+            candidates.append(ref_card)
+    return candidates
+
+
+async def match_card_image(
+    image: CardImage,
+    agent_slots: Optional[asyncio.Semaphore] = None,
+    ref_card_index: Optional[RefCardIndex] = None,
+    embedding_index: Optional[RefCardEmbeddingIndex] = None,
+) -> RefCard:
+    """Match an image to a reference card.
+
+    A near-identical image that was matched before is reused when
+    fingerprinting is enabled. Otherwise the agent decides, and its result is
+    fingerprinted for future uploads. If ``embedding_index`` is given, the
+    nearest neighbours of the image are offered to the agent as extra
+    candidates. ``agent_slots`` bounds concurrent agent runs only;
+    ``ref_card_index`` answers the agent's candidate searches in memory.
+    """
+    fingerprint = None
+    if settings.image_fingerprint_enabled:
+        fingerprint = await asyncio.to_thread(dhash, image.path)
+        if fingerprint is not None:
+            known_match = await with_session(_find_fingerprint_match, fingerprint)
+            if known_match is not None:
+                return known_match
+
+    visual_candidates = []
+    if embedding_index is not None:
+        visual_candidates = await with_session(
+            _find_visual_candidates, image, embedding_index
+        )
+
+    async with agent_slots or contextlib.nullcontext():
+        matched = await with_session(
+            _run_card_matcher_agent, image, ref_card_index, visual_candidates
+        )
+
+    if fingerprint is not None:
+        try:
+            await with_session(_remember_fingerprint, fingerprint, matched)
+        except Exception:
+            # The match itself succeeded; losing the fingerprint only costs a
+            # future cache hit.
+            get_logger(__name__).exception("Failed to record image fingerprint")
+    return matched
+
+
+__all__ = [
+    "CardImage",
+    "fetch_card_image",
+    "match_card_image",
+    "shared_embedding_index",
+    "shared_ref_card_index",
+]
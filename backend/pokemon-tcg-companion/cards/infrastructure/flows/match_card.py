@@ -3,27 +3,38 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Optional
 from uuid import UUID
 
+from google.api_core.exceptions import Forbidden, Unauthorized
+from google.auth.exceptions import RefreshError
 from google.cloud import storage
 from prefect import flow, task
+from prefect.cache_policies import NO_CACHE
 from prefect_gcp import GcpCredentials
-from pydantic_ai import BinaryContent
-from pydantic_ai.models.google import GoogleModelSettings
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cards.application.agents import CardMatcherAgentDeps, card_matcher_agent
-from cards.application.services import CardService, RefCardService
+from cards.application.services import CardService
 from cards.domain.models import CardRead, CardUpdate, MatchingStatus, RefCard
-from cards.infrastructure.repositories import CardRepository, RefCardRepository
+from cards.infrastructure.card_matching import (
+    CardImage,
+    fetch_card_image,
+    match_card_image,
+)
+from cards.infrastructure.repositories import (
+    CardRepository,
+    RefCardEmbeddingIndex,
+    RefCardIndex,
+)
 from core.db import with_session
 from core.flows import with_logfire
+from core.gcp import CachedClient
 from core.settings.prefect import settings
 
 FLOW_NAME = "match_card_flow"
 
 
-async def _get_storage_client() -> storage.Client:
+async def _build_storage_client() -> storage.Client:
     try:
         gcp_credentials_block = await GcpCredentials.load("gcp-credentials")  # type: ignore[misc] this is a false-positive
         return gcp_credentials_block.get_cloud_storage_client()
@@ -31,47 +42,54 @@ async def _get_storage_client() -> storage.Client:
         return storage.Client()
 
 
-@task(
-    retries=settings.default_flow_retries,
-    retry_delay_seconds=settings.default_flow_retry_delay_seconds,
+# Loading the credentials block and building the client costs more than
+# downloading a small card image, so it is done once per process and shared by
+# every task (including retries) that runs in it.
+_storage_client = CachedClient(
+    _build_storage_client, ttl_seconds=settings.gcp_client_ttl_seconds
 )
-async def download_card(card_path: str) -> tuple[bytes, str]:
-    storage_client = await _get_storage_client()
-    bucket = storage_client.bucket(settings.gcp_bucket)
-    blob = bucket.blob(card_path)
 
-    return await asyncio.to_thread(blob.download_as_bytes), blob.content_type
 
+async def _get_storage_client() -> storage.Client:
+    return await _storage_client.get()
 
-async def _run_card_matcher_agent(
-    session: AsyncSession, card_bytes: bytes, card_mimetype: str
-) -> RefCard:
-    result = await card_matcher_agent.run(
-        [
-            "Match the provided Pokémon card image to one of the reference cards:",
-            BinaryContent(data=card_bytes, media_type=card_mimetype),
-        ],
-        deps=CardMatcherAgentDeps(session=session),
-        model_settings=GoogleModelSettings(
-            google_thinking_config={"include_thoughts": True}
-        ),
-    )
 
-    service = RefCardService(RefCardRepository(session))
-    matched = await service.get_card(result.output.id)
-    if matched is None:
-        raise ValueError(
-            f"Agent returned id {result.output.id!r} which does not exist in the database"
-        )
-    return matched
+def invalidate_storage_client() -> None:
+    """Force the next download to rebuild the client and reload credentials."""
+    _storage_client.invalidate()
 
 
+# Not cached: the image is a temporary file its caller deletes, so a cached
+# result could point at a file that is already gone
 @task(
     retries=settings.default_flow_retries,
     retry_delay_seconds=settings.default_flow_retry_delay_seconds,
+    cache_policy=NO_CACHE,
 )
-async def run_card_matcher_agent(card_bytes: bytes, card_mimetype: str) -> RefCard:
-    return await with_session(_run_card_matcher_agent, card_bytes, card_mimetype)
+async def download_card(card_path: str) -> CardImage:
+    storage_client = await _get_storage_client()
+    try:
+        return await fetch_card_image(storage_client, card_path)
+    except (RefreshError, Unauthorized, Forbidden):
+        # Credentials may have been rotated; rebuild the client before retrying
+        invalidate_storage_client()
+        raise
+
+
+# Not cached: hashing the inputs would pickle the semaphore and the indexes,
+# and nothing here is worth reusing
+@task(
+    retries=settings.default_flow_retries,
+    retry_delay_seconds=settings.default_flow_retry_delay_seconds,
+    cache_policy=NO_CACHE,
+)
+async def match_image(
+    image: CardImage,
+    agent_slots: Optional[asyncio.Semaphore] = None,
+    ref_card_index: Optional[RefCardIndex] = None,
+    embedding_index: Optional[RefCardEmbeddingIndex] = None,
+) -> RefCard:
+    return await match_card_image(image, agent_slots, ref_card_index, embedding_index)
 
 
 async def _update_card_with_match(
@@ -105,13 +123,17 @@ async def update_card_with_match(card_id: str, matched_card: RefCard) -> CardRea
 @flow(name=FLOW_NAME, log_prints=True)
 @with_logfire(pydantic_ai=True)
 async def match_card_flow(card_id: str, image_path: str):
+    image = None
     try:
-        card_bytes, card_mimetype = await download_card(image_path)
-        matched_ref_card = await run_card_matcher_agent(card_bytes, card_mimetype)
+        image = await download_card(image_path)
+        matched_ref_card = await match_image(image)
         card = await update_card_with_match(card_id, matched_ref_card)
     except Exception:
         await with_session(_update_card_with_failure, card_id)
         raise
+    finally:
+        if image is not None:
+            image.discard()
 
     return {
         "card": card.model_dump(),
@@ -119,4 +141,11 @@ async def match_card_flow(card_id: str, image_path: str):
     }
 
 
-__all__ = ["FLOW_NAME", "match_card_flow"]
+__all__ = [
+    "FLOW_NAME",
+    "CardImage",
+    "download_card",
+    "invalidate_storage_client",
+    "match_card_flow",
+    "match_image",
+]
@@ -0,0 +1,97 @@
+"""Prefect flow for matching many uploaded card images in a single run."""
+
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from prefect import flow, get_run_logger, task
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.application.services import CardService
+from cards.domain.models import CardUpdate, MatchingStatus
+from cards.infrastructure.card_matching import (
+    shared_embedding_index,
+    shared_ref_card_index,
+)
+from cards.infrastructure.flows.match_card import download_card, match_image
+from cards.infrastructure.repositories import CardRepository
+from core.db import with_session
+from core.flows import with_logfire
+from core.settings.prefect import settings
+
+FLOW_NAME = "match_cards_batch_flow"
+
+
+class CardToMatch(BaseModel):
+    card_id: str
+    image_path: str
+
+
+async def _update_cards(
+    session: AsyncSession, updates: list[tuple[UUID, CardUpdate]]
+) -> None:
+    await CardService(CardRepository(session)).update_cards(updates)
+
+
+@task(
+    retries=settings.default_flow_retries,
+    retry_delay_seconds=settings.default_flow_retry_delay_seconds,
+)
+async def update_cards(updates: list[tuple[UUID, CardUpdate]]) -> None:
+    await with_session(_update_cards, updates)
+
+
+@flow(name=FLOW_NAME, log_prints=True)
+@with_logfire(pydantic_ai=True)
+async def match_cards_batch_flow(
+    cards: list[CardToMatch], agent_concurrency: Optional[int] = None
+):
+    logger = get_run_logger()
+    download_slots = asyncio.Semaphore(settings.match_batch_download_concurrency)
+    agent_slots = asyncio.Semaphore(
+        agent_concurrency or settings.match_batch_agent_concurrency
+    )
+    # Built once for the whole batch, and only when enough cards share them
+    ref_card_index = (
+        await shared_ref_card_index()
+        if len(cards) >= settings.ref_card_index_min_batch_size
+        else None
+    )
+    embedding_index = (
+        await shared_embedding_index()
+        if len(cards) >= settings.visual_match_min_batch_size
+        else None
+    )
+
+    async def match(card: CardToMatch) -> CardUpdate:
+        image = None
+        try:
+            async with download_slots:
+                image = await download_card(card.image_path)
+            matched = await match_image(
+                image, agent_slots, ref_card_index, embedding_index
+            )
+        except Exception:
+            logger.exception("Failed to match card %s", card.card_id)
+            return CardUpdate(matching_status=MatchingStatus.failed)
+        finally:
+            if image is not None:
+                image.discard()
+
+        return CardUpdate(
+            ref_card_id=matched.id, matching_status=MatchingStatus.matched
+        )
+
+    results = await asyncio.gather(*(match(card) for card in cards))
+    updates = [
+        (UUID(card.card_id), update)
+        for card, update in zip(cards, results, strict=True)
+    ]
+    await update_cards(updates)
+
+    matched = sum(u.matching_status == MatchingStatus.matched for _, u in updates)
+    return {"matched": matched, "failed": len(updates) - matched}
+
+
+__all__ = ["FLOW_NAME", "CardToMatch", "match_cards_batch_flow"]
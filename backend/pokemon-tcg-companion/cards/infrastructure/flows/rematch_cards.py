@@ -0,0 +1,118 @@
+"""Prefect flow for re-matching cards that failed or never got matched."""
+
+import asyncio
+from collections.abc import Sequence
+from typing import Optional
+from uuid import UUID
+
+from prefect import flow, get_run_logger, task
+from prefect.variables import Variable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.application.services import CardService
+from cards.domain.models import CardRead, MatchingStatus
+from cards.infrastructure.flows.match_cards_batch import (
+    CardToMatch,
+    match_cards_batch_flow,
+)
+from cards.infrastructure.repositories import CardRepository
+from core.db import with_session
+from core.flows import with_logfire
+from core.settings.prefect import settings
+
+FLOW_NAME = "rematch_cards_flow"
+
+# Prefect variables holding the id of the last card handed to a batch, so an
+# interrupted backfill resumes where it stopped instead of starting over.
+CURSOR_VARIABLE_PREFIX = "rematch_cards_cursor"
+
+
+def _cursor_variable(statuses: Sequence[MatchingStatus]) -> str:
+    """Name of the cursor for a backfill over ``statuses``.
+
+    Each status set has its own cursor: a cursor taken over failed cards only
+    would otherwise make a run that includes pending cards skip every pending
+    card before it, and backfills over different sets would overwrite it.
+    """
+    return "_".join([CURSOR_VARIABLE_PREFIX, *sorted(s.value for s in statuses)])
+
+
+async def _list_cards(
+    session: AsyncSession,
+    statuses: Sequence[MatchingStatus],
+    limit: int,
+    after: Optional[UUID],
+) -> Sequence[CardRead]:
+    return await CardService(CardRepository(session)).list_cards_by_status(
+        statuses, limit, after
+    )
+
+
+@task(
+    retries=settings.default_flow_retries,
+    retry_delay_seconds=settings.default_flow_retry_delay_seconds,
+)
+async def list_cards_to_rematch(
+    statuses: list[MatchingStatus], limit: int, after: Optional[UUID]
+) -> Sequence[CardRead]:
+    return await with_session(_list_cards, statuses, limit, after)
+
+
+@flow(name=FLOW_NAME, log_prints=True)
+@with_logfire()
+async def rematch_cards_flow(
+    include_pending: bool = False,
+    batch_size: int = settings.rematch_batch_size,
+    agent_concurrency: int = settings.rematch_agent_concurrency,
+    batch_delay_seconds: float = settings.rematch_batch_delay_seconds,
+    restart: bool = False,
+):
+    """Walk failed cards (and pending ones if ``include_pending``) in id order
+    and match them in sequential batches.
+
+    Only ``agent_concurrency`` agent runs are in flight at a time, and each
+    batch is followed by a ``batch_delay_seconds`` pause, so recovering from a
+    model outage does not flood the provider. Pending cards are opt-in since
+    cards without a status yet may still have a match run in flight. Progress
+    is saved after each batch; ``restart`` discards it.
+    """
+    logger = get_run_logger()
+    statuses = [MatchingStatus.failed]
+    if include_pending:
+        statuses.append(MatchingStatus.pending)
+
+    cursor = _cursor_variable(statuses)
+    saved = None if restart else await Variable.aget(cursor)
+    after = UUID(saved) if isinstance(saved, str) else None
+    if after is not None:
+        logger.info("Resuming after card %s", after)
+
+    totals = {"matched": 0, "failed": 0}
+    while True:
+        cards = await list_cards_to_rematch(statuses, batch_size, after)
+        if not cards:
+            break
+
+        result = await match_cards_batch_flow(
+            cards=[
+                CardToMatch(card_id=str(card.id), image_path=card.image_path)
+                for card in cards
+            ],
+            agent_concurrency=agent_concurrency,
+        )
+        for key in totals:
+            totals[key] += result[key]
+
+        after = cards[-1].id
+        await Variable.aset(cursor, str(after), overwrite=True)
+        logger.info("Re-matched %d card(s), up to %s", len(cards), after)
+
+        if len(cards) < batch_size:
+            break
+        await asyncio.sleep(batch_delay_seconds)
+
+    await Variable.aunset(cursor)
+    return totals
+
+
+__all__ = ["FLOW_NAME", "rematch_cards_flow"]
@@ -0,0 +1,69 @@
+"""Hands newly created cards off to the configured match backend.
+
+Shared by the push webhook and the streaming-pull subscriber so both deliver
+card-created messages the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.application.services import CardMatchQueueService
+from cards.domain.models import CardRead
+from cards.infrastructure.flows import match_card, match_cards_batch
+from cards.infrastructure.repositories import CardMatchJobRepository
+from core import flows
+from core.db import with_session
+from core.settings.app import CardMatchBackend, settings
+
+
+async def dispatch_match(card: CardRead) -> None:
+    """Start a ``match_card_flow`` run for a single card."""
+    await flows.arun_deployment(
+        name=flows.get_deployment_name(match_card.FLOW_NAME),
+        parameters={"card_id": str(card.id), "image_path": card.image_path},
+        timeout=0,
+    )
+
+
+async def dispatch_match_batch(cards: Sequence[CardRead]) -> None:
+    """Start one ``match_cards_batch_flow`` run for all of ``cards``."""
+    await flows.arun_deployment(
+        name=flows.get_deployment_name(match_cards_batch.FLOW_NAME),
+        parameters={
+            "cards": [
+                {"card_id": str(card.id), "image_path": card.image_path}
+                for card in cards
+            ]
+        },
+        timeout=0,
+    )
+
+
+async def enqueue_matches(session: AsyncSession, cards: Sequence[CardRead]) -> None:
+    """Add the cards to the ``cardmatchjob`` queue for the match workers."""
+    await CardMatchQueueService(CardMatchJobRepository(session)).enqueue_cards(cards)
+
+
+async def dispatch_matches(cards: Sequence[CardRead]) -> None:
+    """Hand a group of cards to the configured backend in as few calls as it
+    allows: one queue insert, one batch flow run, or a flow run per card."""
+    if not cards:
+        return
+    if settings.card_match_backend == CardMatchBackend.queue:
+        await with_session(enqueue_matches, cards)
+    elif settings.card_match_batch_enabled:
+        await dispatch_match_batch(cards)
+    else:
+        await asyncio.gather(*(dispatch_match(card) for card in cards))
+
+
+__all__ = [
+    "dispatch_match",
+    "dispatch_match_batch",
+    "dispatch_matches",
+    "enqueue_matches",
+]
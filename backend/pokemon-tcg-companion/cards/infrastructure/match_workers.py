@@ -0,0 +1,239 @@
+"""In-process card matching fed by the ``cardmatchjob`` queue table.
+
+An alternative to dispatching a Prefect deployment run per upload: jobs are
+claimed straight from Postgres and run through the same download → match →
+update pipeline as ``match_card_flow``, without creating a flow run or waiting
+for a runner to poll for it. The pipeline runs as plain coroutines, outside
+Prefect's task engine; failed jobs are retried through the queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from google.api_core.exceptions import Forbidden, Unauthorized
+from google.auth.exceptions import RefreshError
+from google.cloud import storage
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.application.services import CardMatchQueueService
+from cards.domain.models import CardMatchJob, CardUpdate, MatchingStatus
+from cards.infrastructure.card_matching import (
+    CardImage,
+    fetch_card_image,
+    match_card_image,
+    shared_embedding_index,
+    shared_ref_card_index,
+)
+from cards.infrastructure.repositories import CardMatchJobRepository
+from core.db import with_session
+from core.gcp import CachedClient
+from core.settings.prefect import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _build_storage_client() -> storage.Client:
+    # Application Default Credentials; the Prefect credentials block would
+    # need a Prefect API to load from
+    return await asyncio.to_thread(storage.Client)
+
+
+_storage_client = CachedClient(
+    _build_storage_client, ttl_seconds=settings.gcp_client_ttl_seconds
+)
+
+
+async def _get_storage_client() -> storage.Client:
+    return await _storage_client.get()
+
+
+async def _download_card(card_path: str) -> CardImage:
+    storage_client = await _get_storage_client()
+    try:
+        return await fetch_card_image(storage_client, card_path)
+    except (RefreshError, Unauthorized, Forbidden):
+        # Credentials may have been rotated; the job's retry gets a new client
+        _storage_client.invalidate()
+        raise
+
+
+async def _claim_jobs(
+    session: AsyncSession, limit: int, lease_seconds: float
+) -> list[CardMatchJob]:
+    jobs = await CardMatchQueueService(CardMatchJobRepository(session)).claim_jobs(
+        limit, lease_seconds
+    )
+    return list(jobs)
+
+
+async def _renew_lease(
+    session: AsyncSession, job: CardMatchJob, lease_seconds: float
+) -> bool:
+    return await CardMatchQueueService(CardMatchJobRepository(session)).renew_lease(
+        job, lease_seconds
+    )
+
+
+async def _finish_job(
+    session: AsyncSession, job: CardMatchJob, update: CardUpdate
+) -> bool:
+    return await CardMatchQueueService(CardMatchJobRepository(session)).complete_job(
+        job, update
+    )
+
+
+async def _retry_job(
+    session: AsyncSession, job: CardMatchJob, delay_seconds: float
+) -> bool:
+    return await CardMatchQueueService(CardMatchJobRepository(session)).retry_job(
+        job, delay_seconds
+    )
+
+
+class MatchWorkerPool:
+    """Matches queued cards with at most ``concurrency`` jobs in flight.
+
+    The pool claims only as many jobs as it has free slots and polls every
+    ``poll_interval_seconds`` while idle. Each job's ``lease_seconds`` lease
+    is renewed while it runs. A failed job is retried after
+    ``retry_delay_seconds`` until it has been attempted ``max_attempts``
+    times, after which its card is marked as failed.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        poll_interval_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_delay_seconds: float,
+    ) -> None:
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self._in_flight: set[asyncio.Task[None]] = set()
+
+    async def run(self) -> None:
+        """Process jobs until cancelled. Jobs interrupted by cancellation are
+        picked up again once their lease expires."""
+        try:
+            while True:
+                claimed = await self.run_once()
+                if claimed:
+                    continue
+                if self._in_flight:
+                    # Wake up early if a slot frees up
+                    await asyncio.wait(
+                        self._in_flight,
+                        timeout=self.poll_interval_seconds,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                else:
+                    await asyncio.sleep(self.poll_interval_seconds)
+        finally:
+            for task in self._in_flight:
+                task.cancel()
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def run_once(self) -> int:
+        """Claim jobs for the free slots and start them. Returns how many
+        were claimed."""
+        free = self.concurrency - len(self._in_flight)
+        if free <= 0:
+            return 0
+
+        try:
+            jobs = await with_session(_claim_jobs, free, self.lease_seconds)
+        except Exception:
+            logger.exception("Failed to claim card match jobs")
+            return 0
+
+        for job in jobs:
+            task = asyncio.create_task(self._process(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        return len(jobs)
+
+    async def drain(self) -> None:
+        """Wait for the jobs in flight to finish."""
+        await asyncio.gather(*self._in_flight)
+
+    async def _process(self, job: CardMatchJob) -> None:
+        heartbeat = asyncio.create_task(self._hold_lease(job))
+        try:
+            await self._match(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _hold_lease(self, job: CardMatchJob) -> None:
+        """Renew the job's lease until cancelled, so a slow download or agent
+        run is not claimed and matched again by another worker."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await with_session(_renew_lease, job, self.lease_seconds)
+            except Exception:
+                logger.exception("Failed to renew the lease on card %s", job.card_id)
+                continue
+            if not held:
+                # Finishing the job will fail as well; the worker that claimed
+                # it again records the result instead
+                logger.warning("Lost the lease on card %s", job.card_id)
+                return
+
+    async def _match(self, job: CardMatchJob) -> None:
+        image = None
+        try:
+            image = await _download_card(job.image_path)
+            matched = await match_card_image(
+                image,
+                ref_card_index=await shared_ref_card_index(),
+                embedding_index=await shared_embedding_index(),
+            )
+        except Exception:
+            logger.exception(
+                "Failed to match card %s (attempt %d)", job.card_id, job.attempts
+            )
+            await self._fail(job)
+            return
+        finally:
+            if image is not None:
+                image.discard()
+
+        update = CardUpdate(
+            ref_card_id=matched.id, matching_status=MatchingStatus.matched
+        )
+        try:
+            held = await with_session(_finish_job, job, update)
+        except Exception:
+            # The lease expires and the job is retried
+            logger.exception("Failed to record match for card %s", job.card_id)
+            return
+        if not held:
+            logger.warning(
+                "Discarding match for card %s: its job was claimed again",
+                job.card_id,
+            )
+
+    async def _fail(self, job: CardMatchJob) -> None:
+        try:
+            if job.attempts >= self.max_attempts:
+                held = await with_session(
+                    _finish_job, job, CardUpdate(matching_status=MatchingStatus.failed)
+                )
+            else:
+                held = await with_session(_retry_job, job, self.retry_delay_seconds)
+        except Exception:
+            logger.exception("Failed to reschedule card %s", job.card_id)
+            return
+        if not held:
+            logger.warning(
+                "Not rescheduling card %s: its job was claimed again", job.card_id
+            )
+
+
+__all__ = ["MatchWorkerPool"]
@@ -0,0 +1,83 @@
+"""Publishes the messages written to the ``outboxmessage`` table.
+
+With the outbox, a card and the message announcing it are committed together,
+so a message is never lost when publishing fails after the card was saved,
+nor sent for a card whose transaction rolled back. Messages are deleted only
+after Pub/Sub has acknowledged them, so delivery is at least once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.application.services import OutboxService
+from cards.infrastructure.repositories import OutboxMessageRepository
+from core.db import with_session
+from core.pubsub import Publisher
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Publishes pending outbox messages, up to ``batch_size`` per pass.
+
+    The relay runs a pass whenever ``notify`` is called and at least every
+    ``poll_interval_seconds``, which also picks up messages written by other
+    processes or left behind by a failed pass.
+    """
+
+    def __init__(
+        self, publisher: Publisher, batch_size: int, poll_interval_seconds: float
+    ) -> None:
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """Run a pass soon, e.g. right after a message was written."""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Relay messages until cancelled."""
+        while True:
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay_once()
+            except Exception:
+                logger.exception("Failed to relay outbox messages")
+                relayed = 0
+            if relayed == self.batch_size:
+                # There may be more waiting
+                continue
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.poll_interval_seconds
+                )
+            except TimeoutError:
+                pass
+
+    async def relay_once(self) -> int:
+        """Publish one batch of pending messages. Returns how many were
+        published."""
+        return await with_session(self._relay)
+
+    async def _relay(self, session: AsyncSession) -> int:
+        outbox = OutboxService(OutboxMessageRepository(session))
+        messages = await outbox.lock_pending(self.batch_size)
+        if not messages:
+            return 0
+
+        # Published concurrently so the client sends them in as few batches
+        # as its batch settings allow
+        await asyncio.gather(
+            *(self.publisher.publish(m.topic, m.data) for m in messages)
+        )
+        await outbox.mark_published([m.id for m in messages if m.id is not None])
+        return len(messages)
+
+
+__all__ = ["OutboxRelay"]
@@ -1,9 +1,27 @@
 from .card import CardRepository
+from .card_match_job import CardMatchJobRepository
+from .image_fingerprint import ImageFingerprintRepository
+from .outbox_message import OutboxMessageRepository
 from .ref_card import RefCardRepository
+from .ref_card_embedding import RefCardEmbeddingRepository
+from .ref_card_embedding_index import (
+    RefCardEmbeddingIndex,
+    get_ref_card_embedding_index,
+)
+from .ref_card_index import IndexedRefCardRepository, RefCardIndex, get_ref_card_index
 from .tcg_set import TcgSetRepository
 
 __all__ = [
+    "CardMatchJobRepository",
     "CardRepository",
+    "ImageFingerprintRepository",
+    "IndexedRefCardRepository",
+    "OutboxMessageRepository",
+    "RefCardEmbeddingIndex",
+    "RefCardEmbeddingRepository",
+    "RefCardIndex",
     "RefCardRepository",
     "TcgSetRepository",
+    "get_ref_card_embedding_index",
+    "get_ref_card_index",
 ]
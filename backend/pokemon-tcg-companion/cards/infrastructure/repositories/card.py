@@ -1,16 +1,37 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import Collection, Sequence
 from typing import Optional, cast
 from uuid import UUID
 
-from sqlalchemy import delete, desc, update
+from sqlalchemy import (
+    CursorResult,
+    column,
+    delete,
+    desc,
+    insert,
+    inspect,
+    literal,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy import cast as sql_cast
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import QueryableAttribute
 from sqlalchemy.sql import ColumnElement
 from sqlmodel import select
 
-from cards.domain.models import Card, CardAdd, CardRead, CardUpdate
+from cards.domain.models import (
+    Card,
+    CardAdd,
+    CardCursor,
+    CardRead,
+    CardUpdate,
+    MatchingStatus,
+    OutboxMessage,
+)
 from cards.domain.repositories import AbstractCardRepository
 
 
@@ -24,6 +45,54 @@ class CardRepository(AbstractCardRepository):
         await self.session.commit()
         return CardRead.model_validate(new_card)
 
+    async def add_with_event(self, card: CardAdd, topic: str) -> CardRead:
+        """Add the card and, in the same transaction, an outbox message that
+        announces it on ``topic``; the outbox relay publishes it later."""
+        new_card = Card(**card.model_dump())
+        card_read = CardRead.model_validate(new_card)
+        self.session.add(new_card)
+        self.session.add(
+            OutboxMessage(topic=topic, data=card_read.model_dump_json().encode())
+        )
+        await self.session.commit()
+        return card_read
+
+    async def add_many(self, cards: Sequence[CardAdd]) -> Sequence[CardRead]:
+        """Add the cards with a single multi-row ``INSERT``."""
+        card_reads = await self._insert_many(cards)
+        await self.session.commit()
+        return card_reads
+
+    async def add_many_with_events(
+        self, cards: Sequence[CardAdd], topic: str
+    ) -> Sequence[CardRead]:
+        """Like ``add_many``, also writing one outbox message per card in the
+        same transaction."""
+        card_reads = await self._insert_many(cards)
+        if card_reads:
+            await self.session.execute(
+                insert(OutboxMessage).values(
+                    [
+                        {"topic": topic, "data": card.model_dump_json().encode()}
+                        for card in card_reads
+                    ]
+                )
+            )
+        await self.session.commit()
+        return card_reads
+
+    async def _insert_many(self, cards: Sequence[CardAdd]) -> list[CardRead]:
+        # Ids and defaults are generated client-side, so nothing needs to be
+        # read back from the database
+        card_reads = [
+            CardRead.model_validate(Card(**card.model_dump())) for card in cards
+        ]
+        if card_reads:
+            await self.session.execute(
+                insert(Card).values([card.model_dump() for card in card_reads])
+            )
+        return card_reads
+
     async def get(self, id: UUID) -> Optional[CardRead]:
         card = await self.session.get(Card, id)
         return CardRead.model_validate(card) if card else None
@@ -35,6 +104,50 @@ class CardRepository(AbstractCardRepository):
         cards = (await self.session.execute(stmt)).scalars().all()
         return [CardRead.model_validate(card) for card in cards]
 
+    async def list_for_user(
+        self, user_id: str, limit: int, after: Optional[CardCursor] = None
+    ) -> Sequence[CardRead]:
+        # Walks ix_card_user_id_matching_status_id backwards: pending cards
+        # first, then matched, then failed, each by descending id.
+        matching_status = cast(QueryableAttribute, Card.matching_status)
+        id = cast(QueryableAttribute, Card.id)
+        stmt = (
+            select(Card)
+            .where(cast(ColumnElement[bool], Card.user_id == user_id))
+            .order_by(desc(matching_status), desc(id))
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(matching_status, id)
+                < tuple_(literal(after.matching_status.value), literal(after.id))
+            )
+        cards = (await self.session.execute(stmt)).scalars().all()
+        return [CardRead.model_validate(card) for card in cards]
+
+    async def list_by_status(
+        self,
+        statuses: Collection[MatchingStatus],
+        limit: int,
+        after: Optional[UUID] = None,
+    ) -> Sequence[CardRead]:
+        """Cards in any of ``statuses`` across all users, keyset-paginated by id."""
+        id = cast(QueryableAttribute, Card.id)
+        stmt = (
+            select(Card)
+            .where(
+                cast(QueryableAttribute, Card.matching_status).in_(
+                    [status.value for status in statuses]
+                )
+            )
+            .order_by(id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(id > after)
+        cards = (await self.session.execute(stmt)).scalars().all()
+        return [CardRead.model_validate(card) for card in cards]
+
     async def update(self, id: UUID, card: CardUpdate) -> CardRead:
         values = card.model_dump(exclude_unset=True)
         stmt = (
@@ -48,6 +161,44 @@ class CardRepository(AbstractCardRepository):
         await self.session.commit()
         return CardRead.model_validate(updated_card)
 
+    async def update_many(self, updates: Sequence[tuple[UUID, CardUpdate]]) -> int:
+        """Apply the updates with one ``UPDATE ... FROM (VALUES ...)`` per set
+        of updated columns (usually one) and a single commit. Returns the
+        number of cards updated.
+        """
+        # Updates that set the same columns share a VALUES list
+        groups: dict[tuple[str, ...], list[tuple]] = defaultdict(list)
+        for id, card in updates:
+            data = card.model_dump(exclude_unset=True)
+            if data:
+                groups[tuple(data)].append((id, *data.values()))
+        if not groups:
+            return 0
+
+        card_columns = inspect(Card).columns
+        updated = 0
+        for columns, rows in groups.items():
+            rows_values = values(
+                *(column(col, card_columns[col].type) for col in ("id", *columns)),
+                name="card_update",
+            ).data(rows)
+            stmt = (
+                update(Card)
+                .where(cast(ColumnElement[bool], Card.id == rows_values.c.id))
+                # Cast back so all-NULL columns are not inferred as text
+                .values(
+                    {
+                        col: sql_cast(rows_values.c[col], card_columns[col].type)
+                        for col in columns
+                    }
+                )
+                .execution_options(synchronize_session="fetch")
+            )
+            result = await self.session.execute(stmt)
+            updated += cast(CursorResult, result).rowcount
+        await self.session.commit()
+        return updated
+
     async def delete(self, id: UUID) -> None:
         stmt = delete(Card).where(cast(ColumnElement[bool], Card.id == id))
         await self.session.execute(stmt)
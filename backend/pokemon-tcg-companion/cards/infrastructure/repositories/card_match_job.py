@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import cast
+
+from sqlalchemy import CursorResult, delete, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql import ColumnElement
+from sqlmodel import select
+
+from cards.domain.models import Card, CardMatchJob, CardMatchJobAdd, CardUpdate
+from cards.domain.repositories import AbstractCardMatchJobRepository
+
+
+class CardMatchJobRepository(AbstractCardMatchJobRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add_many(self, jobs: Sequence[CardMatchJobAdd]) -> None:
+        if not jobs:
+            return
+
+        stmt = (
+            pg_insert(CardMatchJob)
+            .values([job.model_dump() for job in jobs])
+            .on_conflict_do_nothing(index_elements=["card_id"])
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def claim(self, limit: int, lease_seconds: float) -> Sequence[CardMatchJob]:
+        """Lease up to ``limit`` available jobs, oldest first.
+
+        ``SKIP LOCKED`` lets concurrent workers claim disjoint jobs without
+        waiting on each other's row locks.
+        """
+        available_at = cast(QueryableAttribute, CardMatchJob.available_at)
+        id = cast(QueryableAttribute, CardMatchJob.id)
+        claimable = (
+            select(id)
+            .where(available_at <= func.now())
+            .order_by(available_at, id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(CardMatchJob)
+            .where(id.in_(claimable.scalar_subquery()))
+            .values(
+                available_at=func.now() + timedelta(seconds=lease_seconds),
+                attempts=CardMatchJob.attempts + 1,
+            )
+            .returning(CardMatchJob)
+        )
+        result = await self.session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        jobs = result.scalars().all()
+        await self.session.commit()
+        return jobs
+
+    @staticmethod
+    def _is_held(job: CardMatchJob) -> ColumnElement[bool]:
+        # Every claim increments attempts, so a job claimed again since
+        # ``job`` was leased no longer matches it
+        return cast(
+            ColumnElement[bool],
+            (CardMatchJob.id == job.id) & (CardMatchJob.attempts == job.attempts),
+        )
+
+    async def renew(self, job: CardMatchJob, lease_seconds: float) -> bool:
+        """Extend the lease on ``job``. Returns False if it has been claimed
+        again since, or completed."""
+        return await self._reschedule(job, lease_seconds)
+
+    async def complete(self, job: CardMatchJob, card: CardUpdate) -> bool:
+        """Apply ``card`` to the job's card and delete the job in the same
+        transaction, unless the job has been claimed again since. Returns
+        whether it was still held."""
+        id = cast(QueryableAttribute, CardMatchJob.id)
+        result = await self.session.execute(
+            delete(CardMatchJob).where(self._is_held(job)).returning(id)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.session.rollback()
+            return False
+
+        await self.session.execute(
+            update(Card)
+            .where(cast(ColumnElement[bool], Card.id == job.card_id))
+            .values(card.model_dump(exclude_unset=True))
+        )
+        await self.session.commit()
+        return True
+
+    async def postpone(self, job: CardMatchJob, delay_seconds: float) -> bool:
+        """Make ``job`` claimable again after ``delay_seconds``. Returns False
+        if it has been claimed again since, or completed."""
+        return await self._reschedule(job, delay_seconds)
+
+    async def _reschedule(self, job: CardMatchJob, seconds: float) -> bool:
+        result = await self.session.execute(
+            update(CardMatchJob)
+            .where(self._is_held(job))
+            .values(available_at=func.now() + timedelta(seconds=seconds))
+        )
+        await self.session.commit()
+        return cast(CursorResult, result).rowcount > 0
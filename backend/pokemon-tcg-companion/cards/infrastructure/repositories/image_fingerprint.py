@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Optional, cast
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+from sqlmodel import select
+
+from cards.domain.models import ImageFingerprint, ImageFingerprintAdd, RefCard
+from cards.domain.models.image_fingerprint import FINGERPRINT_BITS, FINGERPRINT_CHUNKS
+from cards.domain.repositories import AbstractImageFingerprintRepository
+from core.images import hamming_distance
+
+_CHUNK_BITS = FINGERPRINT_BITS // FINGERPRINT_CHUNKS
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+_HASH_MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def _to_signed(hash: int) -> int:
+    """Map an unsigned 64-bit hash onto the signed range BIGINT can hold."""
+    return hash - (1 << FINGERPRINT_BITS) if hash >> (FINGERPRINT_BITS - 1) else hash
+
+
+def _chunks(hash: int) -> list[int]:
+    return [
+        (hash >> (_CHUNK_BITS * i)) & _CHUNK_MASK for i in range(FINGERPRINT_CHUNKS)
+    ]
+
+
+def _neighbours(chunk: int, radius: int) -> list[int]:
+    """Every chunk value within ``radius`` bit flips of ``chunk``."""
+    return [
+        chunk ^ sum(1 << bit for bit in bits)
+        for flips in range(radius + 1)
+        for bits in combinations(range(_CHUNK_BITS), flips)
+    ]
+
+
+class ImageFingerprintRepository(AbstractImageFingerprintRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add(self, fingerprint: ImageFingerprintAdd) -> None:
+        chunk_0, chunk_1, chunk_2, chunk_3 = _chunks(fingerprint.hash)
+        stmt = (
+            pg_insert(ImageFingerprint)
+            .values(
+                hash=_to_signed(fingerprint.hash),
+                chunk_0=chunk_0,
+                chunk_1=chunk_1,
+                chunk_2=chunk_2,
+                chunk_3=chunk_3,
+                ref_card_id=fingerprint.ref_card_id,
+            )
+            .on_conflict_do_nothing(index_elements=["hash"])
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def find_nearest(self, hash: int, max_distance: int) -> Optional[RefCard]:
+        # Multi-index hashing: if two hashes differ in at most max_distance
+        # bits, at least one of their chunks differs in at most
+        # max_distance // FINGERPRINT_CHUNKS bits. Probing each chunk index
+        # with that neighbourhood finds every candidate, and the exact
+        # distance is then checked on the few rows that come back.
+        radius = max_distance // FINGERPRINT_CHUNKS
+        columns = (
+            ImageFingerprint.chunk_0,
+            ImageFingerprint.chunk_1,
+            ImageFingerprint.chunk_2,
+            ImageFingerprint.chunk_3,
+        )
+        stmt = (
+            select(ImageFingerprint.hash, RefCard)
+            .join(
+                RefCard,
+                cast(ColumnElement[bool], RefCard.id == ImageFingerprint.ref_card_id),
+            )
+            .where(
+                or_(
+                    *(
+                        cast(ColumnElement[int], column).in_(_neighbours(chunk, radius))
+                        for column, chunk in zip(columns, _chunks(hash), strict=True)
+                    )
+                )
+            )
+        )
+        result = await self.session.execute(stmt)
+
+        nearest: Optional[RefCard] = None
+        nearest_distance = max_distance
+        for stored_hash, card in result.all():
+            distance = hamming_distance(hash, stored_hash & _HASH_MASK)
+            if distance <= nearest_distance:
+                nearest, nearest_distance = card, distance
+        return nearest
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Sequence
+from typing import cast
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from sqlmodel import select
+
+from cards.domain.models import OutboxMessage
+from cards.domain.repositories import AbstractOutboxMessageRepository
+
+
+class OutboxMessageRepository(AbstractOutboxMessageRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def lock_pending(self, limit: int) -> Sequence[OutboxMessage]:
+        """Lock up to ``limit`` messages, oldest first, until the session's
+        transaction ends.
+
+        ``SKIP LOCKED`` lets several relays run at once without publishing the
+        same message twice; messages whose transaction rolls back are picked
+        up again by the next relay pass.
+        """
+        stmt = (
+            select(OutboxMessage)
+            .order_by(cast(QueryableAttribute, OutboxMessage.id))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def delete_many(self, ids: Collection[int]) -> None:
+        if ids:
+            await self.session.execute(
+                delete(OutboxMessage).where(
+                    cast(QueryableAttribute, OutboxMessage.id).in_(ids)
+                )
+            )
+        await self.session.commit()
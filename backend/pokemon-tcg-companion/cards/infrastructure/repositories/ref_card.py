@@ -1,18 +1,57 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Collection, Iterable, Sequence
+from contextlib import asynccontextmanager
 from typing import Optional, Self, cast
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, update
+from sqlalchemy import (
+    Float,
+    column,
+    func,
+    literal,
+    or_,
+    table,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import ColumnElement, Select
 from sqlmodel import select
 
 from cards.domain.models import RefCard, RefCardAdd, RefCardUpdate
 from cards.domain.models.tcg_set import TcgSet
-from cards.domain.repositories import AbstractRefCardRepository
+from cards.domain.repositories import (
+    AbstractRefCardRepository,
+    RefCardRepositoryFactory,
+)
+from core.rrf import RRF_K
+
+NAME_SIMILARITY_THRESHOLD = 0.3
+
+# Columns streamed into the staging table by ``bulk_upsert``, in COPY order.
+_BULK_COLUMNS = ("id", "tcg_id", "tcg_local_id", "name", "image_url", "set_id")
+_BULK_STAGING_TABLE = "refcard_staging"
+
+# asyncpg sends bind parameters with a 16-bit count.
+_MAX_BIND_PARAMS = 32767
+
+
+def _upsert_changed(stmt: Insert, columns: Collection[str]) -> Insert:
+    """Update conflicting rows only where a column actually changed, so
+    re-syncing an unchanged catalog does not rewrite (and replicate) them."""
+    return stmt.on_conflict_do_update(
+        index_elements=["tcg_id"],
+        set_={col: stmt.excluded[col] for col in columns},
+        where=or_(
+            *(stmt.table.c[col].is_distinct_from(stmt.excluded[col]) for col in columns)
+        ),
+    )
 
 
 class RefCardQuery:
@@ -32,15 +71,28 @@ class RefCardQuery:
         )
         return self
 
-    def by_name(self, name: str, threshold: float = 0.3, limit: int = 20) -> Self:
+    def by_name(
+        self, name: str, threshold: float = NAME_SIMILARITY_THRESHOLD, limit: int = 20
+    ) -> Self:
         similarity = func.similarity(RefCard.name, name)
         self._stmt = (
             self._stmt.where(cast(ColumnElement[bool], similarity > threshold))
-            .order_by(similarity.desc())
+            .order_by(similarity.desc(), RefCard.tcg_id)
             .limit(limit)
         )
         return self
 
+    def ranked(self, name: str) -> Select:
+        """Project the query onto (id, rank), ranking rows by name similarity
+        and then ``tcg_id``."""
+        similarity = func.similarity(RefCard.name, name)
+        return self._stmt.with_only_columns(
+            cast(ColumnElement[UUID], RefCard.id).label("id"),
+            func.row_number()
+            .over(order_by=[similarity.desc(), RefCard.tcg_id])
+            .label("rank"),
+        )
+
     async def all(self) -> Sequence[RefCard]:
         result = await self._session.execute(self._stmt)
         return result.scalars().all()
@@ -50,6 +102,17 @@ class RefCardRepository(AbstractRefCardRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    @classmethod
+    def factory(cls, session_maker: async_sessionmaker) -> RefCardRepositoryFactory:
+        """Build a factory that opens each repository on a fresh session."""
+
+        @asynccontextmanager
+        async def open_repository() -> AsyncIterator[RefCardRepository]:
+            async with session_maker() as session:
+                yield cls(session)
+
+        return open_repository
+
     def query(self) -> RefCardQuery:
         return RefCardQuery(self.session)
 
@@ -66,6 +129,18 @@ class RefCardRepository(AbstractRefCardRepository):
         q = await self.session.execute(select(RefCard))
         return q.scalars().all()
 
+    async def list_with_years(
+        self, tcg_ids: Optional[Collection[str]] = None
+    ) -> Sequence[tuple[RefCard, Optional[int]]]:
+        """List cards alongside their set's release year."""
+        stmt = select(RefCard, TcgSet.year).join(
+            TcgSet, cast(ColumnElement[bool], RefCard.set_id == TcgSet.id)
+        )
+        if tcg_ids is not None:
+            stmt = stmt.where(cast(QueryableAttribute, RefCard.tcg_id).in_(tcg_ids))
+        result = await self.session.execute(stmt)
+        return [(card, year) for card, year in result.tuples()]
+
     async def update(self, id: UUID, card: RefCardUpdate) -> RefCard:
         values = card.model_dump(exclude_unset=True)
         stmt = (
@@ -79,28 +154,85 @@ class RefCardRepository(AbstractRefCardRepository):
         await self.session.commit()
         return updated_card
 
-    async def upsert_many(self, cards: Sequence[RefCardAdd]) -> None:
-        if not cards:
-            return
+    async def upsert_many(self, cards: Sequence[RefCardAdd]) -> Sequence[UUID]:
+        """Upsert the cards in as few statements as the bind-parameter limit
+        allows and return the ids of the rows that were inserted or changed.
 
-        upserted_tcg_ids = set()
-        data = []
-        for card in cards:
-            data.append(card.model_dump())
-            upserted_tcg_ids.add(card.tcg_id)
+        If the same ``tcg_id`` appears more than once, the last card wins.
+        """
+        data = list({card.tcg_id: card.model_dump() for card in cards}.values())
+        if not data:
+            return []
 
-        stmt = pg_insert(RefCard).values(data)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["tcg_id"],
-            set_={col: stmt.excluded[col] for col in data[0] if col != "tcg_id"},
-        )
-        await self.session.execute(stmt)
+        columns = [col for col in data[0] if col != "tcg_id"]
+        # Each row also binds its generated primary key.
+        chunk_size = _MAX_BIND_PARAMS // (len(data[0]) + 1)
+        ids: list[UUID] = []
+        for start in range(0, len(data), chunk_size):
+            stmt = _upsert_changed(
+                pg_insert(RefCard).values(data[start : start + chunk_size]), columns
+            ).returning(cast(QueryableAttribute, RefCard.id))
+            result = await self.session.execute(stmt)
+            ids.extend(result.scalars())
         await self.session.commit()
 
-        for obj in self.session.identity_map.values():
-            if isinstance(obj, RefCard) and obj.tcg_id in upserted_tcg_ids:
+        self._expire(ids)
+        return ids
+
+    def _expire(self, ids: Iterable[UUID]) -> None:
+        """Expire the already-loaded cards among ``ids`` so they are reloaded."""
+        for id in ids:
+            obj = self.session.identity_map.get(identity_key(RefCard, id))
+            if obj is not None:
                 self.session.expire(obj)
 
+    async def bulk_upsert(self, cards: Sequence[RefCardAdd]) -> int:
+        """Stream the cards into a temporary staging table with COPY and merge
+        them into ``refcard`` with a single ``INSERT ... SELECT ... ON CONFLICT``.
+
+        Unlike ``upsert_many`` the statement size does not grow with the number
+        of cards, so a whole catalog can be loaded in one round of work. If the
+        same ``tcg_id`` appears more than once, the last card wins. Returns the
+        number of rows inserted or changed; identical rows are left untouched.
+        """
+        latest = {card.tcg_id: card for card in cards}
+        if not latest:
+            return 0
+
+        records = [
+            (uuid4(), c.tcg_id, c.tcg_local_id, c.name, c.image_url, c.set_id)
+            for c in latest.values()
+        ]
+
+        connection = await self.session.connection()
+        await connection.execute(
+            text(
+                f"CREATE TEMP TABLE {_BULK_STAGING_TABLE} "
+                "(LIKE refcard INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        )
+        # COPY is not part of the DBAPI, so it goes through asyncpg directly.
+        raw_connection = await connection.get_raw_connection()
+        asyncpg_connection = raw_connection.driver_connection
+        assert asyncpg_connection is not None
+        await asyncpg_connection.copy_records_to_table(
+            _BULK_STAGING_TABLE, records=records, columns=_BULK_COLUMNS
+        )
+
+        staging = table(_BULK_STAGING_TABLE, *(column(c) for c in _BULK_COLUMNS))
+        stmt = _upsert_changed(
+            pg_insert(RefCard).from_select(_BULK_COLUMNS, staging.select()),
+            [col for col in _BULK_COLUMNS if col not in ("id", "tcg_id")],
+        )
+        result = await connection.execute(
+            stmt.returning(cast(QueryableAttribute, RefCard.id))
+        )
+        ids = result.scalars().all()
+        await self.session.commit()
+
+        self._expire(ids)
+        return len(ids)
+
     async def search_by_year_and_local_id(
         self, year: int, local_id: str
     ) -> Sequence[RefCard]:
@@ -115,3 +247,61 @@ class RefCardRepository(AbstractRefCardRepository):
         self, local_id: str, name: str, limit: int = 20
     ) -> Sequence[RefCard]:
         return await self.query().by_local_id(local_id).by_name(name, limit=limit).all()
+
+    async def fused_candidates(
+        self,
+        name: str,
+        year: int,
+        local_id: str,
+        limit: int,
+        weights: Sequence[float],
+    ) -> Sequence[RefCard]:
+        """Rank and fuse the candidate searches in a single statement.
+
+        Each search becomes a CTE of (id, rank), the weighted RRF score is
+        summed per id in Postgres, and only the top ``limit`` cards are loaded.
+        """
+        year_local_weight, year_name_weight, local_name_weight = weights
+        searches = [
+            (self.query().by_local_id(local_id).by_name(name), local_name_weight)
+        ]
+        if year:
+            searches += [
+                (self.query().by_year(year).by_local_id(local_id), year_local_weight),
+                (self.query().by_year(year).by_name(name), year_name_weight),
+            ]
+
+        scores = []
+        for i, (query, weight) in enumerate(searches):
+            ranked = query.ranked(name).cte(f"ranked_{i}")
+            scores.append(
+                select(
+                    ranked.c.id,
+                    ranked.c.rank,
+                    (literal(weight, Float) / (RRF_K + ranked.c.rank)).label("score"),
+                )
+            )
+        all_scores = union_all(*scores).subquery("scores")
+
+        fused = (
+            select(
+                all_scores.c.id,
+                func.sum(all_scores.c.score).label("score"),
+                func.min(all_scores.c.rank).label("best_rank"),
+            )
+            .group_by(all_scores.c.id)
+            .order_by(
+                func.sum(all_scores.c.score).desc(),
+                func.min(all_scores.c.rank),
+                all_scores.c.id,
+            )
+            .limit(limit)
+            .subquery("fused")
+        )
+        stmt = (
+            select(RefCard)
+            .join(fused, cast(ColumnElement[bool], RefCard.id == fused.c.id))
+            .order_by(fused.c.score.desc(), fused.c.best_rank, fused.c.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
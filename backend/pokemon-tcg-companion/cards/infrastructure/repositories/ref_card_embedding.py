@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import cast
+
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql import ColumnElement
+from sqlmodel import select
+
+from cards.domain.models import RefCard, RefCardEmbedding, RefCardEmbeddingAdd
+from cards.domain.repositories import AbstractRefCardEmbeddingRepository
+
+
+class RefCardEmbeddingRepository(AbstractRefCardEmbeddingRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def upsert_many(self, embeddings: Sequence[RefCardEmbeddingAdd]) -> None:
+        if not embeddings:
+            return
+
+        stmt = pg_insert(RefCardEmbedding).values(
+            [embedding.model_dump() for embedding in embeddings]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ref_card_id"],
+            set_={"model": stmt.excluded.model, "vector": stmt.excluded.vector},
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def list_by_model(self, model: str) -> Sequence[RefCardEmbedding]:
+        result = await self.session.execute(
+            select(RefCardEmbedding).where(
+                cast(ColumnElement[bool], RefCardEmbedding.model == model)
+            )
+        )
+        return result.scalars().all()
+
+    async def list_unembedded_cards(self, model: str) -> Sequence[RefCard]:
+        """Reference cards with an image but no embedding from ``model``."""
+        stmt = (
+            select(RefCard)
+            .outerjoin(
+                RefCardEmbedding,
+                and_(
+                    cast(
+                        ColumnElement[bool],
+                        RefCardEmbedding.ref_card_id == RefCard.id,
+                    ),
+                    cast(ColumnElement[bool], RefCardEmbedding.model == model),
+                ),
+            )
+            .where(
+                cast(QueryableAttribute, RefCard.image_url).is_not(None),
+                cast(QueryableAttribute, RefCardEmbedding.ref_card_id).is_(None),
+            )
+            .order_by(RefCard.tcg_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.domain.models import RefCardEmbedding
+from cards.infrastructure.repositories.ref_card_embedding import (
+    RefCardEmbeddingRepository,
+)
+from core.images import EMBEDDING_MODEL
+
+
+class RefCardEmbeddingIndex:
+    """Reference card embeddings stacked into one float32 matrix.
+
+    A search is a single matrix-vector product over the whole catalog, which
+    for a few tens of thousands of cards takes a few milliseconds on CPU.
+    """
+
+    def __init__(self, embeddings: Iterable[RefCardEmbedding] = ()) -> None:
+        embeddings = list(embeddings)
+        self._ids = [embedding.ref_card_id for embedding in embeddings]
+        self._matrix = (
+            np.stack([np.frombuffer(e.vector, dtype=np.float32) for e in embeddings])
+            if embeddings
+            else np.empty((0, 0), dtype=np.float32)
+        )
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    async def load(
+        cls, repo: RefCardEmbeddingRepository, model: str = EMBEDDING_MODEL
+    ) -> RefCardEmbeddingIndex:
+        # Stacking tens of megabytes of vectors is kept off the loop
+        return await asyncio.to_thread(cls, await repo.list_by_model(model))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def search(self, vector: np.ndarray, k: int) -> Sequence[tuple[UUID, float]]:
+        """Return the ``k`` most similar cards and their cosine similarity,
+        best first. ``vector`` must be unit length like the stored ones."""
+        if not self._ids or k <= 0:
+            return []
+
+        scores = self._matrix @ vector.astype(np.float32, copy=False)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+
+_index: RefCardEmbeddingIndex | None = None
+_index_lock = asyncio.Lock()
+
+
+def _is_stale(max_age_seconds: float) -> bool:
+    return _index is None or time.monotonic() - _index.loaded_at > max_age_seconds
+
+
+async def get_ref_card_embedding_index(
+    session: AsyncSession, max_age_seconds: float
+) -> RefCardEmbeddingIndex:
+    """Return the process-wide index, reloading it once it is older than
+    ``max_age_seconds`` to pick up newly embedded cards.
+
+    Loading reads every embedding, so this only pays off in a process that
+    runs many matches; concurrent callers wait for a single load.
+    """
+    global _index
+    if _is_stale(max_age_seconds):
+        async with _index_lock:
+            if _is_stale(max_age_seconds):
+                _index = await RefCardEmbeddingIndex.load(
+                    RefCardEmbeddingRepository(session)
+                )
+
+    assert _index is not None
+    return _index
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Sequence
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cards.domain.models import RefCard, RefCardAdd, RefCardUpdate
+from cards.domain.repositories import AbstractRefCardRepository
+from cards.infrastructure.repositories.ref_card import (
+    NAME_SIMILARITY_THRESHOLD,
+    RefCardRepository,
+)
+from core.trgm import (
+    exceeds_threshold,
+    similarity_from_counts,
+    trigram_similarity,
+    trigrams,
+)
+
+
+class RefCardIndex:
+    """In-memory copy of the reference catalog for candidate search.
+
+    Mirrors the lookups RefCardRepository runs against Postgres: exact
+    (year, tcg_local_id) and tcg_local_id matches, plus a trigram inverted
+    index over names that scores candidates like pg_trgm's similarity().
+    """
+
+    def __init__(self, rows: Iterable[tuple[RefCard, Optional[int]]] = ()) -> None:
+        self._cards: dict[UUID, RefCard] = {}
+        self._years: dict[UUID, Optional[int]] = {}
+        self._trigrams: dict[UUID, frozenset[str]] = {}
+        self._by_year_local: defaultdict[tuple[int, str], set[UUID]] = defaultdict(set)
+        self._by_local: defaultdict[str, set[UUID]] = defaultdict(set)
+        self._by_year: defaultdict[int, set[UUID]] = defaultdict(set)
+        self._postings: defaultdict[str, set[UUID]] = defaultdict(set)
+        self.loaded_at = time.monotonic()
+        self.refresh(rows)
+
+    @classmethod
+    async def load(cls, repo: RefCardRepository) -> RefCardIndex:
+        # Indexing a full catalog takes seconds of CPU; keep it off the loop
+        return await asyncio.to_thread(cls, await repo.list_with_years())
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def refresh(self, rows: Iterable[tuple[RefCard, Optional[int]]]) -> None:
+        """Insert or replace cards in the index."""
+        for card, year in rows:
+            self._remove(card.id)
+            # Keep a detached copy so the index never touches the session the
+            # rows were loaded from.
+            card = RefCard.model_validate(card.model_dump())
+            self._cards[card.id] = card
+            self._years[card.id] = year
+            self._trigrams[card.id] = name_trigrams = trigrams(card.name)
+            self._by_local[card.tcg_local_id].add(card.id)
+            if year is not None:
+                self._by_year_local[(year, card.tcg_local_id)].add(card.id)
+                self._by_year[year].add(card.id)
+            for trigram in name_trigrams:
+                self._postings[trigram].add(card.id)
+
+    def _remove(self, id: UUID) -> None:
+        card = self._cards.pop(id, None)
+        if card is None:
+            return
+
+        year = self._years.pop(id)
+        self._by_local[card.tcg_local_id].discard(id)
+        if year is not None:
+            self._by_year_local[(year, card.tcg_local_id)].discard(id)
+            self._by_year[year].discard(id)
+        for trigram in self._trigrams.pop(id):
+            self._postings[trigram].discard(id)
+
+    def get(self, id: UUID) -> Optional[RefCard]:
+        return self._cards.get(id)
+
+    def _top_by_similarity(
+        self, scores: Iterable[tuple[UUID, float]], limit: int
+    ) -> Sequence[RefCard]:
+        ranked = sorted(
+            (
+                (score, self._cards[id])
+                for id, score in scores
+                if exceeds_threshold(score, NAME_SIMILARITY_THRESHOLD)
+            ),
+            key=lambda item: (-item[0], item[1].tcg_id),
+        )
+        return [card for _, card in ranked[:limit]]
+
+    def search_by_year_and_local_id(
+        self, year: int, local_id: str
+    ) -> Sequence[RefCard]:
+        ids = self._by_year_local.get((year, local_id), set())
+        return sorted((self._cards[id] for id in ids), key=lambda c: c.tcg_id)
+
+    def search_by_year_and_name(
+        self, year: int, name: str, limit: int = 20
+    ) -> Sequence[RefCard]:
+        # Count shared trigrams through the inverted index, so only cards with
+        # at least one trigram in common are ever scored.
+        query = trigrams(name)
+        within = self._by_year.get(year, set())
+        common: Counter[UUID] = Counter()
+        for trigram in query:
+            common.update(self._postings.get(trigram, set()) & within)
+
+        scores = (
+            (id, similarity_from_counts(len(query), len(self._trigrams[id]), count))
+            for id, count in common.items()
+        )
+        return self._top_by_similarity(scores, limit)
+
+    def search_by_local_id_and_name(
+        self, local_id: str, name: str, limit: int = 20
+    ) -> Sequence[RefCard]:
+        query = trigrams(name)
+        scores = (
+            (id, trigram_similarity(query, self._trigrams[id]))
+            for id in self._by_local.get(local_id, set())
+        )
+        return self._top_by_similarity(scores, limit)
+
+
+class IndexedRefCardRepository(RefCardRepository):
+    """RefCardRepository that answers candidate searches from a RefCardIndex.
+
+    Writes still go to the database, and the affected cards are re-read and
+    refreshed in the index so it stays consistent with this process' writes.
+    """
+
+    def __init__(self, session: AsyncSession, index: RefCardIndex) -> None:
+        super().__init__(session)
+        self.index = index
+
+    async def _refresh_index(self, tcg_ids: Sequence[str]) -> None:
+        self.index.refresh(await self.list_with_years(tcg_ids))
+
+    async def add(self, card: RefCardAdd) -> RefCard:
+        new_card = await super().add(card)
+        await self._refresh_index([new_card.tcg_id])
+        return new_card
+
+    async def update(self, id: UUID, card: RefCardUpdate) -> RefCard:
+        updated_card = await super().update(id, card)
+        await self._refresh_index([updated_card.tcg_id])
+        return updated_card
+
+    async def upsert_many(self, cards: Sequence[RefCardAdd]) -> Sequence[UUID]:
+        ids = await super().upsert_many(cards)
+        await self._refresh_index([card.tcg_id for card in cards])
+        return ids
+
+    async def bulk_upsert(self, cards: Sequence[RefCardAdd]) -> int:
+        written = await super().bulk_upsert(cards)
+        await self._refresh_index([card.tcg_id for card in cards])
+        return written
+
+    async def search_by_year_and_local_id(
+        self, year: int, local_id: str
+    ) -> Sequence[RefCard]:
+        return self.index.search_by_year_and_local_id(year, local_id)
+
+    async def search_by_year_and_name(
+        self, year: int, name: str, limit: int = 20
+    ) -> Sequence[RefCard]:
+        return self.index.search_by_year_and_name(year, name, limit)
+
+    async def search_by_local_id_and_name(
+        self, local_id: str, name: str, limit: int = 20
+    ) -> Sequence[RefCard]:
+        return self.index.search_by_local_id_and_name(local_id, name, limit)
+
+    async def fused_candidates(
+        self,
+        name: str,
+        year: int,
+        local_id: str,
+        limit: int,
+        weights: Sequence[float],
+    ) -> Sequence[RefCard]:
+        # The searches are in-memory, so fusing in Python is the fast path.
+        return await AbstractRefCardRepository.fused_candidates(
+            self, name, year, local_id, limit, weights
+        )
+
+
+_index: RefCardIndex | None = None
+_index_lock = asyncio.Lock()
+
+
+def _is_stale(max_age_seconds: float) -> bool:
+    return _index is None or time.monotonic() - _index.loaded_at > max_age_seconds
+
+
+async def get_ref_card_index(
+    session: AsyncSession, max_age_seconds: float
+) -> RefCardIndex:
+    """Return the process-wide index, reloading it once it is older than
+    ``max_age_seconds`` to pick up catalog changes made by other processes.
+
+    Loading reads the whole catalog, so this only pays off in a process that
+    runs many matches; concurrent callers wait for a single load.
+    """
+    global _index
+    if _is_stale(max_age_seconds):
+        async with _index_lock:
+            if _is_stale(max_age_seconds):
+                _index = await RefCardIndex.load(RefCardRepository(session))
+
+    assert _index is not None
+    return _index
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional
+from collections.abc import Collection, Sequence
+from typing import Optional, cast
+from uuid import UUID
 
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
 from sqlmodel import select
 
-from cards.domain.models import TcgSet, TcgSetAdd
+from cards.domain.models import TcgSet, TcgSetAdd, TcgSetSync, TcgSetSyncAdd
 from cards.domain.repositories import AbstractTcgSetRepository
 
 
@@ -35,3 +38,31 @@ class TcgSetRepository(AbstractTcgSetRepository):
             select(TcgSet).where(TcgSet.tcg_id == tcg_id)
         )
         return result.scalar_one_or_none()
+
+    async def list_by_ids(self, ids: Collection[UUID]) -> Sequence[TcgSet]:
+        if not ids:
+            return []
+
+        result = await self.session.execute(
+            select(TcgSet).where(cast(ColumnElement[UUID], TcgSet.id).in_(ids))
+        )
+        return result.scalars().all()
+
+    async def list_sync_states(self) -> Sequence[TcgSetSync]:
+        result = await self.session.execute(select(TcgSetSync))
+        return result.scalars().all()
+
+    async def record_syncs(self, states: Sequence[TcgSetSyncAdd]) -> None:
+        if not states:
+            return
+
+        stmt = pg_insert(TcgSetSync).values([state.model_dump() for state in states])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tcg_id"],
+            set_={
+                "card_count": stmt.excluded.card_count,
+                "content_hash": stmt.excluded.content_hash,
+            },
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -0,0 +1,132 @@
+"""TCGdex catalog client backed by an on-disk HTTP response cache.
+
+Every response is stored as gzipped JSON alongside its ``ETag`` and
+``Last-Modified`` validators. Later runs revalidate with conditional requests,
+so unchanged resources come back as an empty ``304``, and an offline client
+replays the catalog from the cache alone without touching the network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Self
+from urllib.parse import quote
+
+import httpx
+from dacite import from_dict
+from tcgdexsdk import TCGdex
+from tcgdexsdk.models.Set import Set
+from tcgdexsdk.models.SetResume import SetResume
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CacheMiss(LookupError):
+    """Raised by an offline client for a resource that was never cached."""
+
+
+class TcgdexCatalog:
+    def __init__(
+        self,
+        cache_dir: Path,
+        offline: bool = False,
+        language: str = "en",
+        client: Optional[httpx.AsyncClient] = None,
+        retries: int = 3,
+        backoff_seconds: float = 0.5,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.base_url = f"{TCGdex.endpoint}/{language}"
+        self._client = client or httpx.AsyncClient(timeout=30)
+        self._retries = retries
+        self._backoff_seconds = backoff_seconds
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._client.aclose()
+
+    async def list_sets(self) -> list[SetResume]:
+        data = await self._get_json(f"{self.base_url}/sets")
+        return [from_dict(SetResume, item) for item in data or []]
+
+    async def get_set(self, set_id: str) -> Optional[Set]:
+        data = await self._get_json(f"{self.base_url}/sets/{quote(set_id)}")
+        return from_dict(Set, data) if data is not None else None
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json.gz"
+
+    def _read_entry(self, url: str) -> Optional[dict[str, Any]]:
+        try:
+            with gzip.open(self._entry_path(url), "rt") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_entry(self, url: str, entry: dict[str, Any]) -> None:
+        path = self._entry_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    async def _get_json(self, url: str) -> Any:
+        """Fetch ``url`` as JSON, or None if TCGdex has no such resource."""
+        entry = await asyncio.to_thread(self._read_entry, url)
+        if self.offline:
+            if entry is None:
+                raise CacheMiss(url)
+            return entry["body"]
+
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await self._request(url, headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED and entry is not None:
+            return entry["body"]
+        if response.status_code == httpx.codes.NOT_FOUND:
+            return None
+        response.raise_for_status()
+
+        body = response.json()
+        await asyncio.to_thread(
+            self._write_entry,
+            url,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body": body,
+            },
+        )
+        return body
+
+    async def _request(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """GET with exponential backoff on transport errors and on rate-limit
+        or server-error responses."""
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.get(url, headers=headers)
+                if (
+                    response.status_code not in _RETRY_STATUSES
+                    or attempt == self._retries
+                ):
+                    return response
+            except httpx.TransportError:
+                if attempt == self._retries:
+                    raise
+            await asyncio.sleep(self._backoff_seconds * 2**attempt)
+            attempt += 1
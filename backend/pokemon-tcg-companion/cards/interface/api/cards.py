@@ -1,23 +1,34 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import base64
+from collections.abc import Sequence
 from datetime import timedelta
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from google.cloud import pubsub_v1, storage
-from pydantic import BaseModel
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from google.cloud import storage
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cards.application.services import CardService
-from cards.domain.models import Card, CardAdd, CardRead
+from cards.domain.models import Card, CardAdd, CardCursor, CardRead
+from cards.infrastructure.outbox_relay import OutboxRelay
 from cards.infrastructure.repositories import CardRepository
 from core.auth import require_auth
 from core.db import get_db
 from core.gcp import get_publisher, get_storage_client
-from core.settings.app import settings
+from core.pubsub import Publisher
+from core.settings.app import PublishMode, settings
 
 router = APIRouter(
     prefix="/cards",
@@ -27,6 +38,9 @@ router = APIRouter(
 
 db_session = Depends(get_db)
 
+# Most cards a bulk upload can sign URLs for or create in one request
+MAX_BATCH_SIZE = 500
+
 
 class CreateCardSignedUploadUrl(BaseModel):
     filename: str
@@ -38,18 +52,59 @@ class UploadUrlResponse(BaseModel):
     image_path: str
 
 
+class CreateCardSignedUploadUrls(BaseModel):
+    files: Annotated[
+        List[CreateCardSignedUploadUrl], Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    ]
+
+
 class CreateCardPayload(BaseModel):
     image_path: str
 
 
+class CreateCardsPayload(BaseModel):
+    image_paths: Annotated[List[str], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+
+
 CARD_CREATED_TOPIC = "card-created"
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-@router.post("/upload-url", response_model=UploadUrlResponse)
-async def create_upload_url(
-    payload: CreateCardSignedUploadUrl,
-    storage_client: Annotated[storage.Client, Depends(get_storage_client)],
-):
+
+def get_outbox_relay(request: Request) -> Optional[OutboxRelay]:
+    return getattr(request.app.state, "outbox_relay", None)
+
+
+def _encode_cursor(card: CardRead) -> str:
+    cursor = CardCursor(matching_status=card.matching_status, id=card.id)
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> CardCursor:
+    try:
+        return CardCursor.model_validate_json(base64.urlsafe_b64decode(cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="invalid cursor") from e
+
+
+async def _publish_card_created(
+    publisher: Publisher, cards: Sequence[CardRead]
+) -> None:
+    # Published concurrently so the client sends them in as few batches as
+    # its batch settings allow
+    await asyncio.gather(
+        *(
+            publisher.publish(CARD_CREATED_TOPIC, card.model_dump_json().encode())
+            for card in cards
+        )
+    )
+
+
+def _sign_upload_url(
+    storage_client: storage.Client, payload: CreateCardSignedUploadUrl
+) -> UploadUrlResponse:
     object_name = f"cards/{uuid4()}"
     bucket = storage_client.bucket(settings.gcp_bucket)
     blob = bucket.blob(object_name)
@@ -62,18 +117,62 @@ async def create_upload_url(
     return UploadUrlResponse(upload_url=signed_url, image_path=object_name)
 
 
+@router.post("/upload-url", response_model=UploadUrlResponse)
+async def create_upload_url(
+    payload: CreateCardSignedUploadUrl,
+    storage_client: Annotated[storage.Client, Depends(get_storage_client)],
+):
+    return _sign_upload_url(storage_client, payload)
+
+
+@router.post("/upload-urls", response_model=List[UploadUrlResponse])
+async def create_upload_urls(
+    payload: CreateCardSignedUploadUrls,
+    storage_client: Annotated[storage.Client, Depends(get_storage_client)],
+):
+    """Sign an upload URL for each file, in the order given.
+
+    Signing is CPU-bound (or a call to the IAM API without a service account
+    key), so the URLs are signed in the thread pool off the event loop.
+    """
+    return await asyncio.gather(
+        *(
+            asyncio.to_thread(_sign_upload_url, storage_client, file)
+            for file in payload.files
+        )
+    )
+
+
 @router.get("", response_model=List[CardRead])
-async def list_cards(session: AsyncSession = db_session):
+async def list_cards(
+    response: Response,
+    auth_payload: Annotated[dict, Depends(require_auth)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    session: AsyncSession = db_session,
+):
+    """List the caller's cards a page at a time.
+
+    When more cards remain, the cursor for the next page is returned in the
+    X-Next-Cursor header.
+    """
     repo = CardRepository(session)
     svc = CardService(repo)
-    return await svc.list_cards()
+    after = _decode_cursor(cursor) if cursor else None
+    # Fetch one extra card to learn whether there is a next page
+    cards = await svc.list_user_cards(auth_payload["sub"], limit + 1, after)
+    if len(cards) > limit:
+        cards = cards[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(cards[-1])
+    return cards
 
 
 @router.post("", response_model=Card, status_code=status.HTTP_201_CREATED)
 async def add_card(
     payload: CreateCardPayload,
     auth_payload: Annotated[dict, Depends(require_auth)],
-    publisher: Annotated[pubsub_v1.PublisherClient, Depends(get_publisher)],
+    publisher: Annotated[Publisher, Depends(get_publisher)],
+    outbox_relay: Annotated[Optional[OutboxRelay], Depends(get_outbox_relay)],
     session: AsyncSession = db_session,
 ):
     user_id = auth_payload["sub"]
@@ -84,16 +183,46 @@ async def add_card(
     repo = CardRepository(session)
     svc = CardService(repo)
 
-    card = await svc.add_card(card_add)
-
-    topic_payload = json.dumps(card.model_dump(mode="json")).encode("utf-8")
-    topic_path = publisher.topic_path(settings.gcp_pubsub_project, CARD_CREATED_TOPIC)
-    future = await asyncio.to_thread(publisher.publish, topic_path, topic_payload)
-    await asyncio.to_thread(future.result)
+    if settings.card_created_publish_mode == PublishMode.outbox:
+        card = await svc.add_card_with_event(card_add, CARD_CREATED_TOPIC)
+        if outbox_relay is not None:
+            outbox_relay.notify()
+    else:
+        card = await svc.add_card(card_add)
+        await _publish_card_created(publisher, [card])
 
     return card
 
 
+@router.post("/batch", response_model=List[Card], status_code=status.HTTP_201_CREATED)
+async def add_cards(
+    payload: CreateCardsPayload,
+    auth_payload: Annotated[dict, Depends(require_auth)],
+    publisher: Annotated[Publisher, Depends(get_publisher)],
+    outbox_relay: Annotated[Optional[OutboxRelay], Depends(get_outbox_relay)],
+    session: AsyncSession = db_session,
+):
+    """Add a card for each uploaded image in one insert and announce them
+    together, in the order given."""
+    user_id = auth_payload["sub"]
+    card_adds = [
+        CardAdd(image_path=image_path, user_id=user_id)
+        for image_path in payload.image_paths
+    ]
+    repo = CardRepository(session)
+    svc = CardService(repo)
+
+    if settings.card_created_publish_mode == PublishMode.outbox:
+        cards = await svc.add_cards_with_events(card_adds, CARD_CREATED_TOPIC)
+        if outbox_relay is not None:
+            outbox_relay.notify()
+    else:
+        cards = await svc.add_cards(card_adds)
+        await _publish_card_created(publisher, cards)
+
+    return cards
+
+
 @router.get("/{card_id}", response_model=CardRead)
 async def get_card(card_id: UUID, session: AsyncSession = db_session):
     repo = CardRepository(session)
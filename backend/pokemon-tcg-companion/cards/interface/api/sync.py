@@ -1,20 +1,93 @@
+import time
+from dataclasses import dataclass
+from typing import Annotated
+
 import httpx
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from starlette.background import BackgroundTask
 
+from cards.domain.models import CardRead, RefCardRead, TcgSetRead
 from core.auth import require_auth
+from core.cache import ExpiringLRUCache, cache_lifetime
 from core.settings.app import settings
 
 router = APIRouter(dependencies=[Depends(require_auth)])
 SYNC_PROXY_TIMEOUT = 20.0
 
+# Shape protocol params the browser client may set; the table, columns and
+# where clause are always decided here
+CLIENT_PARAMS = (
+    "cursor",
+    "expired_handle",
+    "handle",
+    "live",
+    "live_sse",
+    "offset",
+    "replica",
+)
 
-def _get_electric_connection_url(request: Request, table_name: str):
-    base_url = settings.electric_service_url
+RESPONSE_HEADERS = (
+    "electric-offset",
+    "electric-handle",
+    "electric-schema",
+    "electric-cursor",
+    "electric-up-to-date",
+    "cache-control",
+    "etag",
+    "last-modified",
+)
+
+
+@dataclass(frozen=True)
+class _Shape:
+    columns: tuple[str, ...]
+    # Only the caller's own rows are synced; otherwise the shape is the same
+    # for every user and its responses can be shared between them
+    user_scoped: bool = False
+
+
+SHAPES = {
+    "card": _Shape(columns=tuple(CardRead.model_fields), user_scoped=True),
+    "refcard": _Shape(columns=tuple(RefCardRead.model_fields)),
+    "tcgset": _Shape(columns=tuple(TcgSetRead.model_fields)),
+}
+
+
+@dataclass(frozen=True)
+class _CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+    media_type: str | None
+    fetched_at: float
 
-    params = dict(request.query_params)
+
+# Non-live responses of the shared shapes, keyed by their shape params
+# (table, handle, offset, ...), for as long as Electric's Cache-Control allows
+_shape_responses: ExpiringLRUCache[str, _CachedResponse] = ExpiringLRUCache(
+    max_size=settings.sync_shape_cache_size
+)
+
+
+def _shape_params(request: Request, table_name: str, user_id: str) -> dict[str, str]:
+    shape = SHAPES.get(table_name)
+    if shape is None:
+        raise HTTPException(status_code=404, detail="shape not found")
+
+    params = {k: v for k, v in request.query_params.items() if k in CLIENT_PARAMS}
     params["table"] = table_name
+    params["columns"] = ",".join(shape.columns)
+    if shape.user_scoped:
+        # Passed as a positional param so Electric quotes the user id
+        params["where"] = "user_id = $1"
+        params["params[1]"] = user_id
+    return params
+
+
+def _get_electric_connection_url(params: dict[str, str]):
+    base_url = settings.electric_service_url
+
+    params = dict(params)
     params["source_id"] = settings.electric_source_id
     params["secret"] = settings.electric_source_secret.get_secret_value()
 
@@ -27,45 +100,108 @@ def _get_headers(request: Request) -> dict:
     return {k: v for k, v in request.headers.items() if k.lower() in allowed_headers}
 
 
-@router.api_route(
-    "/sync/{table_name}",
-    methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
-    include_in_schema=False,
-)
-async def sync_proxy(request: Request, table_name: str):
-    url = _get_electric_connection_url(request, table_name)
-    headers = _get_headers(request)
-    client = request.app.state.sync_http_client
+def _response_headers(response: httpx.Response) -> dict[str, str]:
+    return {h: response.headers[h] for h in RESPONSE_HEADERS if h in response.headers}
+
+
+def _is_cacheable(params: dict[str, str]) -> bool:
+    return not SHAPES[params["table"]].user_scoped and params.get("live") != "true"
+
+
+def _etag_matches(request: Request, etag: str | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if etag is None or if_none_match is None:
+        return False
+    return etag in (tag.strip() for tag in if_none_match.split(","))
 
+
+async def _stream_shape(
+    request: Request, client: httpx.AsyncClient, params: dict[str, str]
+):
     response = await client.send(
         client.build_request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=request.stream(),
+            method="GET",
+            url=_get_electric_connection_url(params),
+            headers=_get_headers(request),
         ),
         stream=True,
     )
 
-    response_headers = {
-        h: response.headers[h]
-        for h in [
-            "electric-offset",
-            "electric-handle",
-            "electric-schema",
-            "electric-cursor",
-            "electric-up-to-date",
-            "cache-control",
-            "etag",
-            "last-modified",
-        ]
-        if h in response.headers
-    }
-
     return StreamingResponse(
         response.aiter_bytes(),
         status_code=response.status_code,
-        headers=response_headers,
+        headers=_response_headers(response),
         background=BackgroundTask(response.aclose),
         media_type=response.headers.get("content-type"),
     )
+
+
+async def _fetch_cached_shape(
+    request: Request, client: httpx.AsyncClient, params: dict[str, str]
+):
+    key = str(httpx.QueryParams(sorted(params.items())))
+    cached = _shape_responses.get(key)
+
+    if cached is None:
+        # Fetched unconditionally so the body is there to cache; the caller's
+        # If-None-Match is answered below
+        headers = {k: v for k, v in _get_headers(request).items() if k == "accept"}
+        response = await client.get(
+            _get_electric_connection_url(params), headers=headers
+        )
+        response_headers = _response_headers(response)
+        if response.status_code != 200:
+            return Response(
+                content=response.content,
+                status_code=response.status_code,
+                headers=response_headers,
+                media_type=response.headers.get("content-type"),
+            )
+
+        cached = _CachedResponse(
+            body=response.content,
+            headers=response_headers,
+            media_type=response.headers.get("content-type"),
+            # Counted from when Electric (or a cache in front of it) made it
+            fetched_at=time.time() - int(response.headers.get("age", "0")),
+        )
+        if len(cached.body) <= settings.sync_shape_cache_max_entry_bytes:
+            _shape_responses.set(
+                key,
+                cached,
+                expires_at=time.time() + cache_lifetime(response.headers, shared=True),
+            )
+
+    headers = dict(cached.headers)
+    age = int(time.time() - cached.fetched_at)
+    if age > 0:
+        headers["age"] = str(age)
+
+    if _etag_matches(request, cached.headers.get("etag")):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=cached.body,
+        headers=headers,
+        media_type=cached.media_type,
+    )
+
+
+@router.get("/sync/{table_name}", include_in_schema=False)
+async def sync_proxy(
+    request: Request,
+    table_name: str,
+    auth_payload: Annotated[dict, Depends(require_auth)],
+):
+    """Proxy a shape request to Electric.
+
+    Only the tables in SHAPES can be synced, with their read columns; the card
+    shape is filtered to the caller's cards. Catalog shapes are the same for
+    every user, so their initial snapshot chunks are served from an in-process
+    cache shared between clients.
+    """
+    params = _shape_params(request, table_name, auth_payload["sub"])
+    client = request.app.state.sync_http_client
+
+    if _is_cacheable(params):
+        return await _fetch_cached_shape(request, client, params)
+    return await _stream_shape(request, client, params)
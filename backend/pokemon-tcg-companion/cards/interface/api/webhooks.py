@@ -2,27 +2,49 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from cards.domain.models import CardRead
-from cards.infrastructure.flows.match_card import FLOW_NAME
-from core import flows
+from cards.infrastructure.match_dispatch import (
+    dispatch_match,
+    dispatch_match_batch,
+    enqueue_matches,
+)
 from core.auth import verify_pubsub_token
+from core.batching import Coalescer
+from core.db import get_db
 from core.pubsub_model import PubSubEnvelope
+from core.settings.app import CardMatchBackend, settings
 
 router = APIRouter(prefix="/cards/webhooks", tags=["webhooks"])
 
+db_session = Depends(get_db)
+
+
+# Coalesces card-created messages received within a short window into a single
+# batch flow run. Each push request is answered only after its batch has been
+# dispatched, so Pub/Sub redelivers messages whose dispatch failed.
+card_match_batcher = Coalescer(
+    dispatch_match_batch,
+    max_size=settings.card_match_batch_max_size,
+    max_wait_seconds=settings.card_match_batch_max_wait_seconds,
+)
+
 
 @router.post("/card-created", dependencies=[Depends(verify_pubsub_token)])
-async def handle_card_created(envelope: PubSubEnvelope):
+async def handle_card_created(
+    envelope: PubSubEnvelope, session: AsyncSession = db_session
+):
     try:
         payload = envelope.get_payload(CardRead)
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors()) from e
 
-    await flows.arun_deployment(
-        name=flows.get_deployment_name(FLOW_NAME),
-        parameters={"card_id": str(payload.id), "image_path": payload.image_path},
-        timeout=0,
-    )
+    if settings.card_match_backend == CardMatchBackend.queue:
+        await enqueue_matches(session, [payload])
+    elif settings.card_match_batch_enabled:
+        await card_match_batcher.submit(payload)
+    else:
+        await dispatch_match(payload)
 
     return {"status": "success", "card_id": payload.id}
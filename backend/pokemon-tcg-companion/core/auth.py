@@ -1,31 +1,157 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Optional
 
 from clerk_backend_api import Clerk
 from clerk_backend_api.security.types import AuthenticateRequestOptions
 from fastapi import Header, HTTPException, Request
+from google.auth import transport
 from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token
 
+from core.cache import ExpiringLRUCache, cache_lifetime
 from core.settings.app import settings
 
 logger = logging.getLogger(__name__)
 
 clerk = Clerk(bearer_auth=settings.clerk_secret_key.get_secret_value())
 
+# Claims of recently verified session tokens, keyed by the token's hash and
+# kept until the token expires, so repeated requests (e.g. every sync poll)
+# skip signature verification
+_verified_sessions: ExpiringLRUCache[str, dict] = ExpiringLRUCache(
+    max_size=settings.auth_token_cache_size
+)
 
-async def require_auth(request: Request) -> dict:
-    state = await clerk.authenticate_request_async(
-        request,
-        AuthenticateRequestOptions(
-            authorized_parties=[settings.clerk_authorized_party]
-        ),
+
+def _auth_options() -> AuthenticateRequestOptions:
+    # With the instance's JWT public key, tokens are verified without
+    # fetching Clerk's JWKS
+    jwt_key = settings.clerk_jwt_key
+    return AuthenticateRequestOptions(
+        authorized_parties=[settings.clerk_authorized_party],
+        jwt_key=jwt_key.get_secret_value() if jwt_key is not None else None,
     )
-    if not state.is_signed_in or state.payload is None:
-        raise HTTPException(status_code=401, detail=state.message)
 
-    return state.payload
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _session_token(request: Request) -> Optional[str]:
+    """The session token as Clerk reads it: the bearer token, else the
+    ``__session`` cookie."""
+    authorization = request.headers.get("Authorization")
+    if authorization is not None:
+        return authorization.replace("Bearer ", "")
+    for name, value in request.cookies.items():
+        if name.startswith("__session"):
+            return value
+    return None
+
+
+async def require_auth(request: Request) -> dict:
+    """Authenticate the request's Clerk session, at most once per request and
+    once per token until it expires."""
+    payload: Optional[dict] = getattr(request.state, "auth_payload", None)
+    if payload is not None:
+        return payload
+
+    token = _session_token(request)
+    if token is not None:
+        payload = _verified_sessions.get(_token_hash(token))
+
+    if payload is None:
+        state = await clerk.authenticate_request_async(request, _auth_options())
+        if not state.is_signed_in or state.payload is None:
+            raise HTTPException(status_code=401, detail=state.message)
+
+        payload = state.payload
+        # Cache under the token Clerk actually verified
+        if state.token is not None and "exp" in payload:
+            _verified_sessions.set(
+                _token_hash(state.token),
+                payload,
+                expires_at=min(
+                    payload["exp"], time.time() + settings.auth_token_cache_ttl_seconds
+                ),
+            )
+
+    request.state.auth_payload = payload
+    return payload
+
+
+class CachingRequest(transport.Request):
+    """A google-auth transport that reuses GET responses for as long as their
+    Cache-Control allows.
+
+    ``id_token.verify_oauth2_token`` fetches Google's public certificates on
+    every call; served through this transport they are fetched only when the
+    cached copy expires, over one long-lived session. Concurrent misses wait
+    for a single fetch.
+    """
+
+    def __init__(self, request: transport.Request) -> None:
+        self._request = request
+        self._responses: dict[str, tuple[transport.Response, float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        url: str,
+        method: str = "GET",
+        body: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> transport.Response:
+        if method != "GET" or body is not None:
+            return self._request(
+                url,
+                method=method,
+                body=body,
+                headers=headers,
+                timeout=timeout,
+                **kwargs,
+            )
+
+        with self._lock:
+            cached = self._responses.get(url)
+            if cached is not None and time.monotonic() < cached[1]:
+                return cached[0]
+
+            response = self._request(url, headers=headers, timeout=timeout, **kwargs)
+            lifetime = cache_lifetime(response.headers)
+            if response.status == 200 and lifetime > 0:
+                self._responses[url] = (response, time.monotonic() + lifetime)
+            else:
+                self._responses.pop(url, None)
+            return response
+
+
+_google_request = CachingRequest(google_requests.Request())
+
+# Claims of Pub/Sub push tokens whose signature was already checked, until
+# they expire. Pub/Sub reuses a token across many pushes.
+_verified_pubsub_tokens: ExpiringLRUCache[str, Mapping[str, Any]] = ExpiringLRUCache(
+    max_size=settings.pubsub_token_cache_size
+)
+
+
+def _verify_pubsub_claims(token: str) -> Mapping[str, Any]:
+    key = _token_hash(token)
+    claim = _verified_pubsub_tokens.get(key)
+    if claim is None:
+        claim = id_token.verify_oauth2_token(
+            token, _google_request, audience=settings.pubsub_audience
+        )
+        _verified_pubsub_tokens.set(key, claim, expires_at=claim["exp"])
+    return claim
 
 
 def verify_pubsub_token(authorization: str = Header(default="")) -> None:
@@ -35,9 +161,7 @@ def verify_pubsub_token(authorization: str = Header(default="")) -> None:
 
     try:
         token = authorization.removeprefix("Bearer ")
-        claim = id_token.verify_oauth2_token(
-            token, google_requests.Request(), audience=settings.pubsub_audience
-        )
+        claim = _verify_pubsub_claims(token)
     except Exception:
         logger.warning("Pub/Sub token verification failed", exc_info=True)
         raise HTTPException(status_code=401, detail="Unauthorized") from None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _PendingBatch(Generic[T]):
+    done: asyncio.Future[None]
+    timer: asyncio.TimerHandle | None = None
+    items: list[T] = field(default_factory=list)
+
+
+class Coalescer(Generic[T]):
+    """Groups items submitted concurrently into batches.
+
+    A batch is flushed once it holds ``max_size`` items or ``max_wait_seconds``
+    after its first item arrived. ``submit`` returns only after the batch its
+    item belongs to has been flushed, and raises if the flush failed, so
+    callers can still acknowledge work only once it has been handed off.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[None]],
+        max_size: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self._flush = flush
+        self._max_size = max_size
+        self._max_wait_seconds = max_wait_seconds
+        self._pending: _PendingBatch[T] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T) -> None:
+        loop = asyncio.get_running_loop()
+        if self._pending is None:
+            self._pending = _PendingBatch(done=loop.create_future())
+            self._pending.timer = loop.call_later(
+                self._max_wait_seconds, self._flush_pending
+            )
+
+        pending = self._pending
+        pending.items.append(item)
+        if len(pending.items) >= self._max_size:
+            self._flush_pending()
+
+        await asyncio.shield(pending.done)
+
+    def _flush_pending(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+
+        if pending.timer is not None:
+            pending.timer.cancel()
+        task = asyncio.create_task(self._run_flush(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_flush(self, pending: _PendingBatch[T]) -> None:
+        # Every submitter may have been cancelled by the time the flush fails;
+        # retrieve the error so asyncio does not report it as never retrieved
+        pending.done.add_done_callback(_retrieve_exception)
+        try:
+            await self._flush(pending.items)
+        except Exception as e:
+            pending.done.set_exception(e)
+        else:
+            pending.done.set_result(None)
+
+
+def _retrieve_exception(future: asyncio.Future[None]) -> None:
+    if not future.cancelled():
+        future.exception()
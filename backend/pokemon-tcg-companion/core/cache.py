@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Generic, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def _cache_directives(value: str) -> dict[str, str]:
+    directives = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def cache_lifetime(headers: Mapping[str, str], shared: bool = False) -> int:
+    """Seconds a response may still be reused, from Cache-Control and Age.
+
+    A ``shared`` cache, which serves one response to many users, reads
+    ``s-maxage`` before ``max-age`` and never reuses ``private`` responses.
+    """
+    directives = _cache_directives(headers.get("Cache-Control", ""))
+    if "no-store" in directives or (shared and "private" in directives):
+        return 0
+
+    max_age = directives.get("max-age")
+    if shared and "s-maxage" in directives:
+        max_age = directives["s-maxage"]
+    if max_age is None or not max_age.isdigit():
+        return 0
+    return int(max_age) - int(headers.get("Age", "0"))
+
+
+class ExpiringLRUCache(Generic[K, V]):
+    """An in-process cache holding at most ``max_size`` entries.
+
+    Each entry expires at its own wall-clock deadline (e.g. a token's ``exp``
+    claim); once full, the least recently used entry is evicted. Safe to share
+    between threads, e.g. sync dependencies run in FastAPI's thread pool.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,23 +1,49 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator, Awaitable, Callable, TypeVar
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional, TypeVar
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+from uuid import uuid4
 
+from sqlalchemy import Engine, Select, make_url
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
 
-from core.settings.db import settings
+from core.settings.db import DatabaseSettings, EngineProfile, settings
 
 _engine: AsyncEngine | None = None
+_replica_engine: AsyncEngine | None = None
 _session_maker: async_sessionmaker | None = None
+_profile: EngineProfile = settings.db_profile
 
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class _PoolProfile:
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+
+
+_PROFILES = {
+    # Many short requests: a larger pool with room to burst, failing fast
+    # rather than queueing
+    EngineProfile.api: _PoolProfile(pool_size=10, max_overflow=20, pool_timeout=10),
+    # Flow runs hold a few sessions at a time, mostly waiting on the model
+    EngineProfile.worker: _PoolProfile(pool_size=5, max_overflow=5, pool_timeout=30),
+    # Bulk loaders run long statements and should wait for a connection
+    EngineProfile.script: _PoolProfile(pool_size=5, max_overflow=5, pool_timeout=120),
+}
+
+
 def normalize_async_url(url: str) -> str:
     """Normalize a database URL to use asyncpg.
 
@@ -40,19 +66,130 @@ def normalize_async_url(url: str) -> str:
     return url
 
 
+def engine_options(
+    db_settings: DatabaseSettings, profile: EngineProfile
+) -> dict[str, Any]:
+    """Keyword arguments for create_async_engine, from the profile's defaults
+    with any explicitly configured db_* settings taking precedence."""
+    defaults = _PROFILES[profile]
+
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": db_settings.db_statement_cache_size
+    }
+    if not db_settings.db_statement_cache_size:
+        # Poolers may hand each statement to a different server connection,
+        # so prepared statement names must never be reused
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    if db_settings.db_statement_timeout_ms:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(db_settings.db_statement_timeout_ms)
+        }
+
+    def _pick(value: Any, default: Any) -> Any:
+        return value if value is not None else default
+
+    return {
+        "pool_size": _pick(db_settings.db_pool_size, defaults.pool_size),
+        "max_overflow": _pick(db_settings.db_max_overflow, defaults.max_overflow),
+        "pool_timeout": _pick(
+            db_settings.db_pool_timeout_seconds, defaults.pool_timeout
+        ),
+        "pool_recycle": db_settings.db_pool_recycle_seconds,
+        "pool_pre_ping": db_settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def use_profile(profile: EngineProfile) -> None:
+    """Select the engine profile for this process.
+
+    Must be called before the engine is first used, typically at the top of a
+    script's entry point.
+    """
+    global _profile
+    if _engine is not None:
+        raise RuntimeError("The database engine has already been created")
+    _profile = profile
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    url = make_url(normalize_async_url(database_url)).update_query_dict(
+        {
+            "prepared_statement_cache_size": str(
+                settings.db_prepared_statement_cache_size
+            )
+        }
+    )
+    return create_async_engine(
+        url, future=True, echo=False, **engine_options(settings, _profile)
+    )
+
+
 def get_engine() -> AsyncEngine:
     global _engine
     if _engine is None:
-        url = normalize_async_url(settings.database_url.get_secret_value())
-        _engine = create_async_engine(url, future=True, echo=False)
+        _engine = _create_engine(settings.database_url.get_secret_value())
 
     return _engine
 
 
+def get_replica_engine() -> AsyncEngine | None:
+    """Engine for the read replica, or None if no replica is configured."""
+    global _replica_engine
+    if _replica_engine is None and settings.database_replica_url is not None:
+        _replica_engine = _create_engine(
+            settings.database_replica_url.get_secret_value()
+        )
+
+    return _replica_engine
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to a read replica.
+
+    Flushes, DML and anything else go to the primary. Once a session has
+    written, its later reads go to the primary too, so it always reads its own
+    writes despite replication lag.
+    """
+
+    def __init__(self, *args: Any, replica: Engine, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.wrote = False
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        clause: Optional[ClauseElement] = None,
+        **kw: Any,
+    ) -> Engine | Connection:
+        is_read = (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+        )
+        if is_read and not self.wrote:
+            return self.replica
+
+        if not is_read:
+            self.wrote = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
 def get_session_maker() -> async_sessionmaker:
     global _session_maker
     if _session_maker is None:
-        _session_maker = async_sessionmaker(get_engine(), expire_on_commit=False)
+        replica = get_replica_engine()
+        if replica is None:
+            _session_maker = async_sessionmaker(get_engine(), expire_on_commit=False)
+        else:
+            _session_maker = async_sessionmaker(
+                get_engine(),
+                expire_on_commit=False,
+                sync_session_class=RoutingSession,
+                replica=replica.sync_engine,
+            )
 
     return _session_maker
 
@@ -1,10 +1,13 @@
 import functools
 import inspect
+import logging
 from collections.abc import Callable
 from typing import Any
 
 import logfire
+from prefect import get_run_logger
 from prefect.deployments import arun_deployment, run_deployment
+from prefect.exceptions import MissingContextError
 
 from core.logfire import setup_logfire
 from core.settings.prefect import settings
@@ -14,6 +17,15 @@ def get_deployment_name(flow_name: str) -> str:
     return f"{flow_name}/{settings.prefect_deployment}"
 
 
+def get_logger(name: str) -> logging.Logger | logging.LoggerAdapter:
+    """The Prefect run logger inside a flow or task run, else the ``name``
+    logger, for code that also runs outside Prefect (e.g. the match workers)."""
+    try:
+        return get_run_logger()
+    except MissingContextError:
+        return logging.getLogger(name)
+
+
 def with_logfire(
     *,
     pydantic_ai: bool = False,
@@ -37,4 +49,10 @@ def with_logfire(
     return decorator
 
 
-__all__ = ["arun_deployment", "get_deployment_name", "run_deployment", "with_logfire"]
+__all__ = [
+    "arun_deployment",
+    "get_deployment_name",
+    "get_logger",
+    "run_deployment",
+    "with_logfire",
+]
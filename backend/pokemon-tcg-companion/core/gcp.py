@@ -1,10 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
 from fastapi import Request
-from google.cloud import pubsub_v1, storage
+from google.cloud import storage
+
+from core.pubsub import Publisher
+
+C = TypeVar("C")
 
 
 def get_storage_client(request: Request) -> storage.Client:
     return request.app.state.storage_client
 
 
-def get_publisher(request: Request) -> pubsub_v1.PublisherClient:
+def get_publisher(request: Request) -> Publisher:
     return request.app.state.publisher
+
+
+class CachedClient(Generic[C]):
+    """Lazily builds a client and shares it across callers in this process.
+
+    The client is rebuilt once it is older than ``ttl_seconds`` so rotated
+    credentials are picked up, or on the next ``get`` after ``invalidate``
+    (e.g. when a request fails authentication).
+    """
+
+    def __init__(self, factory: Callable[[], Awaitable[C]], ttl_seconds: float) -> None:
+        self._factory = factory
+        self._ttl_seconds = ttl_seconds
+        self._client: C | None = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._client is not None
+            and time.monotonic() - self._built_at < self._ttl_seconds
+        )
+
+    async def get(self) -> C:
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    self._client = await self._factory()
+                    self._built_at = time.monotonic()
+
+        assert self._client is not None
+        return self._client
+
+    def invalidate(self) -> None:
+        self._client = None
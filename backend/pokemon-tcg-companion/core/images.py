@@ -0,0 +1,120 @@
+"""Helpers for processing uploaded card photos."""
+
+from __future__ import annotations
+
+from typing import IO, Optional
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Identifies the embed_image descriptor; bump it whenever the descriptor
+# changes so stale reference embeddings are recomputed rather than compared.
+EMBEDDING_MODEL = "thumb-hsv-v1"
+
+# Close to a card's 63:88 aspect ratio
+_EMBEDDING_GRID = (16, 22)
+_HUE_BINS, _SATURATION_BINS, _VALUE_BINS = 8, 4, 4
+
+
+def downscale_image(path: str, max_dimension: int, quality: int) -> Optional[str]:
+    """Shrink the image at ``path`` in place so neither side exceeds
+    ``max_dimension``, re-encoding it as JPEG.
+
+    Returns the new media type, or None if the image was left untouched
+    because it is already small enough or could not be decoded (including
+    truncated files and decompression bombs).
+    """
+    try:
+        with Image.open(path) as image:
+            if max(image.size) <= max_dimension:
+                return None
+
+            # Lets the JPEG decoder skip straight to a reduced scale
+            image.draft("RGB", (max_dimension, max_dimension))
+            resized = ImageOps.exif_transpose(image).convert("RGB")
+    except (OSError, Image.DecompressionBombError):
+        # Also covers truncated uploads; the original is sent as is
+        return None
+
+    resized.thumbnail((max_dimension, max_dimension))
+    resized.save(path, format="JPEG", quality=quality, optimize=True)
+    return "image/jpeg"
+
+
+def dhash(path: str, hash_size: int = 8) -> Optional[int]:
+    """Compute the difference hash of the image at ``path``.
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale thumbnail
+    and each bit records whether a pixel is brighter than its right neighbour,
+    giving a ``hash_size ** 2``-bit fingerprint that survives rescaling and
+    recompression. Returns None if the image could not be decoded, e.g. a
+    truncated upload.
+    """
+    try:
+        with Image.open(path) as image:
+            image.draft("L", (hash_size * 8, hash_size * 8))
+            small = (
+                ImageOps.exif_transpose(image)
+                .convert("L")
+                .resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+            )
+    except (OSError, Image.DecompressionBombError):
+        return None
+
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def embed_image(source: str | IO[bytes]) -> Optional[np.ndarray]:
+    """Compute a unit-length float32 embedding of an image for cosine search.
+
+    The descriptor is cheap enough to run on CPU in a few milliseconds: a
+    mean-centred grayscale thumbnail captures the card's layout and artwork,
+    and a square-rooted HSV histogram captures its colours. Both halves are
+    normalised and weighted equally. Returns None if the image could not be
+    decoded, e.g. a truncated upload.
+    """
+    try:
+        with Image.open(source) as image:
+            image.draft("RGB", (128, 128))
+            thumb = (
+                ImageOps.exif_transpose(image)
+                .convert("RGB")
+                .resize((64, 88), Image.Resampling.BILINEAR)
+            )
+    except (OSError, Image.DecompressionBombError):
+        return None
+
+    layout = np.asarray(
+        thumb.convert("L").resize(_EMBEDDING_GRID, Image.Resampling.BOX),
+        dtype=np.float32,
+    ).ravel()
+    layout -= layout.mean()
+
+    hsv = np.asarray(thumb.convert("HSV"), dtype=np.int64).reshape(-1, 3)
+    bins = (
+        (hsv[:, 0] * _HUE_BINS // 256) * _SATURATION_BINS * _VALUE_BINS
+        + (hsv[:, 1] * _SATURATION_BINS // 256) * _VALUE_BINS
+        + hsv[:, 2] * _VALUE_BINS // 256
+    )
+    colours = np.sqrt(
+        np.bincount(bins, minlength=_HUE_BINS * _SATURATION_BINS * _VALUE_BINS)
+    ).astype(np.float32)
+
+    vector = np.concatenate([_normalise(layout), _normalise(colours)])
+    return _normalise(vector)
+
+
+def _normalise(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from google.auth.credentials import Credentials
+from google.cloud import pubsub_v1
+
+
+class Publisher:
+    """Publishes to topics of one project from the event loop.
+
+    ``PublisherClient.publish`` only appends the message to a batch, which the
+    client sends from its own thread once it is full or ``max_latency`` has
+    passed. The returned future is awaited through ``asyncio.wrap_future``, so
+    waiting for the server's ack does not tie up a thread-pool worker.
+    """
+
+    def __init__(self, client: pubsub_v1.PublisherClient, project: str) -> None:
+        self._client = client
+        self._project = project
+
+    @classmethod
+    def create(
+        cls,
+        project: str,
+        max_messages: int,
+        max_bytes: int,
+        max_latency_seconds: float,
+        credentials: Optional[Credentials] = None,
+    ) -> Publisher:
+        batch_settings = pubsub_v1.types.BatchSettings(
+            max_messages=max_messages,
+            max_bytes=max_bytes,
+            max_latency=max_latency_seconds,
+        )
+        client = pubsub_v1.PublisherClient(
+            batch_settings=batch_settings, credentials=credentials
+        )
+        return cls(client, project)
+
+    async def publish(self, topic: str, data: bytes) -> str:
+        """Publish ``data`` and return its message id once Pub/Sub has it."""
+        topic_path = self._client.topic_path(self._project, topic)
+        return await asyncio.wrap_future(self._client.publish(topic_path, data))
+
+    async def close(self) -> None:
+        """Send the batches still pending and stop the client."""
+        await asyncio.to_thread(self._client.stop)
+
+
+__all__ = ["Publisher"]
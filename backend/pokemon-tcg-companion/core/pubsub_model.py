@@ -13,6 +13,15 @@ from pydantic import BaseModel, Field
 T = TypeVar("T", bound=BaseModel)
 
 
+def parse_message_data(data: bytes, model: type[T]) -> T:
+    """Validate a message's raw (already base64-decoded) data as ``model``.
+
+    Push envelopes carry the data base64-encoded; streaming pull delivers the
+    bytes as-is. Both end up here so they accept exactly the same payloads.
+    """
+    return model.model_validate(json.loads(data.decode("utf-8")))
+
+
 class PubSubMessage(BaseModel):
     """Pub/Sub message structure."""
 
@@ -21,9 +30,7 @@ class PubSubMessage(BaseModel):
     publish_time: str = Field(alias="publishTime")
 
     def decode_data(self, model: type[T]) -> T:
-        decoded = base64.b64decode(self.data).decode("utf-8")
-        payload_dict = json.loads(decoded)
-        return model.model_validate(payload_dict)
+        return parse_message_data(base64.b64decode(self.data), model)
 
 
 class PubSubEnvelope(BaseModel, Generic[T]):
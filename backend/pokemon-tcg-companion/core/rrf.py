@@ -1,7 +1,7 @@
 from typing import Protocol, Sequence, TypeVar
 from uuid import UUID
 
-_RRF_K = 60
+RRF_K = 60
 
 
 class HasId(Protocol):
@@ -16,16 +16,23 @@ def reciprocal_rank_fusion(
     limit: int,
     weights: list[float] | None = None,
 ) -> list[T]:
+    """Fuse ranked lists by summing ``weight / (RRF_K + rank)`` per item.
+
+    Equal scores are ordered by the item's best rank in any list and then by
+    id, the same order the SQL fusion in ``RefCardRepository`` uses.
+    """
     if weights is None:
         weights = [1.0] * len(ranked_lists)
 
     scores: dict[UUID, float] = {}
+    best_ranks: dict[UUID, int] = {}
     items: dict[UUID, T] = {}
 
     for weight, ranked_list in zip(weights, ranked_lists, strict=True):
         for rank, item in enumerate(ranked_list, start=1):
-            scores[item.id] = scores.get(item.id, 0.0) + weight / (_RRF_K + rank)
+            scores[item.id] = scores.get(item.id, 0.0) + weight / (RRF_K + rank)
+            best_ranks[item.id] = min(best_ranks.get(item.id, rank), rank)
             items[item.id] = item
 
-    sorted_ids = sorted(scores, key=lambda id: scores[id], reverse=True)
+    sorted_ids = sorted(scores, key=lambda id: (-scores[id], best_ranks[id], id))
     return [items[id] for id in sorted_ids[:limit]]
@@ -4,6 +4,7 @@ from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
+    concurrent_candidate_search: bool = False
     default_agent_model: str = "google-gla:gemini-2.5-flash-lite"
 
 
@@ -1,23 +1,65 @@
 from __future__ import annotations
 
+import enum
 from typing import Optional
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
 
+class CardMatchBackend(str, enum.Enum):
+    """Where uploaded cards are matched.
+
+    ``prefect`` dispatches a Prefect deployment run per card (or batch);
+    ``queue`` enqueues a job for the in-process match workers.
+    """
+
+    prefect = "prefect"
+    queue = "queue"
+
+
+class PublishMode(str, enum.Enum):
+    """How the API publishes card-created messages.
+
+    ``direct`` publishes while handling the request; ``outbox`` writes the
+    message alongside the card and leaves publishing to the outbox relay.
+    """
+
+    direct = "direct"
+    outbox = "outbox"
+
+
 class AppSettings(BaseSettings):
     allowed_origins: str = "http://localhost:3000"
+    auth_token_cache_size: int = 10_000
+    auth_token_cache_ttl_seconds: float = 300.0
+    card_created_max_bytes: int = 10 * 1024 * 1024
+    card_created_max_messages: int = 100
+    card_created_publish_mode: PublishMode = PublishMode.direct
+    card_created_subscription: str = "card-created-sub"
+    card_match_backend: CardMatchBackend = CardMatchBackend.prefect
+    card_match_batch_enabled: bool = False
+    card_match_batch_max_size: int = 50
+    card_match_batch_max_wait_seconds: float = 2.0
     clerk_secret_key: SecretStr
     clerk_authorized_party: str = "http://localhost:3000"
+    clerk_jwt_key: Optional[SecretStr] = None
     database_url: SecretStr
     electric_source_id: str = "my-source-id"
     electric_source_secret: SecretStr = SecretStr("my-source-secret")
     electric_service_url: str = "http://localhost:3001/v1/shape"
     gcp_bucket: str
     gcp_pubsub_project: str = "local-project"
+    outbox_relay_batch_size: int = 100
+    outbox_relay_poll_interval_seconds: float = 1.0
     pubsub_audience: Optional[str] = None
+    pubsub_batch_max_bytes: int = 1024 * 1024
+    pubsub_batch_max_latency_seconds: float = 0.01
+    pubsub_batch_max_messages: int = 100
     pubsub_service_account_email: Optional[SecretStr] = None
+    pubsub_token_cache_size: int = 1_000
+    sync_shape_cache_max_entry_bytes: int = 16 * 1024 * 1024
+    sync_shape_cache_size: int = 256
     google_application_credentials_json: Optional[SecretStr] = None
     log_level: str = "DEBUG"
 
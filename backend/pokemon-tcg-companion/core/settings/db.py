@@ -1,11 +1,37 @@
 from __future__ import annotations
 
+import enum
+from typing import Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
 
+class EngineProfile(str, enum.Enum):
+    """Which kind of process the engine serves; selects pool defaults."""
+
+    api = "api"
+    worker = "worker"
+    script = "script"
+
+
 class DatabaseSettings(BaseSettings):
+    database_replica_url: Optional[SecretStr] = None
     database_url: SecretStr
+    db_max_overflow: Optional[int] = None
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    db_pool_size: Optional[int] = None
+    db_pool_timeout_seconds: Optional[float] = None
+    # Set both caches to 0 when connecting through a transaction-mode pooler
+    # such as PgBouncer or Neon's pooled endpoint
+    db_prepared_statement_cache_size: int = 100
+    db_profile: EngineProfile = EngineProfile.api
+    db_statement_cache_size: int = 100
+    # Sent as a startup parameter, which PgBouncer-style poolers reject and
+    # which would not follow a transaction-mode pooler's server connections;
+    # leave unset behind a pooler and set statement_timeout on its role instead
+    db_statement_timeout_ms: Optional[int] = None
 
 
 settings = DatabaseSettings()  # type: ignore[call-arg] Pydantic fills the values in runtime
@@ -1,16 +1,48 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
 
 class PrefectSettings(BaseSettings):
+    card_image_jpeg_quality: int = 85
+    card_image_max_dimension: Optional[int] = None
     database_url: SecretStr
     default_flow_retries: int = 3
     default_flow_retry_delay_seconds: int = 10
     gcp_bucket: str
+    gcp_client_ttl_seconds: int = 3600
+    image_fingerprint_enabled: bool = False
+    image_fingerprint_max_distance: int = 4
+    match_batch_download_concurrency: int = 16
+    match_batch_agent_concurrency: int = 4
+    match_worker_concurrency: int = 4
+    match_worker_lease_seconds: int = 300
+    match_worker_max_attempts: int = 3
+    match_worker_poll_interval_seconds: float = 0.5
+    match_worker_retry_delay_seconds: int = 30
     prefect_deployment: str = "default"
+    # The in-memory candidate index costs seconds to build, so it is only used
+    # where the load is shared by many matches: the match workers and batch
+    # flows of at least ref_card_index_min_batch_size cards. Single-card flow
+    # runs each start in a fresh process and always query Postgres.
+    ref_card_index_enabled: bool = False
+    ref_card_index_max_age_seconds: int = 3600
+    ref_card_index_min_batch_size: int = 50
     log_level: str = "DEBUG"
+    rematch_agent_concurrency: int = 2
+    rematch_batch_delay_seconds: float = 5.0
+    rematch_batch_size: int = 50
+    # Like the candidate index, the embedding index is only loaded by the match
+    # workers and batch flows of at least visual_match_min_batch_size cards;
+    # single-card flow runs skip the visual match stage. Its nearest
+    # neighbours are only offered to the agent as candidates.
+    visual_match_candidates: int = 5
+    visual_match_enabled: bool = False
+    visual_match_index_max_age_seconds: int = 3600
+    visual_match_min_batch_size: int = 50
 
 
 settings = PrefectSettings()  # type: ignore[call-arg] Pydantic fills the values in runtime
@@ -0,0 +1,47 @@
+"""Python port of pg_trgm's trigram extraction and similarity()."""
+
+import re
+import struct
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _float4(value: float) -> float:
+    """Round to single precision, the type pg_trgm computes similarity in."""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the set of trigrams pg_trgm's show_trgm() extracts from text.
+
+    Words are lowercased runs of alphanumeric characters, padded with two
+    spaces in front and one behind before being split into trigrams.
+    """
+    result: set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(result)
+
+
+def similarity_from_counts(len_a: int, len_b: int, common: int) -> float:
+    """Similarity of two trigram sets given their sizes and shared trigrams."""
+    if not len_a or not len_b:
+        return 0.0
+
+    return _float4(common / (len_a + len_b - common))
+
+
+def trigram_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    return similarity_from_counts(len(a), len(b), len(a & b))
+
+
+def similarity(a: str, b: str) -> float:
+    """Equivalent of pg_trgm's similarity(a, b)."""
+    return trigram_similarity(trigrams(a), trigrams(b))
+
+
+def exceeds_threshold(score: float, threshold: float) -> bool:
+    """Evaluate ``similarity(...) > threshold`` the way Postgres does, comparing
+    the real-typed score against the threshold cast to real."""
+    return score > _float4(threshold)
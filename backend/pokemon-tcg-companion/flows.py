@@ -1,5 +1,7 @@
-from cards.infrastructure.flows import match_card
+from cards.infrastructure.flows import match_card, match_cards_batch, rematch_cards
 
 FLOWS = {
     match_card.FLOW_NAME: match_card.match_card_flow,
+    match_cards_batch.FLOW_NAME: match_cards_batch.match_cards_batch_flow,
+    rematch_cards.FLOW_NAME: rematch_cards.rematch_cards_flow,
 }
@@ -1,12 +1,16 @@
+import asyncio
+import contextlib
 import json
 from contextlib import asynccontextmanager
 
 import httpx
 from fastapi import FastAPI
-from google.cloud import pubsub_v1, storage
+from google.cloud import storage
 from google.oauth2 import service_account
 
-from core.settings.app import settings
+from cards.infrastructure.outbox_relay import OutboxRelay
+from core.pubsub import Publisher
+from core.settings.app import PublishMode, settings
 
 
 def _get_gcp_credentials() -> service_account.Credentials | None:
@@ -30,7 +34,22 @@ def _get_gcp_credentials() -> service_account.Credentials | None:
 async def lifespan(app: FastAPI):
     credentials = _get_gcp_credentials()
     app.state.storage_client = storage.Client(credentials=credentials)
-    app.state.publisher = pubsub_v1.PublisherClient(credentials=credentials)
+    app.state.publisher = Publisher.create(
+        settings.gcp_pubsub_project,
+        max_messages=settings.pubsub_batch_max_messages,
+        max_bytes=settings.pubsub_batch_max_bytes,
+        max_latency_seconds=settings.pubsub_batch_max_latency_seconds,
+        credentials=credentials,
+    )
+    app.state.outbox_relay = None
+    relay_task = None
+    if settings.card_created_publish_mode == PublishMode.outbox:
+        app.state.outbox_relay = OutboxRelay(
+            app.state.publisher,
+            batch_size=settings.outbox_relay_batch_size,
+            poll_interval_seconds=settings.outbox_relay_poll_interval_seconds,
+        )
+        relay_task = asyncio.create_task(app.state.outbox_relay.run())
     # Use a long-lived client with no read timeout for streaming sync
     app.state.sync_http_client = httpx.AsyncClient(
         timeout=httpx.Timeout(timeout=20.0, read=None)
@@ -38,4 +57,9 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
+        if relay_task is not None:
+            relay_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await relay_task
+        await app.state.publisher.close()
         await app.state.sync_http_client.aclose()
@@ -25,6 +25,7 @@ app.add_middleware(
         "electric-schema",
         "electric-cursor",
         "electric-up-to-date",
+        "X-Next-Cursor",
     ],
 )
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark per-download overhead of building vs. reusing the GCS client.
+
+Usage:
+    python scripts/benchmark_storage_client.py [--iterations N]
+        [--downloads-per-run K] image_path
+
+Downloads image_path from the configured bucket N times in each of three
+modes and reports client acquisition and total per-download latencies:
+
+- uncached: a new client for every download (the old match_card_flow
+  behaviour)
+- per-run: a new, cold cached client for every K downloads. ``serve`` runs
+  each flow run in its own subprocess, so this is what a served
+  match_card_flow pays: with K=1 the cache saves nothing, and it only helps
+  downloads retried within the run
+- warm: one long-lived cached client, as in match_cards_batch_flow and the
+  queue-fed match workers, which download many cards in one process
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from google.cloud import storage
+
+from cards.infrastructure.flows.match_card import _build_storage_client
+from core.gcp import CachedClient
+from core.settings.prefect import settings
+
+
+async def _measure(
+    get_client: Callable[[], Awaitable[storage.Client]],
+    image_path: str,
+    iterations: int,
+    downloads_per_client: int | None = None,
+) -> tuple[list[float], list[float]]:
+    """Time ``iterations`` downloads, replacing ``get_client`` with a new cold
+    cache every ``downloads_per_client`` downloads if given."""
+    acquire_ms, total_ms = [], []
+    for i in range(iterations):
+        if downloads_per_client and i % downloads_per_client == 0:
+            get_client = CachedClient(_build_storage_client, ttl_seconds=3600).get
+
+        start = time.perf_counter()
+        client = await get_client()
+        acquired = time.perf_counter()
+        blob = client.bucket(settings.gcp_bucket).blob(image_path)
+        await asyncio.to_thread(blob.download_as_bytes)
+        end = time.perf_counter()
+
+        acquire_ms.append((acquired - start) * 1000)
+        total_ms.append((end - start) * 1000)
+
+    return acquire_ms, total_ms
+
+
+def _report(label: str, acquire_ms: list[float], total_ms: list[float]) -> None:
+    print(
+        f"{label:>8}: client {statistics.median(acquire_ms):8.2f} ms (p50)  "
+        f"download {statistics.median(total_ms):8.2f} ms (p50)  "
+        f"{statistics.mean(total_ms):8.2f} ms (mean)"
+    )
+
+
+async def main(image_path: str, iterations: int, downloads_per_run: int) -> None:
+    print(f"Downloading '{image_path}' {iterations} times per mode...")
+
+    uncached = await _measure(_build_storage_client, image_path, iterations)
+    _report("uncached", *uncached)
+
+    per_run = await _measure(
+        _build_storage_client, image_path, iterations, downloads_per_run
+    )
+    _report("per-run", *per_run)
+
+    cached_client = CachedClient(_build_storage_client, ttl_seconds=3600)
+    await cached_client.get()  # Warm up, as a long-lived worker would be
+    warm = await _measure(cached_client.get, image_path, iterations)
+    _report("warm", *warm)
+
+    baseline = statistics.mean(uncached[1])
+    print("\nPer-download overhead saved (mean):")
+    print(
+        f"  served flow runs, {downloads_per_run} download(s) per run: "
+        f"{baseline - statistics.mean(per_run[1]):.2f} ms"
+    )
+    print(
+        f"  batch flows and match workers: {baseline - statistics.mean(warm[1]):.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark GCS client reuse for card image downloads."
+    )
+    parser.add_argument("image_path", help="Object path in the configured bucket")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--downloads-per-run",
+        type=int,
+        default=1,
+        help="Downloads per simulated flow run, e.g. 2 for one retry",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.image_path, args.iterations, args.downloads_per_run))
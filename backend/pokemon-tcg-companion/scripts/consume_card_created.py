@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Consume card-created messages with a streaming pull subscription.
+
+An alternative to the /cards/webhooks/card-created push endpoint: messages
+are pulled over a single stream with flow control and dispatched to the
+configured match backend (CARD_MATCH_BACKEND) in batches. The subscription
+must be a pull subscription, e.g. one created by create_topic_sub.py without
+--endpoint. Set PUBSUB_EMULATOR_HOST=localhost:8085 to consume from the
+bundled emulator.
+
+Usage:
+    python scripts/consume_card_created.py [--sub card-created-sub]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from google.cloud import pubsub_v1
+
+from cards.infrastructure.card_created_subscriber import CardCreatedSubscriber
+from core.db import use_profile
+from core.logfire import setup_logfire
+from core.settings.app import settings
+from core.settings.db import EngineProfile
+
+
+async def main(subscription: str) -> None:
+    setup_logfire()
+    subscription_path = pubsub_v1.SubscriberClient.subscription_path(
+        settings.gcp_pubsub_project, subscription
+    )
+    subscriber = CardCreatedSubscriber(
+        subscription_path,
+        max_messages=settings.card_created_max_messages,
+        max_bytes=settings.card_created_max_bytes,
+        batch_max_size=settings.card_match_batch_max_size,
+        batch_max_wait_seconds=settings.card_match_batch_max_wait_seconds,
+    )
+    await subscriber.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Consume card-created messages with streaming pull"
+    )
+    parser.add_argument(
+        "--sub",
+        default=settings.card_created_subscription,
+        help="Pull subscription name (default: CARD_CREATED_SUBSCRIPTION)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level)
+    # A long-running background consumer, not an API process: with the queue
+    # backend it writes jobs through the database
+    use_profile(EngineProfile.worker)
+    asyncio.run(main(args.sub))
@@ -1,18 +1,21 @@
 #!/usr/bin/env python3
 """
-Create Pub/Sub topic and push subscription.
+Create Pub/Sub topic and push or pull subscription.
 
 Project ID is read from settings (core.settings).
-Backend URL can be passed as argument or read from settings.
+Backend URL can be passed as argument or read from settings. Without
+--endpoint a pull subscription is created instead, for streaming-pull
+consumers such as consume_card_created.py.
 
 Usage:
     python scripts/create_topic_sub.py \\
         --topic topic \\
         --sub topic-sub \\
-        --push-endpoint http://host.docker.internal:8000/my-endpoint
+        --endpoint http://host.docker.internal:8000/my-endpoint
 """
 
 import argparse
+from typing import Any, Optional
 
 from google.cloud import pubsub_v1
 
@@ -22,15 +25,16 @@ from core.settings.app import settings
 def create_topic_and_subscription(
     topic_name: str,
     subscription_name: str,
-    push_endpoint: str,
+    push_endpoint: Optional[str],
 ):
     """
-    Create a Pub/Sub topic and push subscription.
+    Create a Pub/Sub topic and a push subscription, or a pull subscription
+    if no push endpoint is given.
 
     Args:
         topic_name: Name of the topic to create
         subscription_name: Name of the subscription to create
-        push_endpoint: Full URL of the webhook endpoint
+        push_endpoint: Full URL of the webhook endpoint, or None for pull
     """
     project_id = settings.gcp_pubsub_project
     publisher = pubsub_v1.PublisherClient()
@@ -40,23 +44,22 @@ def create_topic_and_subscription(
     subscription_path = subscriber.subscription_path(project_id, subscription_name)
 
     publisher.create_topic(request={"name": topic_path})
-    push_config = {"push_endpoint": push_endpoint}
-
-    subscriber.create_subscription(
-        request={
-            "name": subscription_path,
-            "topic": topic_path,
-            "push_config": push_config,
-        }
-    )
+    request: dict[str, Any] = {"name": subscription_path, "topic": topic_path}
+    if push_endpoint is not None:
+        request["push_config"] = {"push_endpoint": push_endpoint}
+
+    subscriber.create_subscription(request=request)
     print(f"✓ Created topic: {topic_path}")
-    print(f"✓ Created push subscription: {subscription_path}")
-    print(f"✓ Push endpoint: {push_endpoint}")
+    if push_endpoint is not None:
+        print(f"✓ Created push subscription: {subscription_path}")
+        print(f"✓ Push endpoint: {push_endpoint}")
+    else:
+        print(f"✓ Created pull subscription: {subscription_path}")
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Create Pub/Sub topic and push subscription"
+        description="Create Pub/Sub topic and push or pull subscription"
     )
     parser.add_argument(
         "--topic",
@@ -70,8 +73,10 @@ def main():
     )
     parser.add_argument(
         "--endpoint",
-        required=True,
-        help="Push endpoint (e.g., http://host.docker.internal:8000/my-endpoint)",
+        help=(
+            "Push endpoint (e.g., http://host.docker.internal:8000/my-endpoint); "
+            "omit to create a pull subscription"
+        ),
     )
 
     args = parser.parse_args()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compute image embeddings for reference cards.
+
+Usage:
+    python scripts/embed_ref_cards.py [--help] [--concurrency N] [--batch-size N]
+
+Downloads the image of every reference card that has no embedding from the
+current descriptor (core.images.EMBEDDING_MODEL) and stores its embedding,
+so match_card_flow can try a local nearest-neighbour match before the agent.
+Run it after scripts/populate_ref_cards.py; cards that already have an
+up-to-date embedding are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+
+import httpx
+
+from cards.application.services import RefCardEmbeddingService
+from cards.domain.models import RefCard, RefCardEmbeddingAdd
+from cards.infrastructure.repositories import RefCardEmbeddingRepository
+from core.db import get_session_maker, use_profile
+from core.images import EMBEDDING_MODEL, embed_image
+from core.settings.db import EngineProfile
+
+
+async def embed_card(
+    client: httpx.AsyncClient, slots: asyncio.Semaphore, card: RefCard
+) -> RefCardEmbeddingAdd | None:
+    assert card.image_url is not None
+    async with slots:
+        response = await client.get(card.image_url)
+    response.raise_for_status()
+
+    vector = await asyncio.to_thread(embed_image, io.BytesIO(response.content))
+    if vector is None:
+        print(f"  '{card.tcg_id}': image could not be decoded")
+        return None
+
+    return RefCardEmbeddingAdd(
+        ref_card_id=card.id, model=EMBEDDING_MODEL, vector=vector.tobytes()
+    )
+
+
+async def main(concurrency: int, batch_size: int) -> None:
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        service = RefCardEmbeddingService(RefCardEmbeddingRepository(session))
+        cards = await service.list_unembedded_cards(EMBEDDING_MODEL)
+        print(f"Embedding {len(cards)} card(s) with '{EMBEDDING_MODEL}'...")
+
+        slots = asyncio.Semaphore(concurrency)
+        total_embedded = 0
+        async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
+            for i in range(0, len(cards), batch_size):
+                batch = cards[i : i + batch_size]
+                results = await asyncio.gather(
+                    *[embed_card(client, slots, card) for card in batch],
+                    return_exceptions=True,
+                )
+
+                embeddings = []
+                for card, result in zip(batch, results, strict=True):
+                    if isinstance(result, BaseException):
+                        print(f"  '{card.tcg_id}' failed: {result}")
+                    elif result is not None:
+                        embeddings.append(result)
+
+                await service.upsert_embeddings(embeddings)
+                total_embedded += len(embeddings)
+                print(f"  {i + len(batch)}/{len(cards)} processed")
+
+    print(f"\nDone: {total_embedded} embedded")
+
+
+if __name__ == "__main__":
+    use_profile(EngineProfile.script)
+    parser = argparse.ArgumentParser(
+        description="Compute image embeddings for reference cards."
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.batch_size))
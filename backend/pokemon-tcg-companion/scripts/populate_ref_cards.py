@@ -2,93 +2,199 @@
 """Populate reference cards from the TCGdex API.
 
 Usage:
-    python scripts/populate_ref_cards.py [--help] [set_id]
+    python scripts/populate_ref_cards.py [--help] [--concurrency N] [--full]
+        [--cache-dir DIR] [--offline] [set_id]
 
 If set_id is provided, only cards from that set are upserted.
 If omitted, all sets are processed.
-Cards are upserted using tcg_id as the unique key.
+Sets are downloaded through a sliding window of N concurrent requests, and
+all cards are then bulk-loaded with COPY and merged in a single statement,
+using tcg_id as the unique key.
+
+The sync is incremental: sets whose card count matches the last sync are not
+downloaded, and downloaded sets whose content hash is unchanged are not
+written. Pass --full to download every set regardless; unchanged cards are
+still never rewritten.
+
+TCGdex responses are cached under --cache-dir and revalidated with conditional
+requests. --offline rebuilds the catalog from that cache alone, which also
+makes a reproducible, network-free input for benchmarking the loader.
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
 
-from tcgdexsdk import TCGdex
+from sqlalchemy.ext.asyncio import AsyncSession
+from tcgdexsdk.models.Set import Set
 
 from cards.application.services import RefCardService, TcgSetService
-from cards.domain.models import RefCardAdd, TcgSetAdd
+from cards.domain.models import RefCardAdd, TcgSetAdd, TcgSetSyncAdd
 from cards.infrastructure.repositories import RefCardRepository, TcgSetRepository
-from core.db import get_session_maker
+from cards.infrastructure.tcgdex import TcgdexCatalog
+from core.db import get_session_maker, use_profile
+from core.settings.db import EngineProfile
 
+DEFAULT_CACHE_DIR = Path(".cache/tcgdex")
+
+
+async def fetch_set(
+    tcgdex: TcgdexCatalog, set_id: str, slots: asyncio.Semaphore
+) -> Optional[Set]:
+    """Download a set with its cards. Returns None if it has no cards."""
+    async with slots:
+        try:
+            set_data = await tcgdex.get_set(set_id)
+        except Exception as e:
+            print(f"  '{set_id}' failed: {e}")
+            return None
 
-async def populate_set(tcgdex: TCGdex, set_id: str) -> int:
-    """Upsert a set and all its cards. Returns number of cards upserted."""
-    set_data = await tcgdex.set.get(set_id)
     if not set_data or not set_data.cards:
         print(f"  No cards found for set '{set_id}'")
-        return 0
+        return None
+    return set_data
+
+
+def content_hash(set_data: Set) -> str:
+    """Hash every set and card field the catalog stores."""
+    cards = sorted(
+        (card.id, card.localId, card.name, card.get_image_url("high", "webp"))
+        for card in set_data.cards or []
+    )
+    payload = json.dumps([set_data.name, set_data.releaseDate, cards])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
+async def stage_set(session: AsyncSession, set_data: Set) -> list[RefCardAdd]:
+    """Upsert a set and return its cards, ready to be bulk-loaded."""
     release_year = (
         int(set_data.releaseDate.split("-")[0]) if set_data.releaseDate else None
     )
-
-    session_maker = get_session_maker()
-    async with session_maker() as session:
-        tcg_set = await TcgSetService(TcgSetRepository(session)).upsert_set(
-            TcgSetAdd(tcg_id=set_data.id, name=set_data.name, year=release_year)
+    tcg_set = await TcgSetService(TcgSetRepository(session)).upsert_set(
+        TcgSetAdd(tcg_id=set_data.id, name=set_data.name, year=release_year)
+    )
+    return [
+        RefCardAdd(
+            tcg_id=card.id,
+            tcg_local_id=card.localId,
+            name=card.name,
+            image_url=card.get_image_url("high", "webp"),
+            set_id=tcg_set.id,
         )
+        for card in set_data.cards or []
+    ]
 
-        cards = [
-            RefCardAdd(
-                tcg_id=card.id,
-                tcg_local_id=card.localId,
-                name=card.name,
-                image_url=card.get_image_url("high", "webp"),
-                set_id=tcg_set.id,
-            )
-            for card in set_data.cards
-        ]
-        await RefCardService(RefCardRepository(session)).upsert_many_cards(cards)
-
-    print(f"  '{set_id}': {len(cards)} upserted")
-    return len(cards)
 
+async def sync_catalog(
+    tcgdex: TcgdexCatalog, set_id: str | None, concurrency: int, full: bool
+) -> None:
+    session_maker = get_session_maker()
 
-async def main(set_id: str | None = None) -> None:
-    tcgdex = TCGdex()
+    async with session_maker() as session:
+        synced = await TcgSetService(TcgSetRepository(session)).get_sync_states()
 
     if set_id:
         sets_to_process = [set_id]
     else:
-        all_sets = await tcgdex.set.list()
-        sets_to_process = [s.id for s in all_sets]
+        all_sets = await tcgdex.list_sets()
+        # A set that gained or lost cards since the last sync must be fetched;
+        # one with the same count is assumed unchanged unless --full is given.
+        sets_to_process = [
+            s.id
+            for s in all_sets
+            if full
+            or s.id not in synced
+            or synced[s.id].card_count != s.cardCount.total
+        ]
+        print(f"Skipping {len(all_sets) - len(sets_to_process)} unchanged set(s)")
 
     print(f"Processing {len(sets_to_process)} set(s)...")
 
-    batch_size = 5
-    total_upserted = 0
-    for i in range(0, len(sets_to_process), batch_size):
-        batch = sets_to_process[i : i + batch_size]
-        results = await asyncio.gather(
-            *[populate_set(tcgdex, sid) for sid in batch],
-            return_exceptions=True,
+    # Sliding window: a new set download starts as soon as any finishes, and
+    # each set is staged as it arrives instead of waiting on a whole batch.
+    slots = asyncio.Semaphore(concurrency)
+    fetches = [fetch_set(tcgdex, sid, slots) for sid in sets_to_process]
+
+    cards: list[RefCardAdd] = []
+    syncs: list[TcgSetSyncAdd] = []
+    async with session_maker() as session:
+        for fetch in asyncio.as_completed(fetches):
+            set_data = await fetch
+            if set_data is None:
+                continue
+
+            sync = TcgSetSyncAdd(
+                tcg_id=set_data.id,
+                card_count=set_data.cardCount.total,
+                content_hash=content_hash(set_data),
+            )
+            syncs.append(sync)
+            previous = synced.get(set_data.id)
+            if previous is not None and previous.content_hash == sync.content_hash:
+                print(f"  '{set_data.id}': unchanged")
+                continue
+
+            set_cards = await stage_set(session, set_data)
+            print(f"  '{set_data.id}': {len(set_cards)} staged")
+            cards.extend(set_cards)
+
+        upserted = await RefCardService(RefCardRepository(session)).bulk_upsert_cards(
+            cards
         )
-        for sid, result in zip(batch, results, strict=True):
-            if isinstance(result, BaseException):
-                print(f"  '{sid}' failed: {result}")
-            else:
-                total_upserted += result
+        # Only recorded once the cards are committed, so a failed run is
+        # retried in full next time.
+        await TcgSetService(TcgSetRepository(session)).record_syncs(syncs)
 
-    print(f"\nDone: {total_upserted} upserted")
+    print(f"\nDone: {upserted} upserted")
+
+
+async def main(
+    set_id: str | None = None,
+    concurrency: int = 8,
+    full: bool = False,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    offline: bool = False,
+) -> None:
+    async with TcgdexCatalog(cache_dir, offline=offline) as tcgdex:
+        await sync_catalog(tcgdex, set_id, concurrency, full)
 
 
 if __name__ == "__main__":
+    use_profile(EngineProfile.script)
     parser = argparse.ArgumentParser(
         description="Populate reference cards from the TCGdex API."
     )
     parser.add_argument(
         "set_id", nargs="?", help="Set ID to process (omit to process all sets)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of sets downloaded at once (default: 8)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Download every set, even those unchanged since the last sync",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Where TCGdex responses are cached (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Replay the catalog from the response cache without any requests",
+    )
     args = parser.parse_args()
-    asyncio.run(main(args.set_id))
+    asyncio.run(
+        main(args.set_id, args.concurrency, args.full, args.cache_dir, args.offline)
+    )
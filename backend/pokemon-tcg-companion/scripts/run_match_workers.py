@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Run the in-process card match workers.
+
+Claims jobs from the cardmatchjob queue table and matches them in this
+process. Used instead of serve_flows.py for card matching when the API runs
+with CARD_MATCH_BACKEND=queue; can be scaled out by running more processes.
+"""
+
+import asyncio
+import logging
+
+from cards.infrastructure.match_workers import MatchWorkerPool
+from core.db import use_profile
+from core.logfire import setup_logfire
+from core.settings.db import EngineProfile
+from core.settings.prefect import settings
+
+
+async def main() -> None:
+    setup_logfire(pydantic_ai=True)
+    pool = MatchWorkerPool(
+        concurrency=settings.match_worker_concurrency,
+        poll_interval_seconds=settings.match_worker_poll_interval_seconds,
+        lease_seconds=settings.match_worker_lease_seconds,
+        max_attempts=settings.match_worker_max_attempts,
+        retry_delay_seconds=settings.match_worker_retry_delay_seconds,
+    )
+    await pool.run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.log_level)
+    use_profile(EngineProfile.worker)
+    asyncio.run(main())
@@ -7,16 +7,20 @@ configured deployment name and starts serving them. Must stay running
 to accept flow runs dispatched via run_deployment().
 """
 
+import os
 from typing import cast
 
 from prefect import serve
 from prefect.deployments.runner import RunnerDeployment
 
+from core.settings.db import EngineProfile
 from core.settings.prefect import settings
 from flows import FLOWS
 
 
 def serve_flows() -> None:
+    # Flow runs execute in subprocesses, which inherit the worker profile
+    os.environ.setdefault("DB_PROFILE", EngineProfile.worker.value)
     deployments = [
         cast(RunnerDeployment, flow_fn.to_deployment(name=settings.prefect_deployment))
         for flow_fn in FLOWS.values()
@@ -0,0 +1,190 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelResponse,
+    ToolCallPart,
+    ToolReturnPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from cards.application.agents import CardMatcherAgentDeps, card_matcher_agent
+from cards.application.services import RefCardService, TcgSetService
+from cards.domain.models import RefCard, TcgSet
+from cards.infrastructure.repositories import RefCardIndex
+
+BASE_SET = TcgSet(id=uuid4(), tcg_id="base1", name="Base Set", year=1999)
+CANDIDATES = [
+    RefCard(
+        id=uuid4(),
+        tcg_id="base1-4",
+        tcg_local_id="4",
+        name="Charizard",
+        image_url="https://assets.tcgdex.net/en/base/base1/4/high.png",
+        set_id=BASE_SET.id,
+    ),
+    RefCard(
+        id=uuid4(),
+        tcg_id="base1-46",
+        tcg_local_id="46",
+        name="Charmander",
+        image_url="https://assets.tcgdex.net/en/base/base1/46/high.png",
+        set_id=BASE_SET.id,
+    ),
+]
+
+
+def _last_tool_return(messages: list[ModelMessage]) -> ToolReturnPart | None:
+    for part in messages[-1].parts:
+        if isinstance(part, ToolReturnPart):
+            return part
+    return None
+
+
+def _matcher_model(selected_handle: str, seen: list) -> FunctionModel:
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        tool_return = _last_tool_return(messages)
+        if tool_return is None:
+            return ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        "find_match_candidates",
+                        {"name": "Charizard", "year": 1999, "local_id": "4"},
+                    )
+                ]
+            )
+
+        seen.append(tool_return.content)
+        return ModelResponse(
+            parts=[ToolCallPart("select_candidate", {"handle": selected_handle})]
+        )
+
+    return FunctionModel(respond)
+
+
+@pytest.fixture
+def mock_candidate_search():
+    with (
+        patch.object(
+            RefCardService,
+            "find_match_candidates",
+            AsyncMock(return_value=CANDIDATES),
+        ),
+        patch.object(TcgSetService, "get_sets", AsyncMock(return_value=[BASE_SET])),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_candidate_search")
+async def test_candidates_are_compact_and_handles_map_back_to_ids():
+    seen: list = []
+
+    with card_matcher_agent.override(model=_matcher_model("c2", seen)):
+        result = await card_matcher_agent.run(
+            "Match this card", deps=CardMatcherAgentDeps(session=MagicMock())
+        )
+
+    assert result.output.id == CANDIDATES[1].id
+    [candidates] = seen
+    assert candidates == [
+        {
+            "handle": "c1",
+            "name": "Charizard",
+            "set": "Base Set",
+            "year": 1999,
+            "local_id": "4",
+        },
+        {
+            "handle": "c2",
+            "name": "Charmander",
+            "set": "Base Set",
+            "year": 1999,
+            "local_id": "46",
+        },
+    ]
+    # Neither UUIDs nor image URLs are sent to the model
+    serialized = json.dumps(candidates)
+    assert str(CANDIDATES[0].id) not in serialized
+    assert "https://" not in serialized
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_candidate_search")
+async def test_unknown_handle_is_retried():
+    seen: list = []
+    selections = iter(["c9", "c1"])
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if not seen:
+            seen.append(True)
+            return ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        "find_match_candidates",
+                        {"name": "Charizard", "year": 1999, "local_id": "4"},
+                    )
+                ]
+            )
+        return ModelResponse(
+            parts=[ToolCallPart("select_candidate", {"handle": next(selections)})]
+        )
+
+    with card_matcher_agent.override(model=FunctionModel(respond)):
+        result = await card_matcher_agent.run(
+            "Match this card", deps=CardMatcherAgentDeps(session=MagicMock())
+        )
+
+    assert result.output.id == CANDIDATES[0].id
+    assert next(selections, None) is None
+
+
+@pytest.mark.asyncio
+async def test_candidates_come_from_index_in_deps():
+    seen: list = []
+    index = RefCardIndex([(card, BASE_SET.year) for card in CANDIDATES])
+
+    with (
+        patch.object(TcgSetService, "get_sets", AsyncMock(return_value=[BASE_SET])),
+        card_matcher_agent.override(model=_matcher_model("c1", seen)),
+    ):
+        result = await card_matcher_agent.run(
+            "Match this card",
+            deps=CardMatcherAgentDeps(session=MagicMock(), ref_card_index=index),
+        )
+
+    assert result.output.id == CANDIDATES[0].id
+    [candidates] = seen
+    assert [c["local_id"] for c in candidates] == ["4"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_candidate_search")
+async def test_visual_candidates_are_merged_and_marked():
+    seen: list = []
+    lookalike = RefCard(
+        id=uuid4(),
+        tcg_id="base2-4",
+        tcg_local_id="4",
+        name="Charizard",
+        set_id=BASE_SET.id,
+    )
+
+    with card_matcher_agent.override(model=_matcher_model("c3", seen)):
+        result = await card_matcher_agent.run(
+            "Match this card",
+            deps=CardMatcherAgentDeps(
+                session=MagicMock(), visual_candidates=[CANDIDATES[0], lookalike]
+            ),
+        )
+
+    assert result.output.id == lookalike.id
+    [candidates] = seen
+    assert [(c["handle"], c.get("visually_similar")) for c in candidates] == [
+        ("c1", True),
+        ("c2", None),
+        ("c3", True),
+    ]
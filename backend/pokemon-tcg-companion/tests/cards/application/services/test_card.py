@@ -1,7 +1,7 @@
 import pytest
 
 from cards.application.services import CardService
-from cards.domain.models import CardAdd, CardUpdate, RefCard
+from cards.domain.models import CardAdd, CardUpdate, MatchingStatus, RefCard
 from cards.infrastructure.repositories import CardRepository
 
 
@@ -42,3 +42,68 @@ async def test_service(session, ref_card: RefCard):
     await svc.delete_card(card.id)
     deleted_card = await svc.get_card(card.id)
     assert deleted_card is None
+
+
+@pytest.mark.asyncio
+async def test_update_cards(session, ref_card: RefCard):
+    svc = CardService(CardRepository(session))
+    matched, failed, reset = [
+        await svc.add_card(CardAdd(image_path=f"cards/{i}.png", user_id="user_test123"))
+        for i in range(3)
+    ]
+    await svc.update_card(reset.id, CardUpdate(ref_card_id=ref_card.id))
+
+    updated = await svc.update_cards(
+        [
+            (
+                matched.id,
+                CardUpdate(
+                    ref_card_id=ref_card.id, matching_status=MatchingStatus.matched
+                ),
+            ),
+            (failed.id, CardUpdate(matching_status=MatchingStatus.failed)),
+            (
+                reset.id,
+                CardUpdate(ref_card_id=None, matching_status=MatchingStatus.pending),
+            ),
+        ]
+    )
+
+    assert updated == 3
+    cards = {card.id: card for card in await svc.list_cards()}
+    assert cards[matched.id].ref_card_id == ref_card.id
+    assert cards[matched.id].matching_status == MatchingStatus.matched
+    assert cards[failed.id].ref_card_id is None
+    assert cards[failed.id].matching_status == MatchingStatus.failed
+    assert cards[reset.id].ref_card_id is None
+    assert cards[reset.id].matching_status == MatchingStatus.pending
+    assert await svc.update_cards([]) == 0
+
+
+@pytest.mark.asyncio
+async def test_list_cards_by_status_paginates_by_id(session):
+    svc = CardService(CardRepository(session))
+    cards = [
+        await svc.add_card(CardAdd(image_path=f"cards/{i}.png", user_id=f"user_{i}"))
+        for i in range(4)
+    ]
+    await svc.update_cards(
+        [
+            (cards[0].id, CardUpdate(matching_status=MatchingStatus.failed)),
+            (cards[1].id, CardUpdate(matching_status=MatchingStatus.matched)),
+            (cards[2].id, CardUpdate(matching_status=MatchingStatus.failed)),
+        ]
+    )
+
+    statuses = [MatchingStatus.failed, MatchingStatus.pending]
+    first_page = await svc.list_cards_by_status(statuses, limit=2)
+    second_page = await svc.list_cards_by_status(
+        statuses, limit=2, after=first_page[-1].id
+    )
+
+    expected = sorted(card.id for card in cards if card.id != cards[1].id)
+    assert [card.id for card in [*first_page, *second_page]] == expected
+    assert [
+        card.id
+        for card in await svc.list_cards_by_status([MatchingStatus.failed], limit=10)
+    ] == sorted([cards[0].id, cards[2].id])
@@ -0,0 +1,64 @@
+import pytest
+
+from cards.application.services import ImageFingerprintService, RefCardService
+from cards.domain.models import RefCard, RefCardAdd
+from cards.infrastructure.repositories import (
+    ImageFingerprintRepository,
+    RefCardRepository,
+)
+
+# High bit set, so the stored BIGINT is negative
+FINGERPRINT = 0xF0E1_D2C3_B4A5_9687
+
+
+@pytest.mark.asyncio
+async def test_find_match_returns_remembered_card(session, ref_card: RefCard):
+    svc = ImageFingerprintService(ImageFingerprintRepository(session))
+    await svc.remember_match(FINGERPRINT, ref_card.id)
+
+    match = await svc.find_match(FINGERPRINT, max_distance=0)
+
+    assert match is not None
+    assert match.id == ref_card.id
+
+
+@pytest.mark.asyncio
+async def test_find_match_tolerates_bit_flips_across_chunks(session, ref_card: RefCard):
+    svc = ImageFingerprintService(ImageFingerprintRepository(session))
+    await svc.remember_match(FINGERPRINT, ref_card.id)
+
+    # Flip two bits in each 16-bit chunk, so no chunk matches exactly
+    near = FINGERPRINT ^ 0x0003_0003_0003_0003
+
+    assert await svc.find_match(near, max_distance=7) is None
+    match = await svc.find_match(near, max_distance=8)
+    assert match is not None
+    assert match.id == ref_card.id
+
+
+@pytest.mark.asyncio
+async def test_find_match_ignores_distant_fingerprints(session, ref_card: RefCard):
+    svc = ImageFingerprintService(ImageFingerprintRepository(session))
+    await svc.remember_match(FINGERPRINT, ref_card.id)
+
+    assert await svc.find_match(~FINGERPRINT & (2**64 - 1), max_distance=8) is None
+
+
+@pytest.mark.asyncio
+async def test_remember_match_keeps_first_match(session, ref_card: RefCard):
+    other_card = await RefCardService(RefCardRepository(session)).add_card(
+        RefCardAdd(
+            name="Blastoise",
+            tcg_id="base1-2",
+            tcg_local_id="2",
+            image_url="https://assets.tcgdex.net/en/base/base1/2/high.png",
+            set_id=ref_card.set_id,
+        )
+    )
+    svc = ImageFingerprintService(ImageFingerprintRepository(session))
+    await svc.remember_match(FINGERPRINT, ref_card.id)
+    await svc.remember_match(FINGERPRINT, other_card.id)
+
+    match = await svc.find_match(FINGERPRINT, max_distance=0)
+    assert match is not None
+    assert match.id == ref_card.id
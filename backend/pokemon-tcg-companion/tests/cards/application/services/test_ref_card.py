@@ -1,8 +1,10 @@
 import pytest
 
-from cards.application.services import RefCardService
-from cards.domain.models import RefCardAdd, RefCardUpdate, TcgSet
-from cards.infrastructure.repositories import RefCardRepository
+from cards.application.services import RefCardService, TcgSetService
+from cards.domain.models import RefCardAdd, RefCardUpdate, TcgSet, TcgSetAdd
+from cards.domain.repositories import AbstractRefCardRepository
+from cards.infrastructure.repositories import RefCardRepository, TcgSetRepository
+from cards.infrastructure.repositories import ref_card as ref_card_repository
 
 
 @pytest.mark.asyncio
@@ -89,6 +91,98 @@ async def test_find_match_candidates_with_one_wrong_metadata_field(
     assert candidates[0].tcg_id == "base1-4"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, year, local_id",
+    [
+        ("Charizard", 9999, "4"),
+        ("Charizard", 1999, "999"),
+        ("WrongCard", 1999, "4"),
+        ("Charizard", 0, "4"),
+    ],
+)
+async def test_find_match_candidates_concurrently(
+    session, session_maker, tcg_set: TcgSet, name, year, local_id
+):
+    """Searches run on separate sessions return the same fused candidates."""
+    repo = RefCardRepository(session)
+    await RefCardService(repo).add_card(
+        RefCardAdd(
+            name="Charizard",
+            tcg_id="base1-4",
+            tcg_local_id="4",
+            set_id=tcg_set.id,
+        )
+    )
+
+    svc = RefCardService(repo, repo_factory=RefCardRepository.factory(session_maker))
+    candidates = await svc.find_match_candidates(
+        name=name, year=year, local_id=local_id
+    )
+
+    assert [c.tcg_id for c in candidates] == ["base1-4"]
+
+
+@pytest.mark.asyncio
+async def test_fused_candidates_matches_python_fusion(
+    session, session_maker, tcg_set: TcgSet
+):
+    """The single-statement fusion ranks like the Python RRF implementation,
+    with or without concurrent searches."""
+    jungle = await TcgSetService(TcgSetRepository(session)).upsert_set(
+        TcgSetAdd(tcg_id="base2", name="Jungle", year=1999)
+    )
+    repo = RefCardRepository(session)
+    # Every candidate gets a distinct fused score, so the order is fully
+    # determined: base1-4 and base2-4 appear in all three searches (base1-4
+    # with the closer name), basep-4 only in year+local_id and base1-21 only
+    # in year+name.
+    await repo.upsert_many(
+        [
+            RefCardAdd(
+                name="Charizard", tcg_id="base1-4", tcg_local_id="4", set_id=tcg_set.id
+            ),
+            RefCardAdd(
+                name="Dark Charizard",
+                tcg_id="base1-21",
+                tcg_local_id="21",
+                set_id=tcg_set.id,
+            ),
+            RefCardAdd(
+                name="Charizard ex",
+                tcg_id="base2-4",
+                tcg_local_id="4",
+                set_id=jungle.id,
+            ),
+            RefCardAdd(
+                name="Pikachu", tcg_id="basep-4", tcg_local_id="4", set_id=jungle.id
+            ),
+            RefCardAdd(
+                name="Clefable", tcg_id="base2-1", tcg_local_id="1", set_id=jungle.id
+            ),
+        ]
+    )
+
+    weights = [2.0, 1.0, 1.0]
+    fused = await repo.fused_candidates("Charizard", 1999, "4", 10, weights)
+    expected = await AbstractRefCardRepository.fused_candidates(
+        repo, "Charizard", 1999, "4", 10, weights
+    )
+
+    assert [c.tcg_id for c in expected] == [
+        "base1-4",
+        "base2-4",
+        "basep-4",
+        "base1-21",
+    ]
+    assert [c.tcg_id for c in fused] == [c.tcg_id for c in expected]
+
+    concurrent = await RefCardService(
+        repo, repo_factory=RefCardRepository.factory(session_maker)
+    ).find_match_candidates(name="Charizard", year=1999, local_id="4")
+    assert [c.tcg_id for c in concurrent] == [c.tcg_id for c in expected]
+
+
 @pytest.mark.asyncio
 async def test_upsert_many_cards(session, tcg_set: TcgSet):
     repo = RefCardRepository(session)
@@ -134,3 +228,91 @@ async def test_upsert_many_cards(session, tcg_set: TcgSet):
     all_cards = await svc.list_cards()
     assert len(all_cards) == 2
     assert {c.name for c in all_cards} == {"Charizard EX", "Blastoise EX"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_cards(session, tcg_set: TcgSet):
+    svc = RefCardService(RefCardRepository(session))
+    await svc.upsert_many_cards(
+        [
+            RefCardAdd(
+                name="Charizard", tcg_id="base1-4", tcg_local_id="4", set_id=tcg_set.id
+            )
+        ]
+    )
+    existing = (await svc.list_cards())[0]
+
+    written = await svc.bulk_upsert_cards(
+        [
+            RefCardAdd(
+                name="Charizard EX",
+                tcg_id="base1-4",
+                tcg_local_id="4",
+                set_id=tcg_set.id,
+            ),
+            RefCardAdd(
+                name="Blastoise", tcg_id="base1-2", tcg_local_id="2", set_id=tcg_set.id
+            ),
+            # Later duplicates win over earlier ones
+            RefCardAdd(
+                name="Blastoise EX",
+                tcg_id="base1-2",
+                tcg_local_id="2",
+                set_id=tcg_set.id,
+            ),
+        ]
+    )
+
+    assert written == 2
+    all_cards = {c.tcg_id: c for c in await svc.list_cards()}
+    assert {c.name for c in all_cards.values()} == {"Charizard EX", "Blastoise EX"}
+    # Existing cards keep their id, so cards matched to them stay linked
+    assert all_cards["base1-4"].id == existing.id
+    assert await svc.bulk_upsert_cards([]) == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_skips_unchanged_cards(session, tcg_set: TcgSet):
+    svc = RefCardService(RefCardRepository(session))
+    cards = [
+        RefCardAdd(
+            name="Charizard", tcg_id="base1-4", tcg_local_id="4", set_id=tcg_set.id
+        ),
+        RefCardAdd(
+            name="Blastoise", tcg_id="base1-2", tcg_local_id="2", set_id=tcg_set.id
+        ),
+    ]
+    assert await svc.bulk_upsert_cards(cards) == 2
+
+    renamed = [cards[0], cards[1].model_copy(update={"name": "Blastoise EX"})]
+    assert await svc.bulk_upsert_cards(renamed) == 1
+    assert await svc.bulk_upsert_cards(renamed) == 0
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_chunks_large_inputs(session, tcg_set: TcgSet, monkeypatch):
+    # Six bind parameters per row, so each statement carries two rows
+    monkeypatch.setattr(ref_card_repository, "_MAX_BIND_PARAMS", 12)
+    repo = RefCardRepository(session)
+    cards = [
+        RefCardAdd(
+            name=f"Card {i}",
+            tcg_id=f"base1-{i}",
+            tcg_local_id=str(i),
+            set_id=tcg_set.id,
+        )
+        for i in range(5)
+    ]
+
+    ids = await repo.upsert_many(cards)
+    loaded = await repo.get(ids[0])
+    assert loaded is not None
+
+    renamed = [cards[0].model_copy(update={"name": "Renamed"}), *cards[1:]]
+    changed = await repo.upsert_many(renamed)
+
+    assert len(ids) == 5
+    assert len(await repo.list()) == 5
+    # Only the changed card is returned, and its loaded instance is refreshed
+    assert changed == [loaded.id]
+    assert loaded.name == "Renamed"
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from cards.application.services import RefCardEmbeddingService, RefCardService
+from cards.domain.models import RefCard, RefCardAdd, RefCardEmbeddingAdd, TcgSet
+from cards.infrastructure.repositories import (
+    RefCardEmbeddingIndex,
+    RefCardEmbeddingRepository,
+    RefCardRepository,
+)
+from core.images import EMBEDDING_MODEL
+
+
+def _vector(*values: float) -> bytes:
+    vector = np.array(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tobytes()
+
+
+@pytest.mark.asyncio
+async def test_list_unembedded_cards(session, ref_card: RefCard, tcg_set: TcgSet):
+    ref_svc = RefCardService(RefCardRepository(session))
+    await ref_svc.add_card(
+        RefCardAdd(
+            name="Blastoise", tcg_id="base1-2", tcg_local_id="2", set_id=tcg_set.id
+        )
+    )
+    svc = RefCardEmbeddingService(RefCardEmbeddingRepository(session))
+
+    # Cards without an image cannot be embedded
+    assert [c.id for c in await svc.list_unembedded_cards(EMBEDDING_MODEL)] == [
+        ref_card.id
+    ]
+
+    await svc.upsert_embeddings(
+        [
+            RefCardEmbeddingAdd(
+                ref_card_id=ref_card.id, model="old-model", vector=_vector(1, 0)
+            )
+        ]
+    )
+    # An embedding from another descriptor does not count
+    assert [c.id for c in await svc.list_unembedded_cards(EMBEDDING_MODEL)] == [
+        ref_card.id
+    ]
+
+    await svc.upsert_embeddings(
+        [
+            RefCardEmbeddingAdd(
+                ref_card_id=ref_card.id, model=EMBEDDING_MODEL, vector=_vector(1, 0)
+            )
+        ]
+    )
+    assert await svc.list_unembedded_cards(EMBEDDING_MODEL) == []
+    assert await svc.list_embeddings("old-model") == []
+
+
+@pytest.mark.asyncio
+async def test_index_loads_stored_embeddings(session, ref_card: RefCard):
+    repo = RefCardEmbeddingRepository(session)
+    await RefCardEmbeddingService(repo).upsert_embeddings(
+        [
+            RefCardEmbeddingAdd(
+                ref_card_id=ref_card.id, model=EMBEDDING_MODEL, vector=_vector(3, 4)
+            )
+        ]
+    )
+
+    index = await RefCardEmbeddingIndex.load(repo)
+
+    assert len(index) == 1
+    [(id, score)] = index.search(np.array([0.6, 0.8], dtype=np.float32), k=5)
+    assert id == ref_card.id
+    assert score == pytest.approx(1.0)
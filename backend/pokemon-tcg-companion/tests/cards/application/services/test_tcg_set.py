@@ -1,7 +1,7 @@
 import pytest
 
 from cards.application.services import TcgSetService
-from cards.domain.models import TcgSetAdd
+from cards.domain.models import TcgSetAdd, TcgSetSyncAdd
 from cards.infrastructure.repositories import TcgSetRepository
 
 
@@ -41,3 +41,24 @@ async def test_upsert_different_sets_get_different_ids(session):
     jungle = await svc.upsert_set(TcgSetAdd(tcg_id="jungle", name="Jungle", year=1999))
 
     assert base.id != jungle.id
+
+
+@pytest.mark.asyncio
+async def test_record_syncs_overwrites_previous_state(session):
+    svc = TcgSetService(TcgSetRepository(session))
+
+    await svc.record_syncs(
+        [
+            TcgSetSyncAdd(tcg_id="base1", card_count=102, content_hash="a"),
+            TcgSetSyncAdd(tcg_id="jungle", card_count=64, content_hash="b"),
+        ]
+    )
+    await svc.record_syncs(
+        [TcgSetSyncAdd(tcg_id="base1", card_count=103, content_hash="c")]
+    )
+
+    states = await svc.get_sync_states()
+    assert {tcg_id: (s.card_count, s.content_hash) for tcg_id, s in states.items()} == {
+        "base1": (103, "c"),
+        "jungle": (64, "b"),
+    }
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from cards.application.services import CardMatchQueueService, CardService
+from cards.domain.models import CardAdd, CardRead, CardUpdate, MatchingStatus
+from cards.infrastructure.repositories import CardMatchJobRepository, CardRepository
+
+
+async def _enqueue(session, count: int) -> list[CardRead]:
+    cards = await CardService(CardRepository(session)).add_cards(
+        [
+            CardAdd(image_path=f"cards/{i}.jpg", user_id="user_test")
+            for i in range(count)
+        ]
+    )
+    await CardMatchQueueService(CardMatchJobRepository(session)).enqueue_cards(cards)
+    return list(cards)
+
+
+async def _expire_leases(session) -> None:
+    await session.execute(
+        text("UPDATE cardmatchjob SET available_at = now() - interval '1 second'")
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_complete_records_card_and_deletes_job(session):
+    [card] = await _enqueue(session, 1)
+    queue = CardMatchQueueService(CardMatchJobRepository(session))
+    [job] = await queue.claim_jobs(10, lease_seconds=60)
+
+    update = CardUpdate(matching_status=MatchingStatus.failed)
+    assert await queue.complete_job(job, update) is True
+
+    updated = await CardService(CardRepository(session)).get_card(card.id)
+    assert updated is not None
+    assert updated.matching_status == MatchingStatus.failed
+    await _expire_leases(session)
+    assert await queue.claim_jobs(10, lease_seconds=60) == []
+
+
+@pytest.mark.asyncio
+async def test_leased_job_is_claimable_again_once_its_lease_expires(session):
+    [card] = await _enqueue(session, 1)
+    queue = CardMatchQueueService(CardMatchJobRepository(session))
+    [job] = await queue.claim_jobs(10, lease_seconds=60)
+
+    assert await queue.claim_jobs(10, lease_seconds=60) == []
+    await _expire_leases(session)
+    [reclaimed] = await queue.claim_jobs(10, lease_seconds=60)
+
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+    # The first worker lost the job and can no longer change it
+    assert await queue.renew_lease(job, 60) is False
+    update = CardUpdate(matching_status=MatchingStatus.failed)
+    assert await queue.complete_job(job, update) is False
+    unchanged = await CardService(CardRepository(session)).get_card(card.id)
+    assert unchanged is not None
+    assert unchanged.matching_status == MatchingStatus.pending
+
+
+@pytest.mark.asyncio
+async def test_postponed_job_is_retried_after_its_delay(session):
+    await _enqueue(session, 1)
+    queue = CardMatchQueueService(CardMatchJobRepository(session))
+    [job] = await queue.claim_jobs(10, lease_seconds=60)
+
+    assert await queue.retry_job(job, delay_seconds=60) is True
+    assert await queue.claim_jobs(10, lease_seconds=60) == []
+    assert await queue.retry_job(job, delay_seconds=0) is True
+    [retried] = await queue.claim_jobs(10, lease_seconds=60)
+
+    assert retried.id == job.id
+    assert retried.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_get_disjoint_jobs(session, session_maker):
+    cards = await _enqueue(session, 6)
+
+    async def claim():
+        async with session_maker() as worker_session:
+            queue = CardMatchQueueService(CardMatchJobRepository(worker_session))
+            return await queue.claim_jobs(3, lease_seconds=60)
+
+    first, second = await asyncio.gather(claim(), claim())
+
+    first_ids = {job.card_id for job in first}
+    second_ids = {job.card_id for job in second}
+    assert not first_ids & second_ids
+    assert first_ids | second_ids <= {card.id for card in cards}
+    assert len(first) + len(second) == 6
@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+import numpy as np
+
+from cards.domain.models import RefCardEmbedding
+from cards.infrastructure.repositories import RefCardEmbeddingIndex
+from core.images import EMBEDDING_MODEL
+
+
+def _unit(*values: float) -> np.ndarray:
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _embedding(vector: np.ndarray) -> RefCardEmbedding:
+    return RefCardEmbedding(
+        ref_card_id=uuid4(), model=EMBEDDING_MODEL, vector=vector.tobytes()
+    )
+
+
+def test_search_ranks_by_cosine_similarity():
+    embeddings = [
+        _embedding(_unit(1, 0, 0)),
+        _embedding(_unit(1, 1, 0)),
+        _embedding(_unit(0, 0, 1)),
+    ]
+    index = RefCardEmbeddingIndex(embeddings)
+
+    results = index.search(_unit(1, 0.2, 0), k=2)
+
+    assert [id for id, _ in results] == [
+        embeddings[0].ref_card_id,
+        embeddings[1].ref_card_id,
+    ]
+    assert results[0][1] > results[1][1]
+
+
+def test_search_on_empty_index_returns_nothing():
+    assert RefCardEmbeddingIndex().search(_unit(1, 0, 0), k=5) == []
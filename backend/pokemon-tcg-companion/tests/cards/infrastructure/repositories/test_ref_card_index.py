@@ -0,0 +1,95 @@
+from uuid import uuid4
+
+import pytest
+
+from cards.application.services import RefCardService
+from cards.domain.models import RefCard, RefCardAdd, TcgSet
+from cards.infrastructure.repositories import (
+    IndexedRefCardRepository,
+    RefCardIndex,
+    RefCardRepository,
+)
+
+BASE_SET_ID = uuid4()
+JUNGLE_SET_ID = uuid4()
+
+
+def _ref_card(tcg_id: str, local_id: str, name: str, set_id=BASE_SET_ID) -> RefCard:
+    return RefCard(tcg_id=tcg_id, tcg_local_id=local_id, name=name, set_id=set_id)
+
+
+@pytest.fixture
+def index() -> RefCardIndex:
+    return RefCardIndex(
+        [
+            (_ref_card("base1-4", "4", "Charizard"), 1999),
+            (_ref_card("base1-2", "2", "Blastoise"), 1999),
+            (_ref_card("base1-46", "46", "Charmander"), 1999),
+            (_ref_card("base2-4", "4", "Charizard EX", JUNGLE_SET_ID), 2003),
+        ]
+    )
+
+
+def test_search_by_year_and_local_id(index: RefCardIndex):
+    assert [c.tcg_id for c in index.search_by_year_and_local_id(1999, "4")] == [
+        "base1-4"
+    ]
+    assert index.search_by_year_and_local_id(2000, "4") == []
+
+
+def test_search_by_year_and_name(index: RefCardIndex):
+    assert [c.tcg_id for c in index.search_by_year_and_name(1999, "Charizard")] == [
+        "base1-4"
+    ]
+    assert index.search_by_year_and_name(1999, "Pikachu") == []
+
+
+def test_search_by_local_id_and_name_orders_by_similarity(index: RefCardIndex):
+    candidates = index.search_by_local_id_and_name("4", "Charizard")
+    assert [c.tcg_id for c in candidates] == ["base1-4", "base2-4"]
+
+
+def test_refresh_replaces_existing_card(index: RefCardIndex):
+    card = index.search_by_year_and_local_id(1999, "2")[0]
+    renamed = RefCard.model_validate({**card.model_dump(), "name": "Wartortle"})
+
+    index.refresh([(renamed, 1999)])
+
+    assert len(index) == 4
+    assert index.search_by_year_and_name(1999, "Blastoise") == []
+    assert [c.name for c in index.search_by_year_and_name(1999, "Wartortle")] == [
+        "Wartortle"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_indexed_repository_matches_database_search(session, tcg_set: TcgSet):
+    """Candidate search from the index agrees with the trigram SQL queries."""
+    repo = RefCardRepository(session)
+    indexed = IndexedRefCardRepository(session, await RefCardIndex.load(repo))
+
+    # Upserting through the indexed repository refreshes the index in place
+    await RefCardService(indexed).upsert_many_cards(
+        [
+            RefCardAdd(
+                name="Charizard", tcg_id="base1-4", tcg_local_id="4", set_id=tcg_set.id
+            ),
+            RefCardAdd(
+                name="Charmeleon",
+                tcg_id="base1-24",
+                tcg_local_id="24",
+                set_id=tcg_set.id,
+            ),
+        ]
+    )
+    assert len(indexed.index) == 2
+
+    for search in ("Charizard", "Charizerd", "Charm"):
+        from_index = await indexed.search_by_year_and_name(1999, search)
+        from_db = await repo.search_by_year_and_name(1999, search)
+        assert {c.tcg_id for c in from_index} == {c.tcg_id for c in from_db}
+
+    candidates = await RefCardService(indexed).find_match_candidates(
+        name="Charizard", year=1999, local_id="4"
+    )
+    assert candidates[0].tcg_id == "base1-4"
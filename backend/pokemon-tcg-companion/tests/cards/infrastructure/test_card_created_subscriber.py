@@ -0,0 +1,154 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from google.cloud import pubsub_v1
+
+from cards.domain.models import CardRead, MatchingStatus
+from cards.infrastructure import card_created_subscriber
+from cards.infrastructure.card_created_subscriber import CardCreatedSubscriber
+
+
+def _card() -> CardRead:
+    return CardRead(
+        id=uuid4(),
+        ref_card_id=None,
+        user_id="user_test",
+        image_path="cards/test.jpg",
+        matching_status=MatchingStatus.pending,
+    )
+
+
+def _message(data: bytes) -> MagicMock:
+    return MagicMock(data=data, message_id="test-message")
+
+
+def _subscriber(dispatch: AsyncMock, **kwargs) -> CardCreatedSubscriber:
+    with patch.object(card_created_subscriber, "dispatch_matches", dispatch):
+        return CardCreatedSubscriber(
+            "projects/test-project/subscriptions/test-sub",
+            max_messages=10,
+            max_bytes=1024,
+            batch_max_size=2,
+            batch_max_wait_seconds=60,
+            **kwargs,
+        )
+
+
+@pytest.mark.asyncio
+async def test_dispatches_messages_in_batches_and_acks_them():
+    dispatch = AsyncMock()
+    subscriber = _subscriber(dispatch)
+    cards = [_card(), _card()]
+    messages = [_message(card.model_dump_json().encode()) for card in cards]
+
+    await asyncio.gather(*(subscriber.handle(m) for m in messages))
+
+    dispatch.assert_awaited_once_with(cards)
+    for message in messages:
+        message.ack.assert_called_once()
+        message.nack.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_nacks_when_dispatch_fails_and_drops_malformed_messages():
+    subscriber = _subscriber(AsyncMock(side_effect=RuntimeError("dispatch failed")))
+    valid = [_message(_card().model_dump_json().encode()) for _ in range(2)]
+    malformed = _message(b'{"id": "not-a-card"}')
+
+    await asyncio.gather(*(subscriber.handle(m) for m in [*valid, malformed]))
+
+    for message in valid:
+        message.nack.assert_called_once()
+        message.ack.assert_not_called()
+    malformed.ack.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_run_handles_messages_delivered_on_the_client_thread():
+    dispatch = AsyncMock()
+    streaming_pull: Future[None] = Future()
+    client = MagicMock()
+    client.subscribe.return_value = streaming_pull
+    subscriber = _subscriber(dispatch, subscriber=client)
+    subscriber._batcher._max_size = 1
+    card = _card()
+    message = _message(card.model_dump_json().encode())
+
+    run = asyncio.create_task(subscriber.run())
+    while not client.subscribe.called:
+        await asyncio.sleep(0)
+    callback = client.subscribe.call_args.kwargs["callback"]
+    threading.Thread(target=callback, args=(message,)).start()
+    while not message.ack.called:
+        await asyncio.sleep(0.01)
+    streaming_pull.set_result(None)
+    await run
+
+    dispatch.assert_awaited_once_with([card])
+    assert client.subscribe.call_args.kwargs["flow_control"].max_messages == 10
+    client.close.assert_called_once()
+
+
+@pytest.fixture
+def emulator_subscription():
+    """A fresh topic and pull subscription on the Pub/Sub emulator."""
+    if not os.environ.get("PUBSUB_EMULATOR_HOST"):
+        pytest.skip("PUBSUB_EMULATOR_HOST is not set")
+
+    publisher = pubsub_v1.PublisherClient()
+    subscriber = pubsub_v1.SubscriberClient()
+    suffix = uuid4().hex
+    topic_path = publisher.topic_path("local-project", f"card-created-{suffix}")
+    subscription_path = subscriber.subscription_path(
+        "local-project", f"card-created-sub-{suffix}"
+    )
+    publisher.create_topic(request={"name": topic_path})
+    subscriber.create_subscription(
+        request={"name": subscription_path, "topic": topic_path}
+    )
+
+    yield publisher, topic_path, subscription_path
+
+    subscriber.delete_subscription(request={"subscription": subscription_path})
+    publisher.delete_topic(request={"topic": topic_path})
+    subscriber.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.emulator
+async def test_consumes_messages_from_the_emulator(emulator_subscription):
+    publisher, topic_path, subscription_path = emulator_subscription
+    cards = [_card(), _card()]
+    dispatched: list[CardRead] = []
+    all_dispatched = asyncio.Event()
+
+    async def dispatch(batch: list[CardRead]) -> None:
+        dispatched.extend(batch)
+        if len(dispatched) >= len(cards):
+            all_dispatched.set()
+
+    with patch.object(card_created_subscriber, "dispatch_matches", dispatch):
+        subscriber = CardCreatedSubscriber(
+            subscription_path,
+            max_messages=10,
+            max_bytes=1024 * 1024,
+            batch_max_size=10,
+            batch_max_wait_seconds=0.1,
+        )
+    for card in cards:
+        publisher.publish(topic_path, card.model_dump_json().encode()).result()
+
+    run = asyncio.create_task(subscriber.run())
+    try:
+        await asyncio.wait_for(all_dispatched.wait(), timeout=30)
+    finally:
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+
+    assert sorted(dispatched, key=lambda c: c.id) == sorted(cards, key=lambda c: c.id)
@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from cards.domain.models import RefCard
+from cards.infrastructure import card_matching
+from cards.infrastructure.card_matching import CardImage, match_card_image
+
+VISUAL_MATCH = RefCard(
+    id=uuid4(), tcg_id="base1-4", tcg_local_id="4", name="Charizard", set_id=uuid4()
+)
+AGENT_MATCH = RefCard(
+    id=uuid4(), tcg_id="base1-2", tcg_local_id="2", name="Blastoise", set_id=uuid4()
+)
+
+
+@pytest.fixture
+def stages():
+    """Stub every stage that needs a session and enable fingerprinting."""
+    results = {
+        card_matching._find_fingerprint_match: None,
+        card_matching._find_visual_candidates: [],
+        card_matching._run_card_matcher_agent: AGENT_MATCH,
+        card_matching._remember_fingerprint: None,
+    }
+    calls = []
+
+    async def fake_with_session(fn, *args):
+        calls.append((fn, args))
+        return results[fn]
+
+    with (
+        patch.object(card_matching, "with_session", fake_with_session),
+        patch.object(card_matching, "dhash", return_value=0b1010),
+        patch.object(card_matching.settings, "image_fingerprint_enabled", True),
+    ):
+        yield results, calls
+
+
+@pytest.mark.asyncio
+async def test_agent_match_is_fingerprinted(stages):
+    _, calls = stages
+
+    matched = await match_card_image(
+        CardImage(path="card.jpg", media_type="image/jpeg"),
+        embedding_index=MagicMock(),
+    )
+
+    assert matched == AGENT_MATCH
+    assert calls[-1] == (card_matching._remember_fingerprint, (0b1010, AGENT_MATCH))
+
+
+@pytest.mark.asyncio
+async def test_visual_candidates_are_offered_to_the_agent(stages):
+    results, calls = stages
+    results[card_matching._find_visual_candidates] = [VISUAL_MATCH]
+
+    matched = await match_card_image(
+        CardImage(path="card.jpg", media_type="image/jpeg"),
+        embedding_index=MagicMock(),
+    )
+
+    # The agent still decides, even when the image looks like a known card
+    assert matched == AGENT_MATCH
+    [agent_args] = [
+        args for fn, args in calls if fn is card_matching._run_card_matcher_agent
+    ]
+    assert agent_args[-1] == [VISUAL_MATCH]
+
+
+@pytest.mark.asyncio
+async def test_visual_stage_is_skipped_without_an_index(stages):
+    _, calls = stages
+
+    await match_card_image(CardImage(path="card.jpg", media_type="image/jpeg"))
+
+    assert card_matching._find_visual_candidates not in [fn for fn, _ in calls]
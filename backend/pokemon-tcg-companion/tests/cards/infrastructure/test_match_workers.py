@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from cards.domain.models import CardMatchJob, CardUpdate, MatchingStatus, RefCard
+from cards.infrastructure import match_workers
+from cards.infrastructure.match_workers import MatchWorkerPool
+
+MATCH = RefCard(
+    id=uuid4(), tcg_id="base1-4", tcg_local_id="4", name="Charizard", set_id=uuid4()
+)
+
+
+def _job(attempts: int) -> CardMatchJob:
+    return CardMatchJob(
+        id=1, card_id=uuid4(), image_path="cards/card.jpg", attempts=attempts
+    )
+
+
+def _pool(lease_seconds: float = 60) -> MatchWorkerPool:
+    return MatchWorkerPool(
+        concurrency=1,
+        poll_interval_seconds=0,
+        lease_seconds=lease_seconds,
+        max_attempts=3,
+        retry_delay_seconds=30,
+    )
+
+
+@pytest.fixture
+def stages():
+    """Stub the download, the match and every queue write."""
+    calls = []
+
+    async def fake_with_session(fn, *args):
+        calls.append((fn, args))
+        return True
+
+    with (
+        patch.object(match_workers, "with_session", fake_with_session),
+        patch.object(match_workers, "_download_card", AsyncMock()) as download,
+        patch.object(
+            match_workers, "match_card_image", AsyncMock(return_value=MATCH)
+        ) as match,
+        patch.object(match_workers, "shared_ref_card_index", AsyncMock()),
+        patch.object(match_workers, "shared_embedding_index", AsyncMock()),
+    ):
+        download.return_value = MagicMock()
+        yield calls, download, match
+
+
+@pytest.mark.asyncio
+async def test_match_is_recorded(stages):
+    calls, _, _ = stages
+    job = _job(attempts=1)
+
+    await _pool()._process(job)
+
+    update = CardUpdate(ref_card_id=MATCH.id, matching_status=MatchingStatus.matched)
+    assert calls == [(match_workers._finish_job, (job, update))]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried(stages):
+    calls, download, _ = stages
+    download.side_effect = RuntimeError("download failed")
+    job = _job(attempts=2)
+
+    await _pool()._process(job)
+
+    assert calls == [(match_workers._retry_job, (job, 30))]
+
+
+@pytest.mark.asyncio
+async def test_card_is_marked_failed_after_max_attempts(stages):
+    calls, download, _ = stages
+    download.side_effect = RuntimeError("download failed")
+    job = _job(attempts=3)
+
+    await _pool()._process(job)
+
+    update = CardUpdate(matching_status=MatchingStatus.failed)
+    assert calls == [(match_workers._finish_job, (job, update))]
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_job_runs(stages):
+    calls, _, match = stages
+
+    async def slow_match(*args, **kwargs):
+        await asyncio.sleep(0.1)
+        return MATCH
+
+    match.side_effect = slow_match
+    job = _job(attempts=1)
+
+    await _pool(lease_seconds=0.03)._process(job)
+
+    fns = [fn for fn, _ in calls]
+    assert fns.count(match_workers._renew_lease) >= 2
+    assert fns[-1] is match_workers._finish_job
+    assert (match_workers._renew_lease, (job, 0.03)) in calls
@@ -0,0 +1,15 @@
+from cards.domain.models import MatchingStatus
+from cards.infrastructure.flows.rematch_cards import _cursor_variable
+
+
+def test_each_status_set_has_its_own_cursor():
+    failed = _cursor_variable([MatchingStatus.failed])
+    failed_and_pending = _cursor_variable(
+        [MatchingStatus.failed, MatchingStatus.pending]
+    )
+
+    assert failed == "rematch_cards_cursor_failed"
+    assert failed_and_pending == "rematch_cards_cursor_failed_pending"
+    assert failed_and_pending == _cursor_variable(
+        [MatchingStatus.pending, MatchingStatus.failed]
+    )
@@ -0,0 +1,93 @@
+import httpx
+import pytest
+
+from cards.infrastructure.tcgdex import CacheMiss, TcgdexCatalog
+
+BASE_SET_RESUME = {
+    "id": "base1",
+    "name": "Base Set",
+    "logo": None,
+    "symbol": None,
+    "cardCount": {"total": 1, "official": 1},
+}
+BASE_SET = {
+    **BASE_SET_RESUME,
+    "serie": {"id": "base", "name": "Base"},
+    "tcgOnline": None,
+    "releaseDate": "1999-01-09",
+    "legal": {"standard": False, "expanded": False},
+    "cards": [
+        {
+            "id": "base1-4",
+            "localId": "4",
+            "name": "Charizard",
+            "image": "https://assets.tcgdex.net/en/base/base1/4",
+        }
+    ],
+    "boosters": None,
+    "abbreviations": None,
+}
+
+
+def _catalog(tmp_path, handler, **kwargs) -> TcgdexCatalog:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return TcgdexCatalog(tmp_path, client=client, backoff_seconds=0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_get_set_revalidates_cached_response(tmp_path):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=BASE_SET, headers={"ETag": '"v1"'})
+
+    async with _catalog(tmp_path, handler) as catalog:
+        first = await catalog.get_set("base1")
+        second = await catalog.get_set("base1")
+
+    assert first is not None and second is not None
+    assert second.cards[0].get_image_url("high", "webp") == (
+        "https://assets.tcgdex.net/en/base/base1/4/high.webp"
+    )
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_offline_replays_cache_without_requests(tmp_path):
+    def online(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=BASE_SET)
+
+    async with _catalog(tmp_path, online) as catalog:
+        await catalog.get_set("base1")
+
+    def offline(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("offline catalog made a request")
+
+    async with _catalog(tmp_path, offline, offline=True) as catalog:
+        replayed = await catalog.get_set("base1")
+        with pytest.raises(CacheMiss):
+            await catalog.get_set("jungle")
+
+    assert replayed is not None
+    assert replayed.name == "Base Set"
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors_and_handles_missing_sets(tmp_path):
+    statuses = iter([503, 429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        return httpx.Response(next(statuses), json=[BASE_SET_RESUME])
+
+    async with _catalog(tmp_path, handler) as catalog:
+        sets = await catalog.list_sets()
+        missing = await catalog.get_set("missing")
+
+    assert [s.id for s in sets] == ["base1"]
+    assert missing is None
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID, uuid4
@@ -11,8 +12,9 @@ from pydantic_ai.exceptions import UnexpectedModelBehavior
 
 from cards.application.agents.card_matcher import MatchResult, card_matcher_agent
 from cards.application.services import CardService
-from cards.domain.models import CardAdd, CardRead, MatchingStatus
+from cards.domain.models import CardAdd, CardRead, CardUpdate, MatchingStatus
 from cards.infrastructure.repositories import CardRepository
+from core.batching import Coalescer
 from tests.utils.mocks import create_mock_storage_client
 from tests.utils.pubsub import create_pubsub_message
 
@@ -25,9 +27,15 @@ def mock_storage_with_card_image():
     async def _fake_get_storage_client():
         return mock_client
 
-    with patch(
-        "cards.infrastructure.flows.match_card._get_storage_client",
-        new=_fake_get_storage_client,
+    with (
+        patch(
+            "cards.infrastructure.flows.match_card._get_storage_client",
+            new=_fake_get_storage_client,
+        ),
+        patch(
+            "cards.infrastructure.match_workers._get_storage_client",
+            new=_fake_get_storage_client,
+        ),
     ):
         yield mock_client
 
@@ -44,14 +52,15 @@ class TestCardsAPI:
     @pytest.mark.asyncio
     @pytest.mark.integration
     async def test_list_cards(self, session, client):
-        """Returns all persisted cards."""
+        """Returns all of the caller's cards."""
         svc = CardService(CardRepository(session))
         await svc.add_card(CardAdd(image_path="cards/test.jpg", user_id="user_test"))
         await svc.add_card(CardAdd(image_path="cards/test2.jpg", user_id="user_test"))
 
         response = await client.get("/cards")
         assert response.status_code == 200
-        cards = response.json()
+        assert "X-Next-Cursor" not in response.headers
+        cards = sorted(response.json(), key=lambda card: card["image_path"])
         assert len(cards) == 2
 
         assert cards[0]["user_id"] == "user_test"
@@ -62,6 +71,68 @@ class TestCardsAPI:
         assert cards[1]["image_path"] == "cards/test2.jpg"
         assert cards[1]["matching_status"] == MatchingStatus.pending
 
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_list_cards_excludes_other_users(self, session, client):
+        """Only returns cards owned by the authenticated user."""
+        svc = CardService(CardRepository(session))
+        await svc.add_card(CardAdd(image_path="cards/mine.jpg", user_id="user_test"))
+        await svc.add_card(CardAdd(image_path="cards/theirs.jpg", user_id="user_other"))
+
+        response = await client.get("/cards")
+        assert response.status_code == 200
+        assert [card["image_path"] for card in response.json()] == ["cards/mine.jpg"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_list_cards_paginates(self, session, client):
+        """Follows X-Next-Cursor until every card has been returned once."""
+        svc = CardService(CardRepository(session))
+        added = [
+            await svc.add_card(
+                CardAdd(image_path=f"cards/{i}.jpg", user_id="user_test")
+            )
+            for i in range(5)
+        ]
+        await svc.update_card(
+            added[0].id, CardUpdate(matching_status=MatchingStatus.matched)
+        )
+        await svc.update_card(
+            added[1].id, CardUpdate(matching_status=MatchingStatus.failed)
+        )
+
+        pages = []
+        params: dict[str, str | int] = {"limit": 2}
+        while True:
+            response = await client.get("/cards", params=params)
+            assert response.status_code == 200
+            pages.append(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params["cursor"] = cursor
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        listed = [card for page in pages for card in page]
+        assert sorted(card["id"] for card in listed) == sorted(
+            str(card.id) for card in added
+        )
+        # Cards still waiting for a match come first
+        assert [card["matching_status"] for card in listed] == [
+            MatchingStatus.pending,
+            MatchingStatus.pending,
+            MatchingStatus.pending,
+            MatchingStatus.matched,
+            MatchingStatus.failed,
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_list_cards_rejects_invalid_cursor(self, client):
+        """Returns 400 for a cursor that was not issued by the API."""
+        response = await client.get("/cards", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     @pytest.mark.integration
     async def test_add_card(self, client, mock_publisher):
@@ -79,6 +150,34 @@ class TestCardsAPI:
         assert data["matching_status"] == MatchingStatus.pending
         mock_publisher.publish.assert_called_once()
 
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_add_card_with_outbox(self, client, mock_publisher, session_maker):
+        """In outbox mode the card-created event is stored with the card and
+        published by the outbox relay instead of during the request."""
+        from cards.infrastructure.outbox_relay import OutboxRelay
+        from cards.interface.api import cards as cards_api
+        from core.settings.app import PublishMode
+
+        with patch.object(
+            cards_api.settings, "card_created_publish_mode", PublishMode.outbox
+        ):
+            response = await client.post(
+                "/cards",
+                json={"image_path": "cards/test.jpg"},
+            )
+        assert response.status_code == 201
+        mock_publisher.publish.assert_not_called()
+
+        relay = OutboxRelay(mock_publisher, batch_size=10, poll_interval_seconds=0)
+        with patch("core.db.get_session_maker", return_value=session_maker):
+            assert await relay.relay_once() == 1
+            assert await relay.relay_once() == 0
+
+        topic, data = mock_publisher.publish.call_args.args
+        assert topic == cards_api.CARD_CREATED_TOPIC
+        assert CardRead.model_validate_json(data).id == UUID(response.json()["id"])
+
     @pytest.mark.asyncio
     @pytest.mark.integration
     async def test_get_card(self, session, client):
@@ -132,6 +231,52 @@ class TestCardsAPI:
         assert data.get("upload_url")
         assert data.get("image_path")
 
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @pytest.mark.usefixtures("mock_storage")
+    async def test_create_upload_urls(self, client):
+        """Returns a signed upload URL and a distinct image path per file."""
+        response = await client.post(
+            "/cards/upload-urls",
+            json={
+                "files": [
+                    {"filename": f"card-{i}.jpg", "content_type": "image/jpeg"}
+                    for i in range(3)
+                ]
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 3
+        assert all(item.get("upload_url") for item in data)
+        assert len({item["image_path"] for item in data}) == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_add_cards(self, session, client, mock_publisher):
+        """Adding cards in bulk creates every card and publishes an event each."""
+        image_paths = [f"cards/test-{i}.jpg" for i in range(3)]
+
+        response = await client.post("/cards/batch", json={"image_paths": image_paths})
+        assert response.status_code == 201
+        data = response.json()
+        assert [card["image_path"] for card in data] == image_paths
+        assert all(card["user_id"] == "user_test" for card in data)
+        assert mock_publisher.publish.call_count == 3
+
+        svc = CardService(CardRepository(session))
+        for card in data:
+            stored = await svc.get_card(UUID(card["id"]))
+            assert stored is not None
+            assert stored.matching_status == MatchingStatus.pending
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_add_cards_rejects_empty_batch(self, client):
+        """Returns 422 when no image paths are given."""
+        response = await client.post("/cards/batch", json={"image_paths": []})
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     @pytest.mark.integration
     @pytest.mark.usefixtures("mock_storage_with_card_image")
@@ -288,6 +433,113 @@ class TestCardsAPI:
             assert updated_card is not None
             assert updated_card.matching_status == MatchingStatus.failed
 
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @pytest.mark.usefixtures("mock_publisher")
+    @pytest.mark.usefixtures("mock_storage_with_card_image")
+    @pytest.mark.usefixtures("prefect_flow")
+    async def test_card_match_batched(self, session, client, ref_card):
+        """Webhook messages are coalesced into one batch flow run that matches
+        every card and writes the results back together."""
+        from cards.infrastructure.flows import match_cards_batch
+        from cards.interface.api import webhooks
+
+        mock_result = MagicMock()
+        mock_result.output = MatchResult(id=ref_card.id)
+        svc = CardService(CardRepository(session))
+        cards = [
+            await svc.add_card(
+                CardAdd(image_path=f"cards/test-{i}.jpg", user_id="user_test")
+            )
+            for i in range(3)
+        ]
+        batcher = Coalescer(
+            webhooks.dispatch_match_batch, max_size=3, max_wait_seconds=60
+        )
+
+        with (
+            patch.object(
+                card_matcher_agent, "run", AsyncMock(return_value=mock_result)
+            ),
+            patch.object(webhooks.settings, "card_match_batch_enabled", True),
+            patch.object(webhooks, "card_match_batcher", batcher),
+            # The test session is shared, so agent runs must not overlap
+            patch.object(
+                match_cards_batch.settings, "match_batch_agent_concurrency", 1
+            ),
+        ):
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        "/cards/webhooks/card-created",
+                        json=create_pubsub_message(
+                            payload=CardRead.model_validate(card)
+                        ).model_dump(by_alias=True),
+                    )
+                    for card in cards
+                )
+            )
+
+        assert all(r.status_code == 200 for r in responses)
+        for card in cards:
+            updated_card = await svc.get_card(card.id)
+            assert updated_card is not None
+            assert updated_card.matching_status == MatchingStatus.matched
+            assert updated_card.ref_card_id == ref_card.id
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @pytest.mark.usefixtures("mock_publisher")
+    @pytest.mark.usefixtures("mock_storage_with_card_image")
+    @pytest.mark.usefixtures("prefect_flow")
+    async def test_card_match_queued(self, session, client, ref_card):
+        """With the queue backend the webhook only enqueues a job, which the
+        in-process match workers claim and match."""
+        from cards.infrastructure.match_workers import MatchWorkerPool
+        from cards.interface.api import webhooks
+        from core.settings.app import CardMatchBackend
+
+        mock_result = MagicMock()
+        mock_result.output = MatchResult(id=ref_card.id)
+        svc = CardService(CardRepository(session))
+        card = await svc.add_card(
+            CardAdd(image_path="cards/test-queued.jpg", user_id="user_test")
+        )
+        message = create_pubsub_message(payload=CardRead.model_validate(card))
+
+        with patch.object(
+            webhooks.settings, "card_match_backend", CardMatchBackend.queue
+        ):
+            for _ in range(2):  # Redelivered messages do not duplicate the job
+                response = await client.post(
+                    "/cards/webhooks/card-created",
+                    json=message.model_dump(by_alias=True),
+                )
+                assert response.status_code == 200
+
+        queued_card = await svc.get_card(card.id)
+        assert queued_card is not None
+        assert queued_card.matching_status == MatchingStatus.pending
+
+        pool = MatchWorkerPool(
+            concurrency=1,
+            poll_interval_seconds=0,
+            lease_seconds=60,
+            max_attempts=3,
+            retry_delay_seconds=0,
+        )
+        with patch.object(
+            card_matcher_agent, "run", AsyncMock(return_value=mock_result)
+        ):
+            assert await pool.run_once() == 1
+            await pool.drain()
+            assert await pool.run_once() == 0
+
+        matched_card = await svc.get_card(card.id)
+        assert matched_card is not None
+        assert matched_card.matching_status == MatchingStatus.matched
+        assert matched_card.ref_card_id == ref_card.id
+
 
 @pytest.mark.asyncio
 @pytest.mark.integration
@@ -0,0 +1,106 @@
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from cards.interface.api import sync
+from main import app
+
+
+@pytest.fixture
+def electric_requests():
+    return []
+
+
+@pytest_asyncio.fixture
+async def sync_client(electric_requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        electric_requests.append(request)
+        return httpx.Response(
+            200,
+            json=[],
+            headers={
+                # What Electric sends for initial (offset=-1) snapshot chunks
+                "cache-control": (
+                    "public, max-age=604800, s-maxage=3600, "
+                    "stale-while-revalidate=2629746"
+                ),
+                "etag": '"shape-etag"',
+                "electric-handle": "123-456",
+                "electric-offset": "0_0",
+            },
+        )
+
+    sync._shape_responses.clear()
+    app.state.sync_http_client = AsyncClient(transport=httpx.MockTransport(handler))
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    await app.state.sync_http_client.aclose()
+    sync._shape_responses.clear()
+
+
+@pytest.mark.asyncio
+async def test_card_shape_is_filtered_to_caller(sync_client, electric_requests):
+    response = await sync_client.get(
+        "/sync/card", params={"offset": "-1", "where": "true", "columns": "user_id"}
+    )
+
+    assert response.status_code == 200
+    params = electric_requests[0].url.params
+    assert params["table"] == "card"
+    assert params["where"] == "user_id = $1"
+    assert params["params[1]"] == "user_test"
+    assert params["columns"] == "id,ref_card_id,user_id,image_path,matching_status"
+    assert params["offset"] == "-1"
+
+
+@pytest.mark.asyncio
+async def test_unknown_shape_is_not_found(sync_client, electric_requests):
+    response = await sync_client.get("/sync/outboxmessage", params={"offset": "-1"})
+
+    assert response.status_code == 404
+    assert electric_requests == []
+
+
+@pytest.mark.asyncio
+async def test_catalog_snapshot_is_served_from_cache(sync_client, electric_requests):
+    params = {"offset": "-1"}
+    first = await sync_client.get("/sync/refcard", params=params)
+    second = await sync_client.get("/sync/refcard", params=params)
+    not_modified = await sync_client.get(
+        "/sync/refcard", params=params, headers={"if-none-match": '"shape-etag"'}
+    )
+
+    assert len(electric_requests) == 1
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["electric-handle"] == "123-456"
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_live_requests_are_not_cached(sync_client, electric_requests):
+    params = {"offset": "0_0", "handle": "123-456", "live": "true"}
+    await sync_client.get("/sync/tcgset", params=params)
+    await sync_client.get("/sync/tcgset", params=params)
+
+    assert len(electric_requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_expires_after_s_maxage(
+    sync_client, electric_requests, monkeypatch
+):
+    params = {"offset": "-1"}
+    await sync_client.get("/sync/refcard", params=params)
+
+    # Past s-maxage, though well within the browser max-age
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3601)
+    await sync_client.get("/sync/refcard", params=params)
+
+    assert len(electric_requests) == 2
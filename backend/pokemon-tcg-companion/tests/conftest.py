@@ -109,6 +109,15 @@ async def session(async_engine):
         await session.rollback()
 
 
+@pytest_asyncio.fixture
+async def session_maker(async_engine, session):
+    """Session maker bound to the test DB, for code that opens its own sessions.
+
+    Depends on ``session`` so tables are truncated before the test runs.
+    """
+    return async_sessionmaker(async_engine, expire_on_commit=False)
+
+
 @pytest.fixture
 def mock_publisher():
     """Mock the Pub/Sub publisher dependency."""
@@ -0,0 +1,128 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from clerk_backend_api.security.types import (
+    AuthErrorReason,
+    AuthStatus,
+    RequestState,
+)
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from core import auth
+
+
+def _request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+def _signed_in(token: str, exp: float) -> RequestState:
+    return RequestState(
+        status=AuthStatus.SIGNED_IN,
+        token=token,
+        payload={"sub": "user_test", "exp": exp},
+    )
+
+
+def _response(cache_control: str, status: int = 200) -> MagicMock:
+    return MagicMock(status=status, headers={"Cache-Control": cache_control})
+
+
+@pytest.fixture(autouse=True)
+def clear_verified_tokens():
+    auth._verified_sessions.clear()
+    auth._verified_pubsub_tokens.clear()
+    yield
+    auth._verified_sessions.clear()
+    auth._verified_pubsub_tokens.clear()
+
+
+@pytest.mark.asyncio
+async def test_require_auth_verifies_each_token_once_until_it_expires():
+    authenticate = AsyncMock(return_value=_signed_in("token", time.time() + 60))
+
+    with patch.object(auth.clerk, "authenticate_request_async", authenticate):
+        request = _request("token")
+        first = await auth.require_auth(request)
+        # Repeated dependency on the same request, then a later request
+        assert await auth.require_auth(request) == first
+        assert await auth.require_auth(_request("token")) == first
+        assert authenticate.await_count == 1
+
+        authenticate.return_value = _signed_in("expired", time.time() - 1)
+        await auth.require_auth(_request("expired"))
+        await auth.require_auth(_request("expired"))
+        assert authenticate.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_require_auth_does_not_cache_rejected_tokens():
+    authenticate = AsyncMock(
+        return_value=RequestState(
+            status=AuthStatus.SIGNED_OUT, reason=AuthErrorReason.SESSION_TOKEN_MISSING
+        )
+    )
+
+    with patch.object(auth.clerk, "authenticate_request_async", authenticate):
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await auth.require_auth(_request("invalid"))
+            assert exc_info.value.status_code == 401
+
+    assert authenticate.await_count == 2
+    assert len(auth._verified_sessions) == 0
+
+
+def test_caching_request_reuses_responses_within_max_age():
+    inner = MagicMock(return_value=_response("public, max-age=3600"))
+    request = auth.CachingRequest(inner)
+
+    first = request("https://example.com/certs")
+    second = request("https://example.com/certs")
+
+    assert first is second
+    assert inner.call_count == 1
+
+
+def test_caching_request_does_not_cache_uncacheable_responses():
+    inner = MagicMock(
+        side_effect=[_response("no-store"), _response("max-age=60", status=500)] * 2
+    )
+    request = auth.CachingRequest(inner)
+
+    for _ in range(4):
+        request("https://example.com/certs")
+
+    assert inner.call_count == 4
+
+
+def test_verify_pubsub_token_checks_each_token_signature_once():
+    claim = {
+        "email": "pubsub@example.com",
+        "email_verified": True,
+        "exp": time.time() + 3600,
+    }
+    verify = MagicMock(return_value=claim)
+
+    with (
+        patch.object(auth.settings, "pubsub_audience", "test-audience"),
+        patch.object(auth.settings, "pubsub_service_account_email") as email,
+        patch.object(auth.id_token, "verify_oauth2_token", verify),
+    ):
+        email.get_secret_value.return_value = "pubsub@example.com"
+        for _ in range(3):
+            auth.verify_pubsub_token("Bearer token")
+
+        email.get_secret_value.return_value = "other@example.com"
+        with pytest.raises(HTTPException):
+            auth.verify_pubsub_token("Bearer token")
+
+    verify.assert_called_once_with(
+        "token", auth._google_request, audience="test-audience"
+    )
@@ -0,0 +1,74 @@
+import asyncio
+import gc
+
+import pytest
+
+from core.batching import Coalescer
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full():
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> None:
+        batches.append(items)
+
+    coalescer = Coalescer(flush, max_size=2, max_wait_seconds=60)
+    await asyncio.gather(*(coalescer.submit(i) for i in range(4)))
+
+    assert batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_after_max_wait():
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> None:
+        batches.append(items)
+
+    coalescer = Coalescer(flush, max_size=10, max_wait_seconds=0.01)
+    await asyncio.gather(coalescer.submit(1), coalescer.submit(2))
+
+    assert batches == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_flush_errors_propagate_to_every_submitter():
+    async def flush(items: list[int]) -> None:
+        raise RuntimeError("dispatch failed")
+
+    coalescer = Coalescer(flush, max_size=2, max_wait_seconds=60)
+    results = await asyncio.gather(
+        coalescer.submit(1), coalescer.submit(2), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_without_submitters_is_not_reported():
+    flushing = asyncio.Event()
+    submitters_gone = asyncio.Event()
+
+    async def flush(items: list[int]) -> None:
+        flushing.set()
+        await submitters_gone.wait()
+        raise RuntimeError("dispatch failed")
+
+    loop = asyncio.get_running_loop()
+    reported = []
+    loop.set_exception_handler(lambda _, context: reported.append(context))
+    try:
+        coalescer = Coalescer(flush, max_size=1, max_wait_seconds=60)
+        submitter = asyncio.create_task(coalescer.submit(1))
+        await flushing.wait()
+        submitter.cancel()
+        await asyncio.gather(submitter, return_exceptions=True)
+        submitters_gone.set()
+        await asyncio.gather(*coalescer._tasks)
+        del coalescer, submitter
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert reported == []
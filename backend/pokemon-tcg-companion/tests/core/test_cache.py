@@ -0,0 +1,55 @@
+import time
+
+from core.cache import ExpiringLRUCache, cache_lifetime
+
+
+def test_evicts_least_recently_used_entry():
+    cache: ExpiringLRUCache[str, int] = ExpiringLRUCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at)
+    cache.set("b", 2, expires_at)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3, expires_at)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_expired_entries_are_not_returned():
+    cache: ExpiringLRUCache[str, int] = ExpiringLRUCache(max_size=2)
+    cache.set("stale", 1, time.time() - 1)
+    cache.set("expiring", 2, time.time() + 0.01)
+
+    time.sleep(0.02)
+
+    assert cache.get("stale") is None
+    assert cache.get("expiring") is None
+    assert len(cache) == 0
+
+
+def test_cache_lifetime_subtracts_age():
+    headers = {"Cache-Control": "public, max-age=300", "Age": "100"}
+
+    assert cache_lifetime(headers) == 200
+
+
+def test_shared_cache_lifetime_prefers_s_maxage():
+    # Electric's initial snapshot responses
+    headers = {
+        "Cache-Control": (
+            "public, max-age=604800, s-maxage=3600, stale-while-revalidate=2629746"
+        )
+    }
+
+    assert cache_lifetime(headers) == 604800
+    assert cache_lifetime(headers, shared=True) == 3600
+
+
+def test_shared_cache_does_not_reuse_private_responses():
+    headers = {"Cache-Control": "private, max-age=60"}
+
+    assert cache_lifetime(headers) == 60
+    assert cache_lifetime(headers, shared=True) == 0
+    assert cache_lifetime({"Cache-Control": "no-store"}) == 0
@@ -0,0 +1,96 @@
+import pytest
+import pytest_asyncio
+from pydantic import SecretStr
+from sqlalchemy import column, insert, select, table, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.db import RoutingSession, engine_options, normalize_async_url
+from core.settings.db import DatabaseSettings, EngineProfile
+
+
+def _settings(**overrides) -> DatabaseSettings:
+    return DatabaseSettings(database_url=SecretStr("postgresql://db"), **overrides)
+
+
+def test_engine_options_use_profile_defaults():
+    api = engine_options(_settings(), EngineProfile.api)
+    script = engine_options(_settings(), EngineProfile.script)
+
+    assert api["pool_size"] == 10
+    assert api["max_overflow"] == 20
+    assert api["pool_pre_ping"] is True
+    assert script["pool_timeout"] == 120
+    # Poolers reject startup parameters, so no statement timeout unless asked
+    assert "server_settings" not in api["connect_args"]
+
+
+def test_engine_options_settings_override_profile():
+    options = engine_options(
+        _settings(db_pool_size=3, db_max_overflow=0, db_statement_timeout_ms=15_000),
+        EngineProfile.api,
+    )
+
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 0
+    assert options["connect_args"]["server_settings"] == {"statement_timeout": "15000"}
+
+
+def test_engine_options_for_transaction_poolers():
+    options = engine_options(_settings(db_statement_cache_size=0), EngineProfile.api)
+    connect_args = options["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_normalize_async_url():
+    assert normalize_async_url(
+        "postgres://u:p@host/db?sslmode=require&channel_binding=require"
+    ) == ("postgresql+asyncpg://u:p@host/db?ssl=require")
+
+
+origin = table("origin", column("name"))
+
+
+@pytest_asyncio.fixture
+async def routing_session_maker(tmp_path):
+    """Session maker over two SQLite databases that each record their role."""
+    engines = {}
+    for role in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / role}.db")
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE origin (name TEXT)"))
+            await conn.execute(insert(origin).values(name=role))
+        engines[role] = engine
+
+    yield async_sessionmaker(
+        engines["primary"],
+        sync_session_class=RoutingSession,
+        replica=engines["replica"].sync_engine,
+    )
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_routing_session_reads_from_replica(routing_session_maker):
+    async with routing_session_maker() as session:
+        names = (await session.execute(select(origin.c.name))).scalars().all()
+
+    assert names == ["replica"]
+
+
+@pytest.mark.asyncio
+async def test_routing_session_reads_its_own_writes(routing_session_maker):
+    async with routing_session_maker() as session:
+        await session.execute(insert(origin).values(name="written"))
+        names = (await session.execute(select(origin.c.name))).scalars().all()
+        await session.commit()
+
+    assert names == ["primary", "written"]
+
+    async with routing_session_maker() as session:
+        names = (await session.execute(select(origin.c.name))).scalars().all()
+
+    assert names == ["replica"]
@@ -0,0 +1,54 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from core.gcp import CachedClient
+
+
+def _counting_factory():
+    built: list[object] = []
+
+    async def factory() -> object:
+        await asyncio.sleep(0)
+        built.append(object())
+        return built[-1]
+
+    return factory, built
+
+
+@pytest.mark.asyncio
+async def test_cached_client_is_built_once():
+    factory, built = _counting_factory()
+    cached = CachedClient(factory, ttl_seconds=60)
+
+    clients = await asyncio.gather(*(cached.get() for _ in range(5)))
+
+    assert len(built) == 1
+    assert all(client is built[0] for client in clients)
+
+
+@pytest.mark.asyncio
+async def test_cached_client_rebuilds_after_invalidate():
+    factory, built = _counting_factory()
+    cached = CachedClient(factory, ttl_seconds=60)
+
+    first = await cached.get()
+    cached.invalidate()
+    second = await cached.get()
+
+    assert first is not second
+    assert len(built) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_client_rebuilds_after_ttl():
+    factory, built = _counting_factory()
+    cached = CachedClient(factory, ttl_seconds=60)
+
+    with patch("core.gcp.time.monotonic", return_value=1000.0):
+        await cached.get()
+    with patch("core.gcp.time.monotonic", return_value=1061.0):
+        await cached.get()
+
+    assert len(built) == 2
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from core.images import dhash, downscale_image, embed_image, hamming_distance
+
+
+def test_downscale_image_shrinks_large_images(tmp_path):
+    path = tmp_path / "card.png"
+    Image.new("RGB", (1200, 1600), "red").save(path)
+
+    media_type = downscale_image(str(path), max_dimension=400, quality=85)
+
+    assert media_type == "image/jpeg"
+    with Image.open(path) as image:
+        assert image.format == "JPEG"
+        assert image.size == (300, 400)
+
+
+def test_downscale_image_leaves_small_images_untouched(tmp_path):
+    path = tmp_path / "card.png"
+    Image.new("RGB", (300, 400), "red").save(path)
+    original = path.read_bytes()
+
+    assert downscale_image(str(path), max_dimension=400, quality=85) is None
+    assert path.read_bytes() == original
+
+
+def test_downscale_image_ignores_undecodable_files(tmp_path):
+    path = tmp_path / "card.bin"
+    path.write_bytes(b"not an image")
+
+    assert downscale_image(str(path), max_dimension=400, quality=85) is None
+    assert path.read_bytes() == b"not an image"
+
+
+def test_downscale_image_ignores_truncated_files(tmp_path):
+    path = tmp_path / "card.jpg"
+    _card_like((3000, 2000)).save(path, quality=90)
+    truncated = path.read_bytes()[: path.stat().st_size // 2]
+    path.write_bytes(truncated)
+
+    assert downscale_image(str(path), max_dimension=400, quality=85) is None
+    assert path.read_bytes() == truncated
+
+
+def _card_like(size: tuple[int, int]) -> Image.Image:
+    """A smooth, asymmetric test image: a gradient with a few blocks drawn on."""
+    width, height = size
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((width // 10, height // 8, width // 2, height // 3), fill="navy")
+    draw.ellipse((width // 2, height // 2, width - 20, height - 40), fill="orange")
+    return image
+
+
+def _truncated_jpeg(path) -> None:
+    _card_like((3000, 2000)).save(path, quality=90)
+    path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])
+
+
+def test_dhash_ignores_truncated_files(tmp_path):
+    path = tmp_path / "card.jpg"
+    _truncated_jpeg(path)
+
+    assert dhash(str(path)) is None
+
+
+def test_dhash_is_stable_across_rescaling_and_recompression(tmp_path):
+    original, resized = tmp_path / "original.png", tmp_path / "resized.jpg"
+    image = _card_like((320, 440))
+    image.save(original)
+    image.resize((160, 220)).save(resized, quality=90)
+
+    original_hash, resized_hash = dhash(str(original)), dhash(str(resized))
+
+    assert original_hash is not None and resized_hash is not None
+    assert hamming_distance(original_hash, resized_hash) <= 2
+
+
+def test_dhash_tells_different_images_apart(tmp_path):
+    first, second = tmp_path / "first.png", tmp_path / "second.png"
+    _card_like((320, 440)).save(first)
+    _card_like((320, 440)).transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(second)
+
+    first_hash, second_hash = dhash(str(first)), dhash(str(second))
+
+    assert first_hash is not None and second_hash is not None
+    assert hamming_distance(first_hash, second_hash) > 16
+
+
+def test_dhash_returns_none_for_undecodable_files(tmp_path):
+    path = tmp_path / "card.bin"
+    path.write_bytes(b"not an image")
+
+    assert dhash(str(path)) is None
+
+
+def test_embed_image_is_unit_length_and_robust_to_rescaling(tmp_path):
+    original, resized = tmp_path / "original.png", tmp_path / "resized.jpg"
+    image = _card_like((320, 440))
+    image.save(original)
+    image.resize((640, 880)).save(resized, quality=80)
+
+    original_vector = embed_image(str(original))
+    resized_vector = embed_image(str(resized))
+
+    assert original_vector is not None and resized_vector is not None
+    assert original_vector.dtype == np.float32
+    assert np.linalg.norm(original_vector) == pytest.approx(1.0, abs=1e-5)
+    assert float(original_vector @ resized_vector) > 0.97
+
+
+def test_embed_image_tells_different_images_apart(tmp_path):
+    first, second = tmp_path / "first.png", tmp_path / "second.png"
+    _card_like((320, 440)).save(first)
+    _card_like((320, 440)).transpose(Image.Transpose.FLIP_TOP_BOTTOM).save(second)
+
+    first_vector, second_vector = embed_image(str(first)), embed_image(str(second))
+
+    assert first_vector is not None and second_vector is not None
+    assert float(first_vector @ second_vector) < 0.9
+
+
+def test_embed_image_returns_none_for_undecodable_files(tmp_path):
+    path = tmp_path / "card.bin"
+    path.write_bytes(b"not an image")
+
+    assert embed_image(str(path)) is None
+
+
+def test_embed_image_ignores_truncated_files(tmp_path):
+    path = tmp_path / "card.jpg"
+    _truncated_jpeg(path)
+
+    assert embed_image(str(path)) is None
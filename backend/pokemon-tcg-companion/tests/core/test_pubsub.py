@@ -0,0 +1,23 @@
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.pubsub import Publisher
+
+
+@pytest.mark.asyncio
+async def test_publish_awaits_the_batch_future_without_blocking():
+    future: Future[str] = Future()
+    client = MagicMock()
+    client.topic_path.side_effect = lambda project, topic: f"{project}/{topic}"
+    client.publish.return_value = future
+    publisher = Publisher(client, "test-project")
+
+    # The client resolves publish futures from its own batch thread
+    threading.Timer(0.01, future.set_result, args=("msg-123",)).start()
+    message_id = await publisher.publish("card-created", b"{}")
+
+    assert message_id == "msg-123"
+    client.publish.assert_called_once_with("test-project/card-created", b"{}")
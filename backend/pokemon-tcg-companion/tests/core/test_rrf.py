@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from core.rrf import reciprocal_rank_fusion
+
+
+@dataclass
+class Item:
+    id: UUID
+
+
+A, B, C = (Item(UUID(int=i)) for i in (1, 2, 3))
+
+
+def test_higher_fused_score_ranks_first():
+    fused = reciprocal_rank_fusion([[A, B], [B]], limit=10)
+
+    assert fused == [B, A]
+
+
+def test_ties_are_broken_by_id():
+    # B and C score the same and are both ranked first somewhere, so they fall
+    # back to id order rather than the order they were first seen in
+    fused = reciprocal_rank_fusion([[C, B], [B, C], [A]], limit=10, weights=[1, 1, 0])
+
+    assert fused == [B, C, A]
@@ -0,0 +1,37 @@
+import pytest
+
+from core.trgm import exceeds_threshold, similarity, trigrams
+
+
+def test_trigrams_match_show_trgm():
+    # Punctuation splits words, and each word is padded before splitting
+    assert trigrams("Mr. Mime") == {
+        "  m",
+        " mr",
+        "mr ",
+        " mi",
+        "mim",
+        "ime",
+        "me ",
+    }
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ("word", "two words", 0.36363637),
+        ("Charizard", "Charizard", 1.0),
+        ("Charizard", "charizard", 1.0),
+        ("Charizard", "Blastoise", 0.0),
+        ("", "Charizard", 0.0),
+    ],
+)
+def test_similarity_matches_pg_trgm(a, b, expected):
+    assert similarity(a, b) == pytest.approx(expected)
+
+
+def test_threshold_compares_in_single_precision():
+    # 3 shared trigrams out of 10 is exactly 0.3 in real arithmetic, which
+    # Postgres does not consider greater than 0.3.
+    assert not exceeds_threshold(3 / 10, 0.3)
+    assert exceeds_threshold(4 / 10, 0.3)
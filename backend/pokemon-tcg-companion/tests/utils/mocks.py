@@ -1,6 +1,7 @@
 """Mock factories for external services."""
 
 from os import urandom
+from pathlib import Path
 from typing import Protocol, Tuple, TypeVar, cast
 from unittest.mock import AsyncMock, MagicMock
 
@@ -33,6 +34,9 @@ def create_mock_storage_client(
     """
     mock_blob = MagicMock()
     mock_blob.download_as_bytes.return_value = blob_content
+    mock_blob.download_to_filename.side_effect = lambda filename, **_: Path(
+        filename
+    ).write_bytes(blob_content)
     mock_blob.generate_signed_url.return_value = "https://test-url.com"
 
     mock_bucket = MagicMock()
@@ -46,14 +50,13 @@ def create_mock_storage_client(
 
 def create_mock_pubsub_publisher() -> MagicMock:
     """
-    Create a mock Pub/Sub publisher client.
+    Create a mock Pub/Sub publisher.
 
     Returns:
-        A MagicMock configured as a pubsub_v1.PublisherClient
+        A MagicMock configured as a core.pubsub.Publisher
     """
     mock_publisher = MagicMock()
-    mock_publisher.topic_path.return_value = "projects/test/topics/test"
-    mock_publisher.publish.return_value.result.return_value = "msg-123"
+    mock_publisher.publish = AsyncMock(return_value="msg-123")
 
     return mock_publisher
 
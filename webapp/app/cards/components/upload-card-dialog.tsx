@@ -18,7 +18,7 @@ import { cn } from "@/lib/utils";
 interface UploadCardDialogProps {
   open: boolean;
   onOpenChange: (open: boolean) => void;
-  onUpload: (file: File) => Promise<unknown>;
+  onUpload: (files: File[]) => Promise<unknown>;
 }
 
 export function UploadCardDialog({
@@ -26,34 +26,35 @@ export function UploadCardDialog({
   onOpenChange,
   onUpload,
 }: UploadCardDialogProps) {
-  const [imageFile, setImageFile] = useState<File | null>(null);
+  const [imageFiles, setImageFiles] = useState<File[]>([]);
   const [preview, setPreview] = useState<string | null>(null);
   const [isDragging, setIsDragging] = useState(false);
   const [isUploading, setIsUploading] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
-  function handleFileSelect(file: File) {
-    if (!file.type.startsWith("image/")) return;
-    setImageFile(file);
-    setPreview(URL.createObjectURL(file));
+  function handleFilesSelect(files: FileList | null | undefined) {
+    const images = Array.from(files ?? []).filter((file) =>
+      file.type.startsWith("image/"),
+    );
+    if (images.length === 0) return;
+    setImageFiles(images);
+    setPreview(URL.createObjectURL(images[0]));
   }
 
   function handleInputChange(e: React.ChangeEvent<HTMLInputElement>) {
-    const file = e.target.files?.[0];
-    if (file) handleFileSelect(file);
+    handleFilesSelect(e.target.files);
   }
 
   function handleDrop(e: React.DragEvent) {
     e.preventDefault();
     setIsDragging(false);
-    const file = e.dataTransfer.files?.[0];
-    if (file) handleFileSelect(file);
+    handleFilesSelect(e.dataTransfer.files);
   }
 
   function handleClose(open: boolean) {
     if (isUploading) return;
     if (!open) {
-      setImageFile(null);
+      setImageFiles([]);
       setPreview(null);
     }
     onOpenChange(open);
@@ -61,10 +62,10 @@ export function UploadCardDialog({
 
   async function handleSubmit(e: React.SyntheticEvent) {
     e.preventDefault();
-    if (!imageFile) return;
+    if (imageFiles.length === 0) return;
     setIsUploading(true);
     try {
-      await onUpload(imageFile);
+      await onUpload(imageFiles);
       handleClose(false);
     } finally {
       setIsUploading(false);
@@ -75,9 +76,9 @@ export function UploadCardDialog({
     <Dialog open={open} onOpenChange={handleClose}>
       <DialogContent>
         <DialogHeader>
-          <DialogTitle>Add Card</DialogTitle>
+          <DialogTitle>Add Cards</DialogTitle>
           <DialogDescription>
-            Upload an image of your Pokémon card to add it to your collection.
+            Upload images of your Pokémon cards to add them to your collection.
           </DialogDescription>
         </DialogHeader>
 
@@ -108,6 +109,11 @@ export function UploadCardDialog({
                     isUploading && "opacity-40",
                   )}
                 />
+                {imageFiles.length > 1 && (
+                  <span className="bg-background/80 text-foreground absolute right-1.5 bottom-1.5 rounded-md px-1.5 py-0.5 text-xs font-medium">
+                    +{imageFiles.length - 1}
+                  </span>
+                )}
                 {isUploading && (
                   <div className="absolute inset-0 flex flex-col items-center justify-center gap-2">
                     <div className="border-foreground size-6 animate-spin rounded-full border-2 border-t-transparent" />
@@ -125,7 +131,7 @@ export function UploadCardDialog({
                   className="size-6"
                 />
                 <span className="text-xs leading-tight">
-                  Click or drag image
+                  Click or drag images
                 </span>
               </div>
             )}
@@ -133,6 +139,7 @@ export function UploadCardDialog({
               ref={fileInputRef}
               type="file"
               accept="image/*"
+              multiple
               className="sr-only"
               onChange={handleInputChange}
             />
@@ -146,7 +153,10 @@ export function UploadCardDialog({
             >
               Cancel
             </Button>
-            <Button type="submit" disabled={!imageFile || isUploading}>
+            <Button
+              type="submit"
+              disabled={imageFiles.length === 0 || isUploading}
+            >
               {isUploading ? "Uploading…" : "Upload"}
             </Button>
           </DialogFooter>
@@ -6,7 +6,7 @@ import dynamic from "next/dynamic";
 import { useState } from "react";
 
 import { Button } from "@/components/ui/button";
-import { useCreateCard } from "@/lib/hooks/useCards";
+import { useCreateCards } from "@/lib/hooks/useCards";
 
 import { CardGridSkeleton } from "./components/card-skeleton";
 import { UploadCardDialog } from "./components/upload-card-dialog";
@@ -22,14 +22,14 @@ const CardsView = dynamic(
 
 export default function CardsPage() {
   const [dialogOpen, setDialogOpen] = useState(false);
-  const { mutateAsync: uploadCard } = useCreateCard();
+  const { mutateAsync: uploadCards } = useCreateCards();
 
   return (
     <div className="flex flex-col gap-6">
       <UploadCardDialog
         open={dialogOpen}
         onOpenChange={setDialogOpen}
-        onUpload={uploadCard}
+        onUpload={uploadCards}
       />
       <div className="flex items-center justify-between">
         <h1 className="text-2xl font-bold">My Collection</h1>
@@ -12,6 +12,7 @@ import type { components } from "@/lib/openapi-types";
 
 type CardRead = components["schemas"]["CardRead"];
 type RefCardRead = components["schemas"]["RefCardRead"];
+type UploadUrlResponse = components["schemas"]["UploadUrlResponse"];
 
 export type CardWithRefCard = CardRead & {
   ref_card?: RefCardRead | null;
@@ -38,33 +39,87 @@ export function useCards() {
   return { data: data || [], isLoading, isError };
 }
 
-export function useCreateCard() {
-  const queryClient = useQueryClient();
+// The API signs URLs for and creates at most this many cards per request
+const MAX_BATCH_SIZE = 500;
+// Uploads in flight at once, so hundreds of images do not all compete for
+// bandwidth and browser connections
+const MAX_CONCURRENT_UPLOADS = 6;
 
-  return useMutation({
-    mutationFn: async (file: File) => {
-      const urlRes = await fetch("/api/cards/upload-url", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ filename: file.name, content_type: file.type }),
-      });
-      if (!urlRes.ok) throw new Error("Failed to get upload URL");
-      const { upload_url, image_path } = await urlRes.json();
+function chunk<T>(items: T[], size: number): T[][] {
+  const chunks: T[][] = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+}
+
+async function forEachLimited<T>(
+  items: T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<void>,
+) {
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const i = next++;
+      await fn(items[i], i);
+    }
+  };
+  await Promise.all(
+    Array.from({ length: Math.min(limit, items.length) }, worker),
+  );
+}
+
+async function createCardBatch(files: File[]) {
+  const urlRes = await fetch("/api/cards/upload-urls", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({
+      files: files.map((file) => ({
+        filename: file.name,
+        content_type: file.type,
+      })),
+    }),
+  });
+  if (!urlRes.ok) throw new Error("Failed to get upload URLs");
+  const uploads = (await urlRes.json()) as UploadUrlResponse[];
 
+  await forEachLimited(
+    uploads,
+    MAX_CONCURRENT_UPLOADS,
+    async ({ upload_url }, i) => {
       const uploadRes = await fetch(upload_url, {
         method: "PUT",
-        headers: { "Content-Type": file.type },
-        body: file,
+        headers: { "Content-Type": files[i].type },
+        body: files[i],
       });
       if (!uploadRes.ok) throw new Error("Failed to upload image");
+    },
+  );
 
-      const cardRes = await fetch("/api/cards/", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ image_path }),
-      });
-      if (!cardRes.ok) throw new Error("Failed to create card");
-      return (await cardRes.json()) as CardRead;
+  const cardsRes = await fetch("/api/cards/batch", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({
+      image_paths: uploads.map(({ image_path }) => image_path),
+    }),
+  });
+  if (!cardsRes.ok) throw new Error("Failed to create cards");
+  return (await cardsRes.json()) as CardRead[];
+}
+
+export function useCreateCards() {
+  const queryClient = useQueryClient();
+
+  return useMutation({
+    // One request signs the upload URLs and one creates the cards for every
+    // MAX_BATCH_SIZE images
+    mutationFn: async (files: File[]) => {
+      const cards: CardRead[] = [];
+      for (const batch of chunk(files, MAX_BATCH_SIZE)) {
+        cards.push(...(await createCardBatch(batch)));
+      }
+      return cards;
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["cards"] });
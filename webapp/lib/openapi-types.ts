@@ -21,6 +21,29 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/cards/upload-urls": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Create Upload Urls
+         * @description Sign an upload URL for each file, in the order given.
+         *
+         *     Signing is CPU-bound (or a call to the IAM API without a service account
+         *     key), so the URLs are signed in the thread pool off the event loop.
+         */
+        post: operations["create_upload_urls_cards_upload_urls_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/cards": {
         parameters: {
             query?: never;
@@ -28,7 +51,13 @@ export interface paths {
             path?: never;
             cookie?: never;
         };
-        /** List Cards */
+        /**
+         * List Cards
+         * @description List the caller's cards a page at a time.
+         *
+         *     When more cards remain, the cursor for the next page is returned in the
+         *     X-Next-Cursor header.
+         */
         get: operations["list_cards_cards_get"];
         put?: never;
         /** Add Card */
@@ -39,6 +68,27 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/cards/batch": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Add Cards
+         * @description Add a card for each uploaded image in one insert and announce them
+         *     together, in the order given.
+         */
+        post: operations["add_cards_cards_batch_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/cards/{card_id}": {
         parameters: {
             query?: never;
@@ -131,6 +181,11 @@ export interface components {
             /** Image Path */
             image_path: string;
         };
+        /** CreateCardsPayload */
+        CreateCardsPayload: {
+            /** Image Paths */
+            image_paths: string[];
+        };
         /** CreateCardSignedUploadUrl */
         CreateCardSignedUploadUrl: {
             /** Filename */
@@ -138,6 +193,11 @@ export interface components {
             /** Content Type */
             content_type: string;
         };
+        /** CreateCardSignedUploadUrls */
+        CreateCardSignedUploadUrls: {
+            /** Files */
+            files: components["schemas"]["CreateCardSignedUploadUrl"][];
+        };
         /** HTTPValidationError */
         HTTPValidationError: {
             /** Detail */
@@ -272,13 +332,49 @@ export interface operations {
             };
         };
     };
-    list_cards_cards_get: {
+    create_upload_urls_cards_upload_urls_post: {
         parameters: {
             query?: never;
             header?: never;
             path?: never;
             cookie?: never;
         };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["CreateCardSignedUploadUrls"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["UploadUrlResponse"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    list_cards_cards_get: {
+        parameters: {
+            query?: {
+                limit?: number;
+                cursor?: string | null;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
         requestBody?: never;
         responses: {
             /** @description Successful Response */
@@ -290,6 +386,15 @@ export interface operations {
                     "application/json": components["schemas"]["CardRead"][];
                 };
             };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
         };
     };
     add_card_cards_post: {
@@ -325,6 +430,39 @@ export interface operations {
             };
         };
     };
+    add_cards_cards_batch_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["CreateCardsPayload"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            201: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["Card"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_card_cards__card_id__get: {
         parameters: {
             query?: never;